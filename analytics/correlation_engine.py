@@ -4,20 +4,274 @@ Identifies relationships between biometric failures, demographic gaps,
 enrolment velocity, and geographic patterns
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from scipy import stats
 from sklearn.preprocessing import StandardScaler
 import warnings
+from correlation_significance import correlation_significance
 warnings.filterwarnings('ignore')
 
 
+def _group_codes(series):
+    """
+    Dense integer codes of a grouping column over its observed values.
+    
+    Args:
+        series: Key column (categorical or plain)
+        
+    Returns:
+        tuple: (codes with -1 for missing, index of the observed keys in
+               sorted order; categorical keys keep their dtype, as with
+               groupby(..., observed=True))
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.intp)
+        n_categories = len(series.cat.categories)
+        observed = np.bincount(codes[codes >= 0], minlength=n_categories) > 0
+        dense = np.cumsum(observed) - 1
+        codes = np.where(codes >= 0, dense[codes], -1)
+        index = pd.CategoricalIndex(series.cat.categories[observed], dtype=series.dtype,
+                                    name=series.name)
+        return codes, index
+    
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes.astype(np.intp), pd.Index(uniques, name=series.name)
+
+
+def _value_mask(series, value):
+    """Boolean array of series == value, comparing factorized codes."""
+    codes, uniques = pd.factorize(series)
+    return np.isin(codes, np.flatnonzero(np.asarray(uniques == value)))
+
+
+def _group_sum(codes, n_groups, values=None):
+    """
+    Per-group sums (or row counts without values) via bincount.
+    
+    Integer inputs return integer sums, matching groupby().sum().
+    """
+    values = None if values is None else np.asarray(values)
+    if len(codes) and codes.min() < 0:
+        valid = codes >= 0
+        codes = codes[valid]
+        values = None if values is None else values[valid]
+    if values is None:
+        return np.bincount(codes, minlength=n_groups)
+    
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    if values.dtype.kind == 'u':
+        return sums.astype(np.uint64)
+    if values.dtype.kind in 'ib':
+        return sums.astype(np.int64)
+    return sums
+
+
+def _group_percentiles(codes, n_groups, values, percentiles):
+    """
+    Per-group percentiles with linear interpolation, computed exactly as
+    np.percentile / Series.quantile do.
+    
+    Rows are sorted once by (group, value); every group's order statistics
+    are then read from its contiguous block with index arithmetic, so the
+    cost does not grow with the number of groups.
+    
+    Returns:
+        np.ndarray of shape (n_groups, len(percentiles)), NaN for empty groups
+    """
+    valid = codes >= 0
+    codes = codes[valid]
+    values = np.asarray(values)[valid]
+    counts = np.bincount(codes, minlength=n_groups)
+    
+    sorted_values = None
+    if values.dtype.kind in 'iu' and len(values):
+        # Integer values: one sort of a combined (group, value) key
+        low = int(values.min())
+        span = int(values.max()) - low + 1
+        if span * n_groups < np.iinfo(np.int64).max:
+            keys = np.sort(codes.astype(np.int64) * span + (values.astype(np.int64) - low))
+            sorted_values = (keys % span + low).astype(float)
+    if sorted_values is None:
+        sorted_values = values[np.lexsort((values, codes))].astype(float)
+    
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    present = counts > 0
+    n = counts[present][:, None]
+    start = starts[present][:, None]
+    
+    # numpy's 'linear' method: virtual index (n - 1) * q and its lerp
+    quantiles = np.true_divide(np.asarray(percentiles, dtype=float), 100)[None, :]
+    virtual = (n - 1) * quantiles
+    below = np.floor(virtual)
+    gamma = virtual - below
+    below = below.astype(np.intp)
+    above = np.minimum(below + 1, n - 1)
+    lower = sorted_values[start + below]
+    upper = sorted_values[start + above]
+    diff = upper - lower
+    interpolated = np.where(gamma >= 0.5, upper - diff * (1 - gamma), lower + diff * gamma)
+    
+    result = np.full((n_groups, len(percentiles)), np.nan)
+    result[present] = interpolated
+    return result
+
+
+# Columns per block when correlations are computed blockwise
+CORRELATION_BLOCK_SIZE = 512
+
+# Units the feature matrix can be built at
+GRAINS = ('state', 'district', 'pincode')
+
+CORRELATION_METHODS = ('pearson', 'spearman', 'kendall')
+
+# Significance level and resampling used by the insight generators
+SIGNIFICANCE_ALPHA = 0.05
+SIGNIFICANCE_RESAMPLES = 10_000
+
+# Correlations below this are at most a weak effect
+WEAK_CORRELATION = 0.3
+
+
+def _standardize_columns(features, method):
+    """
+    Center each column and scale it to unit norm, so that the dot product
+    of two columns is their Pearson correlation (of ranks, for Spearman).
+    Constant columns become NaN, as their correlation is undefined.
+    """
+    if method == 'spearman':
+        features = features.rank(method='average')
+    values = features.to_numpy(dtype=float)
+    centered = values - values.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return centered / np.where(norms > 0, norms, np.nan)
+
+
+def _correlation_blocks(z, block_size):
+    """
+    Yield the upper triangle of the correlation matrix block by block.
+    
+    Only one block_size x block_size block of standardized column products
+    is held at a time.
+    
+    Args:
+        z: Matrix from _standardize_columns (rows are observations)
+        block_size: Columns per block
+        
+    Yields:
+        tuple: (row positions, column positions, correlations) with row < column
+    """
+    n_cols = z.shape[1]
+    for row_start in range(0, n_cols, block_size):
+        row_block = z[:, row_start:row_start + block_size]
+        for col_start in range(row_start, n_cols, block_size):
+            block = np.clip(row_block.T @ z[:, col_start:col_start + block_size], -1.0, 1.0)
+            if col_start == row_start:
+                rows, cols = np.triu_indices(block.shape[0], k=1)
+            else:
+                rows, cols = np.indices(block.shape).reshape(2, -1)
+            yield row_start + rows, col_start + cols, block[rows, cols]
+
+
+def _correlation_matrix(z, block_size):
+    """Assemble the full correlation matrix of a standardized matrix from column blocks."""
+    n_cols = z.shape[1]
+    corr = np.empty((n_cols, n_cols))
+    for rows, cols, values in _correlation_blocks(z, block_size):
+        corr[rows, cols] = values
+        corr[cols, rows] = values
+    # Undefined (constant) columns stay NaN on the diagonal too
+    corr[np.diag_indices(n_cols)] = np.where(np.isnan(z).all(axis=0), np.nan, 1.0)
+    return corr
+
+
+# Column ranks shared with Kendall worker processes (set by the pool initializer)
+_KENDALL_RANKS = None
+
+# Below this many rows x pairs, Kendall pairs are scored in-process
+KENDALL_PARALLEL_MIN_WORK = 2_000_000
+
+
+def _init_kendall_worker(ranks):
+    """Process pool initializer: keep the rank matrix for the batches."""
+    global _KENDALL_RANKS
+    _KENDALL_RANKS = ranks
+
+
+def _kendall_batch(pairs, ranks=None):
+    """Kendall tau-b (scipy, O(n log n)) for a batch of (i, j) column pairs."""
+    ranks = _KENDALL_RANKS if ranks is None else ranks
+    return [stats.kendalltau(ranks[:, i], ranks[:, j])[0] for i, j in pairs]
+
+
+def _kendall_matrix(values, max_workers=None):
+    """
+    Kendall tau-b for every column pair.
+    
+    Each column is reduced once to dense integer ranks (tau is rank
+    invariant); the pairs are then split into batches scored with
+    scipy.stats.kendalltau, O(n log n) per pair, across a process pool
+    when the work is large enough to pay for it.
+    
+    Args:
+        values: 2-D float array, rows are observations (no missing values)
+        max_workers: Worker processes (default: CPU count; 1 scores in-process)
+        
+    Returns:
+        np.ndarray: Symmetric tau-b matrix with a unit diagonal (as pandas)
+    """
+    n_rows, n_cols = values.shape
+    ranks = np.empty((n_rows, n_cols), dtype=np.int64)
+    for col in range(n_cols):
+        ranks[:, col] = np.unique(values[:, col], return_inverse=True)[1].ravel()
+    
+    rows, cols = np.triu_indices(n_cols, k=1)
+    pairs = list(zip(rows.tolist(), cols.tolist()))
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers > 1 and n_rows * len(pairs) >= KENDALL_PARALLEL_MIN_WORK:
+        batches = [pairs[start::max_workers * 4] for start in range(max_workers * 4)]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_kendall_worker,
+                                 initargs=(ranks,)) as pool:
+            scored = dict(zip((pair for batch in batches for pair in batch),
+                              (tau for taus in pool.map(_kendall_batch, batches) for tau in taus)))
+        taus = [scored[pair] for pair in pairs]
+    else:
+        taus = _kendall_batch(pairs, ranks)
+    
+    corr = np.eye(n_cols)
+    corr[rows, cols] = taus
+    corr[cols, rows] = taus
+    return corr
+
+
+def _format_significance(result):
+    """Format a pair's correlation, 95% CI and p-value for an insight."""
+    return (f"r={result['correlation']:.3f}, 95% CI [{result['ci_lower']:.3f}, "
+            f"{result['ci_upper']:.3f}], p={result['p_value']:.4f}")
+
+
+def _correlation_pairs_frame(row_labels, col_labels, rows, cols, values):
+    """Variable pairs with their correlation, in the strong-correlation layout."""
+    return pd.DataFrame({
+        'Variable 1': np.asarray(row_labels)[rows],
+        'Variable 2': np.asarray(col_labels)[cols],
+        'Correlation': values,
+        'Abs_Correlation': np.abs(values),
+    })
+
+
 class CorrelationEngine:
     """
     Advanced correlation analysis across all three Aadhar datasets.
     """
     
-    def __init__(self, biometric_df, demographic_df, enrolment_df):
+    def __init__(self, biometric_df, demographic_df, enrolment_df, data_version=None,
+                 grain='state', max_workers=None):
         """
         Initialize with all three datasets.
         
@@ -25,121 +279,257 @@ class CorrelationEngine:
             biometric_df: Biometric authentication DataFrame
             demographic_df: Demographic DataFrame with auth metrics
             enrolment_df: Enrolment DataFrame
+            data_version: Optional token for the data (e.g. the pipeline
+                          cache key); changing it drops memoized results
+            grain: Unit of the feature matrix: 'state' (~36 units),
+                   'district' (~800, keyed by state and district) or
+                   'pincode' (~19k)
+            max_workers: Processes for Kendall tau pair batches (default: CPU count)
         """
+        if grain not in GRAINS:
+            raise ValueError(f"grain must be one of {GRAINS}")
+        
         self.biometric_df = biometric_df
         self.demographic_df = demographic_df
         self.enrolment_df = enrolment_df
+        self.data_version = data_version
+        self.grain = grain
+        self.max_workers = max_workers
+        
+        # Memoized features, standardized (and ranked) feature matrices and
+        # correlation matrices per method, valid for the frames, grain and
+        # data version they were computed from
+        self._cache_key = None
+        self._state_features = None
+        self._standardized = {}
+        self._correlation_matrices = {}
+        self._significance = {}
+    
+    def _frames_key(self):
+        """Identity and version of the input frames, and the grain."""
+        frames = (self.biometric_df, self.demographic_df, self.enrolment_df)
+        return (self.data_version, self.grain) + tuple(
+            (id(df), df.shape, tuple(df.columns)) for df in frames)
+    
+    def invalidate(self, data_version=None):
+        """
+        Drop memoized features and correlation matrices.
+        
+        Call after modifying the frames in place; replacing a frame or
+        passing a new data_version is detected automatically.
+        
+        Args:
+            data_version: Optional new data version token
+        """
+        if data_version is not None:
+            self.data_version = data_version
+        self._cache_key = None
+        self._state_features = None
+        self._standardized = {}
+        self._correlation_matrices = {}
+        self._significance = {}
+    
+    def _check_cache(self):
+        """Invalidate memoized results if the frames or version changed."""
+        key = self._frames_key()
+        if key != self._cache_key:
+            self.invalidate()
+            self._cache_key = key
         
     def create_state_level_features(self):
         """
-        Aggregate all datasets to state level for correlation analysis.
+        Aggregate all datasets to the engine's grain (state level by
+        default) for correlation analysis.
+        
+        The table is computed once per set of input frames and reused by
+        every analysis; callers receive a copy they may modify.
         
         Returns:
             pd.DataFrame with state-level features from all datasets
         """
-        # Biometric features
-        bio_features = self.biometric_df.groupby('state').agg({
-            'total_transactions': 'sum',
-            'bio_age_5_17': 'sum',
-            'bio_age_17_': 'sum',
-            'date': 'count'  # Number of days with data
-        }).rename(columns={
-            'total_transactions': 'bio_total_volume',
-            'bio_age_5_17': 'bio_youth_volume',
-            'bio_age_17_': 'bio_adult_volume',
-            'date': 'bio_data_days'
-        })
+        self._check_cache()
+        if self._state_features is None:
+            self._state_features = self._build_state_level_features()
+        return self._state_features.copy()
+    
+    def _build_state_level_features(self):
+        """
+        Compute the state feature table from the raw frames.
+        
+        Each dataset is reduced in one vectorized pass over integer state
+        codes: sums and boolean rates via bincount, latency percentiles over
+        rows grouped by one stable sort, modality entropy from a state x
+        modality crosstab and enrolment growth from a state x month pivot.
+        
+        Returns:
+            pd.DataFrame with state-level features from all datasets
+        """
+        bio_features = self._biometric_state_features()
+        demo_features = self._demographic_state_features()
+        enrol_features = self._enrolment_state_features()
+        
+        # Merge all features
+        integrated = bio_features.merge(demo_features, left_index=True, right_index=True, how='outer')
+        integrated = integrated.merge(enrol_features, left_index=True, right_index=True, how='outer')
+        
+        # Fill NaN with 0
+        integrated = integrated.fillna(0)
+        
+        return integrated
+    
+    def _grain_codes(self, df):
+        """
+        Integer codes of each row's unit at the engine's grain.
+        
+        Returns:
+            tuple: (codes with -1 where the key is missing, index of the
+                   observed units; districts are keyed by (state, district))
+        """
+        if self.grain == 'state':
+            return _group_codes(df['state'])
+        if self.grain == 'pincode':
+            return _group_codes(df['pincode'])
+        
+        # District names repeat across states, so key on the pair
+        state_codes, states = _group_codes(df['state'])
+        district_codes, districts = _group_codes(df['district'])
+        valid = (state_codes >= 0) & (district_codes >= 0)
+        pairs = state_codes[valid] * len(districts) + district_codes[valid]
+        
+        codes = np.full(len(df), -1, dtype=np.intp)
+        codes[valid], observed = pd.factorize(pairs, sort=True)
+        index = pd.MultiIndex.from_arrays(
+            [states[observed // len(districts)], districts[observed % len(districts)]],
+            names=['state', 'district'])
+        return codes, index
+    
+    def _biometric_state_features(self):
+        """Biometric volumes, youth ratio, daily average and volatility per unit."""
+        df = self.biometric_df
+        units, index = self._grain_codes(df)
+        n_units = len(index)
+        
+        bio_features = pd.DataFrame({
+            'bio_total_volume': _group_sum(units, n_units, df['total_transactions'].to_numpy()),
+            'bio_youth_volume': _group_sum(units, n_units, df['bio_age_5_17'].to_numpy()),
+            'bio_adult_volume': _group_sum(units, n_units, df['bio_age_17_'].to_numpy()),
+        }, index=index)
+        
+        # Daily volume per unit-date cell (rows without a date are left out)
+        dates, _ = pd.factorize(df['date'])
+        n_dates = dates.max() + 1 if len(dates) else 0
+        cells = np.where((units >= 0) & (dates >= 0), units * n_dates + dates, -1)
+        cell_rows = _group_sum(cells, n_units * n_dates)
+        cell_volume = _group_sum(cells, n_units * n_dates, df['total_transactions'].to_numpy())
+        
+        bio_features['bio_data_days'] = cell_rows.reshape(n_units, n_dates).sum(axis=1)
         
         # Calculate biometric metrics
         bio_features['bio_youth_ratio'] = (bio_features['bio_youth_volume'] / 
                                            bio_features['bio_total_volume'] * 100)
         bio_features['bio_daily_avg'] = bio_features['bio_total_volume'] / bio_features['bio_data_days']
         
-        # Calculate volatility (coefficient of variation)
-        bio_volatility = self.biometric_df.groupby(['state', 'date'])['total_transactions'].sum()\
-            .groupby('state').agg(['mean', 'std'])
-        bio_features['bio_volatility'] = (bio_volatility['std'] / bio_volatility['mean'] * 100)
-        
-        # Demographic features
-        demo_features = self.demographic_df.groupby('state').agg({
-            'total_demographic': 'sum',
-            'auth_status': lambda x: (x == 'Success').sum() / len(x) * 100,
-            'response_time_ms': ['median', lambda x: x.quantile(0.95), lambda x: x.quantile(0.99)],
-            'demo_age_5_17': 'sum',
-            'demo_age_17_': 'sum'
-        })
-        
-        demo_features.columns = [
-            'demo_total_volume',
-            'demo_success_rate',
-            'demo_median_latency',
-            'demo_p95_latency',
-            'demo_p99_latency',
-            'demo_youth_volume',
-            'demo_adult_volume'
-        ]
+        # Calculate volatility (coefficient of variation of daily volume)
+        observed = cell_rows > 0
+        day_unit = np.nonzero(observed)[0] // max(n_dates, 1)
+        day_volume = cell_volume[observed].astype(float)
+        days = np.bincount(day_unit, minlength=n_units)
+        mean = np.bincount(day_unit, weights=day_volume, minlength=n_units) / days
+        squares = np.bincount(day_unit, weights=(day_volume - mean[day_unit]) ** 2, minlength=n_units)
+        std = np.sqrt(squares / np.where(days > 1, days - 1, np.nan))
+        bio_features['bio_volatility'] = std / mean * 100
+        
+        return bio_features
+    
+    def _demographic_state_features(self):
+        """Demographic volumes, auth success, latency percentiles, modality entropy and error mix per unit."""
+        df = self.demographic_df
+        units, index = self._grain_codes(df)
+        n_units = len(index)
+        
+        # Boolean indicators turn rates into grouped sums
+        is_success = _value_mask(df['auth_status'], 'Success')
+        is_failure = _value_mask(df['auth_status'], 'Failure')
+        is_error_300 = is_failure & (df['error_code'] == 300).to_numpy()
+        
+        rows = _group_sum(units, n_units)
+        successes = _group_sum(units, n_units, is_success)
+        failures = _group_sum(units, n_units, is_failure)
+        latency = _group_percentiles(units, n_units, df['response_time_ms'].to_numpy(),
+                                     [50.0, 95.0, 99.0])
+        
+        demo_features = pd.DataFrame({
+            'demo_total_volume': _group_sum(units, n_units, df['total_demographic'].to_numpy()),
+            'demo_success_rate': successes / rows * 100,
+            'demo_median_latency': latency[:, 0],
+            'demo_p95_latency': latency[:, 1],
+            'demo_p99_latency': latency[:, 2],
+            'demo_youth_volume': _group_sum(units, n_units, df['demo_age_5_17'].to_numpy()),
+            'demo_adult_volume': _group_sum(units, n_units, df['demo_age_17_'].to_numpy()),
+        }, index=index)
         
         demo_features['demo_youth_ratio'] = (demo_features['demo_youth_volume'] / 
                                              demo_features['demo_total_volume'] * 100)
         demo_features['demo_failure_rate'] = 100 - demo_features['demo_success_rate']
         
-        # Calculate auth modality diversity (entropy)
-        modality_diversity = self.demographic_df.groupby('state')['auth_modality'].apply(
-            lambda x: -sum((x.value_counts(normalize=True) * 
-                           np.log(x.value_counts(normalize=True))).fillna(0))
-        )
-        demo_features['demo_modality_diversity'] = modality_diversity
-        
-        # Error rate by type
-        errors = self.demographic_df[self.demographic_df['auth_status'] == 'Failure']
-        error_300_rate = errors.groupby('state')['error_code'].apply(
-            lambda x: (x == 300).sum() / len(x) * 100 if len(x) > 0 else 0
-        )
-        demo_features['demo_biometric_error_rate'] = error_300_rate
-        
-        # Enrolment features
-        enrol_features = self.enrolment_df.groupby('state').agg({
-            'total_enrolment': 'sum',
-            'age_0_5': 'sum',
-            'age_5_17': 'sum',
-            'age_18_greater': 'sum',
-            'date': 'count'
-        }).rename(columns={
-            'total_enrolment': 'enrol_total_volume',
-            'age_0_5': 'enrol_infant_volume',
-            'age_5_17': 'enrol_youth_volume',
-            'age_18_greater': 'enrol_adult_volume',
-            'date': 'enrol_data_days'
-        })
+        # Auth modality diversity (Shannon entropy) from a unit x modality crosstab
+        modalities, modality_labels = _group_codes(df['auth_modality'])
+        n_modalities = len(modality_labels)
+        pairs = np.where((units >= 0) & (modalities >= 0), units * n_modalities + modalities, -1)
+        crosstab = _group_sum(pairs, n_units * n_modalities).reshape(n_units, n_modalities)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = crosstab / crosstab.sum(axis=1, keepdims=True)
+            demo_features['demo_modality_diversity'] = -np.where(
+                shares > 0, shares * np.log(shares), 0).sum(axis=1)
+        
+        # Share of failures with biometric error 300 (NaN, later 0, without failures)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            demo_features['demo_biometric_error_rate'] = np.where(
+                failures > 0, _group_sum(units, n_units, is_error_300) / failures * 100, np.nan)
+        
+        return demo_features
+    
+    def _enrolment_state_features(self):
+        """Enrolment volumes, infant ratio, daily average and first-to-last month growth per unit."""
+        df = self.enrolment_df
+        units, index = self._grain_codes(df)
+        n_units = len(index)
+        total = df['total_enrolment'].to_numpy()
+        has_date = df['date'].notna().to_numpy()
+        
+        enrol_features = pd.DataFrame({
+            'enrol_total_volume': _group_sum(units, n_units, total),
+            'enrol_infant_volume': _group_sum(units, n_units, df['age_0_5'].to_numpy()),
+            'enrol_youth_volume': _group_sum(units, n_units, df['age_5_17'].to_numpy()),
+            'enrol_adult_volume': _group_sum(units, n_units, df['age_18_greater'].to_numpy()),
+            'enrol_data_days': _group_sum(np.where(has_date, units, -1), n_units),
+        }, index=index)
         
         enrol_features['enrol_infant_ratio'] = (enrol_features['enrol_infant_volume'] / 
                                                 enrol_features['enrol_total_volume'] * 100)
         enrol_features['enrol_daily_avg'] = (enrol_features['enrol_total_volume'] / 
                                              enrol_features['enrol_data_days'])
         
-        # Calculate enrolment growth rate (compare first and last month)
-        enrol_growth = self.enrolment_df.groupby(['state', 
-                                                  self.enrolment_df['date'].dt.to_period('M')])['total_enrolment'].sum()
-        
-        def calc_growth(group):
-            if len(group) < 2:
-                return 0
-            first_month = group.iloc[0]
-            last_month = group.iloc[-1]
-            if first_month > 0:
-                return (last_month - first_month) / first_month * 100
-            return 0
-        
-        enrol_features['enrol_growth_rate'] = enrol_growth.groupby('state').apply(calc_growth)
-        
-        # Merge all features
-        integrated = bio_features.merge(demo_features, left_index=True, right_index=True, how='outer')
-        integrated = integrated.merge(enrol_features, left_index=True, right_index=True, how='outer')
-        
-        # Fill NaN with 0
-        integrated = integrated.fillna(0)
-        
-        return integrated
+        # Enrolment growth rate (first vs last month) from a unit x month pivot
+        months = df['date'].to_numpy().astype('datetime64[M]').astype(np.int64)
+        valid = has_date & (units >= 0)
+        first_month_code = months[valid].min() if valid.any() else 0
+        n_months = (months[valid].max() - first_month_code + 1) if valid.any() else 1
+        cells = np.where(valid, units * n_months + (months - first_month_code), -1)
+        pivot_rows = _group_sum(cells, n_units * n_months).reshape(n_units, n_months)
+        pivot_volume = _group_sum(cells, n_units * n_months, total).reshape(n_units, n_months)
+        
+        observed = pivot_rows > 0
+        first = np.argmax(observed, axis=1)
+        last = n_months - 1 - np.argmax(observed[:, ::-1], axis=1)
+        first_month = pivot_volume[np.arange(n_units), first].astype(float)
+        last_month = pivot_volume[np.arange(n_units), last].astype(float)
+        has_growth = (observed.sum(axis=1) >= 2) & (first_month > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            enrol_features['enrol_growth_rate'] = np.where(
+                has_growth, (last_month - first_month) / first_month * 100, 0.0)
+        
+        return enrol_features
     
     def calculate_correlation_matrix(self, method='pearson'):
         """
@@ -151,59 +541,269 @@ class CorrelationEngine:
         Returns:
             pd.DataFrame: Correlation matrix
         """
-        state_features = self.create_state_level_features()
+        return self.calculate_correlation_matrices((method,))[method]
+    
+    def calculate_correlation_matrices(self, methods=CORRELATION_METHODS):
+        """
+        Calculate several correlation matrices from one feature table.
+        
+        Pearson is one matrix product of the standardized features;
+        Spearman ranks every column once and is the same product over the
+        ranks; Kendall tau-b scores the column pairs in parallel batches.
+        Each matrix is memoized.
+        
+        Args:
+            methods: Any of 'pearson', 'spearman' and 'kendall'
+            
+        Returns:
+            dict: method -> pd.DataFrame correlation matrix
+        """
+        for method in methods:
+            if method not in CORRELATION_METHODS:
+                raise ValueError("Method must be 'pearson', 'spearman', or 'kendall'")
+        
+        self._check_cache()
+        missing = [method for method in methods if method not in self._correlation_matrices]
+        if missing:
+            features = self._numeric_state_features()
+            for method in missing:
+                if method == 'kendall':
+                    corr = _kendall_matrix(features.to_numpy(dtype=float), self.max_workers)
+                else:
+                    # Pearson (of ranks, for Spearman) as standardized column products
+                    corr = _correlation_matrix(self._standardized_features(method),
+                                               CORRELATION_BLOCK_SIZE)
+                self._correlation_matrices[method] = pd.DataFrame(
+                    corr, index=features.columns, columns=features.columns)
+        
+        return {method: self._correlation_matrices[method].copy() for method in methods}
+    
+    def calculate_correlation_significance(self, method='pearson',
+                                           n_resamples=SIGNIFICANCE_RESAMPLES,
+                                           confidence=0.95, seed=42):
+        """
+        Bootstrap confidence intervals and permutation p-values for every
+        pair of state-level features.
         
-        # Select numeric columns
-        numeric_cols = state_features.select_dtypes(include=[np.number]).columns
+        Resamples are drawn in batches and spread across a process pool
+        (see correlation_significance); the table is memoized.
+        
+        Args:
+            method: 'pearson' or 'spearman'
+            n_resamples: Bootstrap and permutation resamples
+            confidence: Confidence level of the intervals
+            seed: Random seed
+            
+        Returns:
+            pd.DataFrame with Variable 1, Variable 2, Correlation, CI_Lower,
+            CI_Upper and P_Value per pair
+        """
+        self._check_cache()
+        key = (method, n_resamples, confidence, seed)
+        if key not in self._significance:
+            self._significance[key] = correlation_significance(
+                self._numeric_state_features(), method=method, n_resamples=n_resamples,
+                confidence=confidence, seed=seed, max_workers=self.max_workers)
+        return self._significance[key].copy()
+    
+    def _pair_significance(self, var1, var2):
+        """
+        Correlation, 95% CI and p-value of one feature pair (Pearson).
+        
+        At state grain the pair is looked up in the memoized table of all
+        pairs. At district or pincode grain only the pair's two columns are
+        resampled (memoized per pair), since the table of all pairs costs a
+        resampled copy of the whole feature matrix per resample.
+        
+        Returns:
+            dict with correlation, ci_lower, ci_upper, p_value and
+            significant (p below SIGNIFICANCE_ALPHA and a CI excluding 0)
+        """
+        if len(self.create_state_level_features()) <= 2:
+            return {'correlation': 0, 'ci_lower': np.nan, 'ci_upper': np.nan,
+                    'p_value': np.nan, 'significant': False}
         
-        if method == 'pearson':
-            corr_matrix = state_features[numeric_cols].corr(method='pearson')
-        elif method == 'spearman':
-            corr_matrix = state_features[numeric_cols].corr(method='spearman')
-        elif method == 'kendall':
-            corr_matrix = state_features[numeric_cols].corr(method='kendall')
+        if self.grain == 'state':
+            table = self.calculate_correlation_significance()
         else:
-            raise ValueError("Method must be 'pearson', 'spearman', or 'kendall'")
+            key = ('pair',) + tuple(sorted((var1, var2)))
+            if key not in self._significance:
+                self._significance[key] = correlation_significance(
+                    self._numeric_state_features()[list(key[1:])],
+                    n_resamples=SIGNIFICANCE_RESAMPLES, max_workers=self.max_workers)
+            table = self._significance[key]
+        pair = table[((table['Variable 1'] == var1) & (table['Variable 2'] == var2)) |
+                     ((table['Variable 1'] == var2) & (table['Variable 2'] == var1))].iloc[0]
+        return {
+            'correlation': pair['Correlation'],
+            'ci_lower': pair['CI_Lower'],
+            'ci_upper': pair['CI_Upper'],
+            'p_value': pair['P_Value'],
+            'significant': bool(pair['P_Value'] < SIGNIFICANCE_ALPHA and
+                                (pair['CI_Lower'] > 0 or pair['CI_Upper'] < 0)),
+        }
+    
+    def _significance_analysis(self, pairs):
+        """
+        Significance of named feature pairs.
         
-        return corr_matrix
+        Args:
+            pairs: dict of result name -> (feature, feature)
+            
+        Returns:
+            tuple: (dict of name -> correlation, dict of name -> pair significance)
+        """
+        significance = {name: self._pair_significance(var1, var2)
+                        for name, (var1, var2) in pairs.items()}
+        correlations = {name: result['correlation'] for name, result in significance.items()}
+        return correlations, significance
     
-    def identify_strong_correlations(self, threshold=0.7, method='pearson'):
+    def identify_strong_correlations(self, threshold=0.7, method='pearson', features=None,
+                                     block_size=None):
         """
         Identify pairs of variables with strong correlations.
         
+        By default the upper triangle of the memoized state-level matrix is
+        extracted with NumPy index arrays. Passing a wide feature matrix
+        (e.g. district or pincode level) or a block_size computes the
+        correlations block by block instead, so the dense matrix is never
+        materialized.
+        
         Args:
             threshold: Minimum absolute correlation to report
             method: Correlation method
+            features: Optional feature DataFrame (columns are variables,
+                      no missing values) instead of the state features
+            block_size: Columns per block for the blockwise computation
             
         Returns:
             pd.DataFrame with strong correlations
         """
-        corr_matrix = self.calculate_correlation_matrix(method=method)
-        
-        # Extract upper triangle (avoid duplicates)
-        mask = np.triu(np.ones_like(corr_matrix, dtype=bool), k=1)
-        
-        strong_corr = []
-        for i in range(len(corr_matrix)):
-            for j in range(i+1, len(corr_matrix)):
-                if mask[i, j]:
-                    corr_val = corr_matrix.iloc[i, j]
-                    if abs(corr_val) >= threshold:
-                        strong_corr.append({
-                            'Variable 1': corr_matrix.index[i],
-                            'Variable 2': corr_matrix.columns[j],
-                            'Correlation': corr_val,
-                            'Strength': 'Strong Positive' if corr_val >= threshold 
-                                       else 'Strong Negative',
-                            'Abs_Correlation': abs(corr_val)
-                        })
-        
-        df_corr = pd.DataFrame(strong_corr)
+        if features is None and block_size is None:
+            corr_matrix = self.calculate_correlation_matrix(method=method)
+            
+            # Extract upper triangle (avoid duplicates)
+            rows, cols = np.triu_indices(len(corr_matrix), k=1)
+            values = corr_matrix.to_numpy()[rows, cols]
+            strong = np.abs(values) >= threshold
+            df_corr = _correlation_pairs_frame(corr_matrix.index, corr_matrix.columns,
+                                               rows[strong], cols[strong], values[strong])
+        else:
+            blocks = self._correlation_pair_blocks(method, features,
+                                                   block_size or CORRELATION_BLOCK_SIZE)
+            if features is None:
+                features = self._numeric_state_features()
+            
+            found_rows = [np.empty(0, dtype=np.intp)]
+            found_cols = [np.empty(0, dtype=np.intp)]
+            found_values = [np.empty(0)]
+            for rows, cols, values in blocks:
+                strong = np.abs(values) >= threshold
+                found_rows.append(rows[strong])
+                found_cols.append(cols[strong])
+                found_values.append(values[strong])
+            rows, cols, values = (np.concatenate(found_rows), np.concatenate(found_cols),
+                                  np.concatenate(found_values))
+            df_corr = _correlation_pairs_frame(features.columns, features.columns, rows, cols, values)
+        
         if len(df_corr) > 0:
+            df_corr['Strength'] = np.where(df_corr['Correlation'] >= threshold,
+                                           'Strong Positive', 'Strong Negative')
+            df_corr = df_corr[['Variable 1', 'Variable 2', 'Correlation', 'Strength',
+                               'Abs_Correlation']]
             df_corr = df_corr.sort_values('Abs_Correlation', ascending=False)
+        else:
+            df_corr = pd.DataFrame()
         
         return df_corr
     
+    def top_k_pairs(self, k=10, method='pearson', features=None, block_size=None):
+        """
+        The k variable pairs with the largest absolute correlation.
+        
+        Correlations are computed block by block and only the running top k
+        are kept (selected with argpartition), so memory stays bounded by
+        one block plus k candidates however wide the feature matrix is.
+        
+        Args:
+            k: Number of pairs to return
+            method: 'pearson' or 'spearman' (computed blockwise); 'kendall'
+                    falls back to the dense matrix
+            features: Optional feature DataFrame (columns are variables,
+                      no missing values) instead of the state features
+            block_size: Columns per block (default CORRELATION_BLOCK_SIZE)
+            
+        Returns:
+            pd.DataFrame with Variable 1, Variable 2, Correlation and
+            Abs_Correlation, sorted by Abs_Correlation descending
+        """
+        blocks = self._correlation_pair_blocks(method, features,
+                                               block_size or CORRELATION_BLOCK_SIZE)
+        if features is None:
+            features = self._numeric_state_features()
+        
+        best_rows = np.empty(0, dtype=np.intp)
+        best_cols = np.empty(0, dtype=np.intp)
+        best_values = np.empty(0)
+        
+        for rows, cols, values in blocks:
+            rows = np.concatenate([best_rows, rows])
+            cols = np.concatenate([best_cols, cols])
+            values = np.concatenate([best_values, values])
+            
+            # NaN correlations (constant columns) never rank
+            strength = np.nan_to_num(np.abs(values), nan=-1.0)
+            if len(values) > k:
+                keep = np.argpartition(-strength, k - 1)[:k]
+                rows, cols, values = rows[keep], cols[keep], values[keep]
+            best_rows, best_cols, best_values = rows, cols, values
+        
+        pairs = _correlation_pairs_frame(features.columns, features.columns,
+                                         best_rows, best_cols, best_values)
+        pairs = pairs.dropna(subset=['Correlation'])
+        return pairs.sort_values('Abs_Correlation', ascending=False, kind='stable')\
+            .reset_index(drop=True)
+    
+    def _numeric_state_features(self):
+        """Numeric columns of the memoized state feature table."""
+        state_features = self.create_state_level_features()
+        return state_features[state_features.select_dtypes(include=[np.number]).columns]
+    
+    def _standardized_features(self, method):
+        """
+        Memoized standardized feature matrix for 'pearson' or 'spearman'.
+        
+        Spearman ranks every column once here; the matrix, strong-pair and
+        top-k computations all reuse the same ranks.
+        """
+        self._check_cache()
+        if method not in self._standardized:
+            self._standardized[method] = _standardize_columns(self._numeric_state_features(), method)
+        return self._standardized[method]
+    
+    def _correlation_pair_blocks(self, method, features, block_size):
+        """
+        Upper-triangle correlation blocks of the engine's features (memoized
+        standardization) or of an explicit feature DataFrame.
+        """
+        if method not in CORRELATION_METHODS:
+            raise ValueError("Method must be 'pearson', 'spearman', or 'kendall'")
+        
+        if method == 'kendall':
+            # No product form; Kendall uses the dense matrix as one block
+            if features is None:
+                corr = self.calculate_correlation_matrix('kendall').to_numpy()
+            else:
+                corr = _kendall_matrix(features.to_numpy(dtype=float), self.max_workers)
+            rows, cols = np.triu_indices(len(corr), k=1)
+            return iter([(rows, cols, corr[rows, cols])])
+        
+        if features is None:
+            z = self._standardized_features(method)
+        else:
+            z = _standardize_columns(features, method)
+        return _correlation_blocks(z, block_size)
+    
     def analyze_failure_demographic_relationship(self):
         """
         Analyze relationship between biometric failures and demographic gaps.
@@ -214,22 +814,12 @@ class CorrelationEngine:
         state_features = self.create_state_level_features()
         
         # Focus on failure rate vs demographic metrics
-        analysis = {
-            'correlation_failure_youth': stats.pearsonr(
-                state_features['demo_failure_rate'],
-                state_features['demo_youth_ratio']
-            )[0] if len(state_features) > 2 else 0,
-            
-            'correlation_failure_latency': stats.pearsonr(
-                state_features['demo_failure_rate'],
-                state_features['demo_p99_latency']
-            )[0] if len(state_features) > 2 else 0,
-            
-            'correlation_failure_enrolment': stats.pearsonr(
-                state_features['demo_failure_rate'],
-                state_features['enrol_total_volume']
-            )[0] if len(state_features) > 2 else 0,
-        }
+        analysis, significance = self._significance_analysis({
+            'correlation_failure_youth': ('demo_failure_rate', 'demo_youth_ratio'),
+            'correlation_failure_latency': ('demo_failure_rate', 'demo_p99_latency'),
+            'correlation_failure_enrolment': ('demo_failure_rate', 'enrol_total_volume'),
+        })
+        analysis['significance'] = significance
         
         # Identify high-risk states (high failure + low enrolment)
         state_features['risk_score'] = (
@@ -247,23 +837,27 @@ class CorrelationEngine:
         # Insights
         insights = []
         
-        if abs(analysis['correlation_failure_youth']) > 0.5:
-            direction = "positively" if analysis['correlation_failure_youth'] > 0 else "negatively"
+        youth = significance['correlation_failure_youth']
+        if youth['significant']:
+            direction = "positively" if youth['correlation'] > 0 else "negatively"
             insights.append(
                 f"Auth failure rate is {direction} correlated with youth demographic ratio "
-                f"(r={analysis['correlation_failure_youth']:.3f})"
+                f"({_format_significance(youth)})"
             )
         
-        if abs(analysis['correlation_failure_latency']) > 0.5:
+        latency = significance['correlation_failure_latency']
+        if latency['significant'] and latency['correlation'] > 0:
             insights.append(
-                f"High latency strongly correlates with failure rates "
-                f"(r={analysis['correlation_failure_latency']:.3f})"
+                f"High latency significantly correlates with failure rates "
+                f"({_format_significance(latency)})"
             )
         
-        if abs(analysis['correlation_failure_enrolment']) > 0.3:
-            direction = "lower" if analysis['correlation_failure_enrolment'] < 0 else "higher"
+        enrolment = significance['correlation_failure_enrolment']
+        if enrolment['significant']:
+            direction = "lower" if enrolment['correlation'] < 0 else "higher"
             insights.append(
-                f"States with higher failure rates tend to have {direction} enrolment volumes"
+                f"States with higher failure rates tend to have {direction} enrolment volumes "
+                f"({_format_significance(enrolment)})"
             )
         
         analysis['insights'] = insights
@@ -280,22 +874,12 @@ class CorrelationEngine:
         state_features = self.create_state_level_features()
         
         # Correlations
-        analysis = {
-            'correlation_enrol_bio_volume': stats.pearsonr(
-                state_features['enrol_total_volume'],
-                state_features['bio_total_volume']
-            )[0] if len(state_features) > 2 else 0,
-            
-            'correlation_enrol_growth_bio_growth': stats.pearsonr(
-                state_features['enrol_growth_rate'],
-                state_features['bio_daily_avg']
-            )[0] if len(state_features) > 2 else 0,
-            
-            'correlation_infant_enrol_youth_bio': stats.pearsonr(
-                state_features['enrol_infant_ratio'],
-                state_features['bio_youth_ratio']
-            )[0] if len(state_features) > 2 else 0,
-        }
+        analysis, significance = self._significance_analysis({
+            'correlation_enrol_bio_volume': ('enrol_total_volume', 'bio_total_volume'),
+            'correlation_enrol_growth_bio_growth': ('enrol_growth_rate', 'bio_daily_avg'),
+            'correlation_infant_enrol_youth_bio': ('enrol_infant_ratio', 'bio_youth_ratio'),
+        })
+        analysis['significance'] = significance
         
         # Identify states with mismatched patterns
         state_features['enrol_bio_ratio'] = (state_features['enrol_total_volume'] / 
@@ -320,21 +904,26 @@ class CorrelationEngine:
         # Insights
         insights = []
         
-        if analysis['correlation_enrol_bio_volume'] > 0.7:
+        volume = significance['correlation_enrol_bio_volume']
+        if volume['significant'] and volume['correlation'] > 0:
             insights.append(
-                "Strong positive correlation between enrolment and biometric volumes - "
-                "states with high enrolment also show high biometric activity"
+                "Significant positive correlation between enrolment and biometric volumes - "
+                "states with high enrolment also show high biometric activity "
+                f"({_format_significance(volume)})"
             )
-        elif analysis['correlation_enrol_bio_volume'] < 0.3:
+        elif volume['ci_upper'] < WEAK_CORRELATION:
+            # Only when the whole CI rules out more than a weak positive effect
             insights.append(
-                "Weak correlation between enrolment and biometric volumes - "
-                "enrolment drives may not translate to biometric updates"
+                "No significant positive correlation between enrolment and biometric volumes - "
+                "enrolment drives may not translate to biometric updates "
+                f"({_format_significance(volume)})"
             )
         
-        if analysis['correlation_infant_enrol_youth_bio'] > 0.5:
+        infant = significance['correlation_infant_enrol_youth_bio']
+        if infant['significant'] and infant['correlation'] > 0:
             insights.append(
                 "States with high infant enrolment also show youth biometric surge - "
-                "family enrollment pattern detected"
+                f"family enrollment pattern detected ({_format_significance(infant)})"
             )
         
         analysis['insights'] = insights
@@ -351,17 +940,11 @@ class CorrelationEngine:
         state_features = self.create_state_level_features()
         
         # Correlations
-        analysis = {
-            'correlation_latency_volume': stats.pearsonr(
-                state_features['demo_p99_latency'],
-                state_features['demo_total_volume']
-            )[0] if len(state_features) > 2 else 0,
-            
-            'correlation_latency_failure': stats.pearsonr(
-                state_features['demo_p99_latency'],
-                state_features['demo_failure_rate']
-            )[0] if len(state_features) > 2 else 0,
-        }
+        analysis, significance = self._significance_analysis({
+            'correlation_latency_volume': ('demo_p99_latency', 'demo_total_volume'),
+            'correlation_latency_failure': ('demo_p99_latency', 'demo_failure_rate'),
+        })
+        analysis['significance'] = significance
         
         # Identify infrastructure bottleneck states
         state_features['infra_score'] = (
@@ -378,16 +961,18 @@ class CorrelationEngine:
         # Insights
         insights = []
         
-        if analysis['correlation_latency_volume'] > 0.5:
+        volume = significance['correlation_latency_volume']
+        if volume['significant'] and volume['correlation'] > 0:
             insights.append(
                 "High-volume states experience higher latency - "
-                "infrastructure scaling required"
+                f"infrastructure scaling required ({_format_significance(volume)})"
             )
         
-        if analysis['correlation_latency_failure'] > 0.5:
+        failure = significance['correlation_latency_failure']
+        if failure['significant'] and failure['correlation'] > 0:
             insights.append(
-                "Strong correlation between latency and failure rate - "
-                "timeout-related failures likely"
+                "Significant correlation between latency and failure rate - "
+                f"timeout-related failures likely ({_format_significance(failure)})"
             )
         
         analysis['insights'] = insights
@@ -412,14 +997,20 @@ class CorrelationEngine:
         print(f"✓ Aggregated features for {len(report['state_features'])} states")
         
         # Correlation matrices
-        report['pearson_correlation'] = self.calculate_correlation_matrix('pearson')
-        report['spearman_correlation'] = self.calculate_correlation_matrix('spearman')
+        matrices = self.calculate_correlation_matrices(('pearson', 'spearman'))
+        report['pearson_correlation'] = matrices['pearson']
+        report['spearman_correlation'] = matrices['spearman']
         print(f"✓ Calculated correlation matrices")
         
         # Strong correlations
         report['strong_correlations'] = self.identify_strong_correlations(threshold=0.7)
         print(f"✓ Identified {len(report['strong_correlations'])} strong correlations")
         
+        # Bootstrap CIs and permutation p-values for every pair
+        report['correlation_significance'] = self.calculate_correlation_significance()
+        n_significant = (report['correlation_significance']['P_Value'] < SIGNIFICANCE_ALPHA).sum()
+        print(f"✓ {n_significant} pairs significant at p < {SIGNIFICANCE_ALPHA}")
+        
         # Specific relationship analyses
         print("\nAnalyzing specific relationships...")
         report['failure_demographic_analysis'] = self.analyze_failure_demographic_relationship()
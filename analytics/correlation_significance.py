@@ -0,0 +1,216 @@
+"""
+Correlation Significance Engine
+Bootstrap confidence intervals and permutation p-values for every variable
+pair of a correlation matrix. Resample indices are drawn in batches with
+NumPy and each batch scores all pairs at once (one batched matrix product);
+the batches are spread across a process pool. Batches are sized so the
+resampled copies of the feature matrix they hold stay within a memory budget.
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+SIGNIFICANCE_METHODS = ('pearson', 'spearman')
+
+# Most resamples scored per batch (one batched matrix product each)
+SIGNIFICANCE_BATCH_SIZE = 250
+
+# Bytes of resampled feature matrices one batch may hold; the batch size
+# follows from it and the feature matrix size
+SIGNIFICANCE_BATCH_MEMORY = 128 * 2 ** 20
+
+# Bytes held at once by all running batches; caps the process pool width
+SIGNIFICANCE_MEMORY_BUDGET = 1024 * 2 ** 20
+
+# Float arrays of the feature matrix's size a batch holds per resample at peak
+# (the resample, its centered copy and the rank bookkeeping for Spearman)
+_ARRAYS_PER_RESAMPLE = 4
+
+# Below this many rows x columns x resamples, batches run in-process
+SIGNIFICANCE_PARALLEL_MIN_WORK = 20_000_000
+
+# Feature matrix shared with worker processes (set by the pool initializer)
+_WORKER_VALUES = None
+
+
+def _init_significance_worker(values):
+    """Process pool initializer: keep the feature matrix for the batches."""
+    global _WORKER_VALUES
+    _WORKER_VALUES = values
+
+
+def _dense_ranks(values):
+    """Per-column dense integer ranks (0 for the smallest distinct value)."""
+    codes = np.empty(values.shape, dtype=np.int64)
+    for col in range(values.shape[1]):
+        codes[:, col] = np.unique(values[:, col], return_inverse=True)[1].ravel()
+    return codes
+
+
+def _resample_ranks(codes, indices):
+    """
+    Average ranks (ties share their mean rank) of bootstrap resamples.
+    
+    A resample only holds values of the original sample, so its ranks
+    follow from counting each column's dense codes; no per-resample sort.
+    
+    Args:
+        codes: Dense ranks of the sample, shape (rows, columns)
+        indices: Resampled row indices, shape (batch, rows)
+        
+    Returns:
+        np.ndarray of shape (batch, rows, columns)
+    """
+    n_batch = len(indices)
+    n_cols = codes.shape[1]
+    n_codes = int(codes.max()) + 1 if codes.size else 1
+    
+    sampled = codes[indices].transpose(0, 2, 1)
+    offsets = (np.arange(n_batch)[:, None] * n_cols + np.arange(n_cols)[None, :]) * n_codes
+    counts = np.bincount((sampled + offsets[:, :, None]).ravel(),
+                         minlength=n_batch * n_cols * n_codes).reshape(n_batch, n_cols, n_codes)
+    average = np.cumsum(counts, axis=2) - (counts - 1) / 2
+    return np.take_along_axis(average, sampled, axis=2).transpose(0, 2, 1)
+
+
+def _batched_correlations(samples):
+    """
+    Pearson correlation matrices of a stack of samples.
+    
+    Args:
+        samples: Array of shape (batch, rows, columns)
+        
+    Returns:
+        np.ndarray of shape (batch, columns, columns); NaN for columns that
+        are constant within a sample
+    """
+    z = samples - samples.mean(axis=1, keepdims=True)
+    norms = np.sqrt(np.einsum('bnp,bnp->bp', z, z))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z /= norms[:, None, :]
+    corr = np.matmul(z.transpose(0, 2, 1), z)
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _significance_batch(task, values=None):
+    """
+    Score one batch of bootstrap and permutation resamples.
+    
+    Args:
+        task: (seed, n_resamples, method, observed) where observed holds the
+              full-sample upper-triangle correlations
+        values: Feature matrix (rows x columns); the worker's copy if None
+        
+    Returns:
+        tuple: (bootstrap upper-triangle correlations of shape
+                (n_resamples, pairs), permutation exceedance counts per pair)
+    """
+    seed, n_resamples, method, observed = task
+    values = _WORKER_VALUES if values is None else values
+    n_rows, n_cols = values.shape
+    rows, cols = np.triu_indices(n_cols, k=1)
+    rng = np.random.default_rng(seed)
+    
+    # Bootstrap: resample whole rows, keeping the columns paired (and
+    # re-rank each resample for Spearman)
+    indices = rng.integers(0, n_rows, size=(n_resamples, n_rows))
+    if method == 'spearman':
+        samples = _resample_ranks(_dense_ranks(values), indices)
+    else:
+        samples = values[indices]
+    boot = _batched_correlations(samples)[:, rows, cols]
+    del samples
+    
+    # Permutation: shuffle every column independently, which breaks each
+    # pair's association; ranks are invariant under shuffling
+    ranked = stats.rankdata(values, axis=0) if method == 'spearman' else values
+    shuffled = np.repeat(ranked[None], n_resamples, axis=0)
+    rng.permuted(shuffled, axis=1, out=shuffled)
+    perm = _batched_correlations(shuffled)[:, rows, cols]
+    with np.errstate(invalid='ignore'):
+        exceed = (np.abs(perm) >= np.abs(observed) - 1e-12).sum(axis=0)
+    
+    return boot, exceed
+
+
+def correlation_significance(features, method='pearson', n_resamples=10_000, confidence=0.95,
+                             seed=42, max_workers=None, batch_size=SIGNIFICANCE_BATCH_SIZE,
+                             batch_memory=SIGNIFICANCE_BATCH_MEMORY,
+                             memory_budget=SIGNIFICANCE_MEMORY_BUDGET):
+    """
+    Bootstrap CIs and permutation p-values for every pair of feature columns.
+
+    Results are reproducible for a given seed whatever the number of
+    workers: each batch draws from its own spawned seed sequence. Batches
+    are capped at batch_memory bytes of resampled feature matrices, and
+    only as many run at once as fit in memory_budget.
+
+    Args:
+        features: DataFrame, columns are variables (no missing values)
+        method: 'pearson' or 'spearman'
+        n_resamples: Bootstrap and permutation resamples
+        confidence: Confidence level of the percentile bootstrap interval
+        seed: Random seed
+        max_workers: Worker processes (default: CPU count; 1 runs in-process)
+        batch_size: Most resamples per batch
+        batch_memory: Bytes of resamples one batch may hold
+        memory_budget: Bytes of resamples held at once across the workers
+
+    Returns:
+        pd.DataFrame with Variable 1, Variable 2, Correlation, CI_Lower,
+        CI_Upper and P_Value per pair (in upper-triangle order)
+    """
+    if method not in SIGNIFICANCE_METHODS:
+        raise ValueError("Method must be 'pearson' or 'spearman'")
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be positive")
+
+    values = np.ascontiguousarray(features.to_numpy(dtype=float))
+    n_rows, n_cols = values.shape
+    rows, cols = np.triu_indices(n_cols, k=1)
+
+    sample = stats.rankdata(values, axis=0) if method == 'spearman' else values
+    observed = _batched_correlations(sample[None])[0, rows, cols]
+
+    per_resample = _ARRAYS_PER_RESAMPLE * max(n_rows * n_cols, 1) * values.itemsize
+    batch_size = max(1, min(batch_size, batch_memory // per_resample))
+    sizes = [batch_size] * (n_resamples // batch_size)
+    if n_resamples % batch_size:
+        sizes.append(n_resamples % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(batch_seed, size, method, observed) for batch_seed, size in zip(seeds, sizes)]
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks),
+                      max(1, memory_budget // (batch_size * per_resample)))
+    if max_workers > 1 and n_rows * n_cols * n_resamples >= SIGNIFICANCE_PARALLEL_MIN_WORK:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_significance_worker,
+                                 initargs=(values,)) as pool:
+            results = list(pool.map(_significance_batch, tasks))
+    else:
+        results = [_significance_batch(task, values) for task in tasks]
+
+    boot = np.concatenate([batch for batch, _ in results])
+    exceed = sum((counts for _, counts in results), np.zeros(len(rows), dtype=np.int64))
+
+    alpha = 1 - confidence
+    with warnings.catch_warnings():
+        # Pairs with a constant column have no finite resample
+        warnings.simplefilter('ignore', RuntimeWarning)
+        lower, upper = np.nanpercentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+    p_values = np.where(np.isnan(observed), np.nan, (exceed + 1) / (n_resamples + 1))
+
+    return pd.DataFrame({
+        'Variable 1': features.columns[rows],
+        'Variable 2': features.columns[cols],
+        'Correlation': observed,
+        'CI_Lower': lower,
+        'CI_Upper': upper,
+        'P_Value': p_values,
+    })
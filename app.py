@@ -12,7 +12,11 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import gc
+import os
 import sys
+import threading
+import time
 from pathlib import Path
 
 # Add backend to path
@@ -21,6 +25,9 @@ sys.path.insert(0, str(Path(__file__).parent / 'components'))
 sys.path.insert(0, str(Path(__file__).parent / 'analytics'))
 
 from data_pipeline import IntegratedAadharDataPipeline
+from data_cube import DashboardCube
+from encoding import DAYS_OF_WEEK
+from figure_cache import FigureCache
 
 # Initialize Dash app with Bootstrap theme
 app = dash.Dash(
@@ -38,6 +45,16 @@ DEMOGRAPHIC_DF = None
 ENROLMENT_DF = None
 INTEGRATED_DF = None
 NATIONAL_KPIS = {}
+CUBE = None
+KPI_ENGINE = None
+DATE_DIMENSION = None
+
+# Memoized chart figures, keyed on callback inputs and the loaded data version
+FIGURE_CACHE = FigureCache.from_env()
+
+# Set once the data is loaded; /readyz reports it to health checks
+DATA_READY = threading.Event()
+_LOAD_LOCK = threading.Lock()
 
 # Color schemes for government-grade visualizations
 COLORS = {
@@ -60,7 +77,8 @@ COLORS = {
 
 def load_data_on_startup(sample_frac=0.1):
     """Load data when application starts."""
-    global DATA_PIPELINE, BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF, INTEGRATED_DF, NATIONAL_KPIS
+    global DATA_PIPELINE, BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF, INTEGRATED_DF, NATIONAL_KPIS, CUBE
+    global KPI_ENGINE, DATE_DIMENSION
     
     print("=" * 80)
     print("INITIALIZING AADHAR DASHBOARD")
@@ -68,15 +86,221 @@ def load_data_on_startup(sample_frac=0.1):
     
     DATA_PIPELINE = IntegratedAadharDataPipeline()
     
-    # Load with sample for faster startup (use None for full data in production)
-    BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF = DATA_PIPELINE.load_all(sample_frac=sample_frac)
-    INTEGRATED_DF = DATA_PIPELINE.create_integrated_view()
+    chunksize = _stream_chunksize_from_env()
+    if chunksize:
+        # Low-memory hosts: aggregate the CSVs chunk by chunk, no raw frames
+        stream = DATA_PIPELINE.load_streaming(chunksize, sample_frac=sample_frac)
+        BIOMETRIC_DF = DEMOGRAPHIC_DF = ENROLMENT_DF = None
+        INTEGRATED_DF = DATA_PIPELINE.integrated_df
+        CUBE = stream.build_cube(INTEGRATED_DF, DATA_PIPELINE.latency_sketches)
+    else:
+        # Load with sample for faster startup (use None for full data in production)
+        BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF = DATA_PIPELINE.load_all(sample_frac=sample_frac)
+        INTEGRATED_DF = DATA_PIPELINE.create_integrated_view()
+        
+        # Pre-aggregate once so callbacks never scan raw rows
+        CUBE = DashboardCube.build(BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF, INTEGRATED_DF,
+                                   latency_sketches=DATA_PIPELINE.latency_sketch_index())
+
+    # From the streamed aggregates or the frames, with the pipeline's one latency sketch
     NATIONAL_KPIS = DATA_PIPELINE.get_national_kpis()
+
+    # Running totals behind the filtered KPI cards; refresh() keeps them current
+    KPI_ENGINE = DATA_PIPELINE.kpi_engine()
+    # Calendar attributes once per distinct date, for the temporal charts
+    DATE_DIMENSION = DATA_PIPELINE.date_dimension()
+
+    _share_frames()
+
+    # Figures built from previously loaded data must not be served again; the
+    # token is the same in every worker that loaded the same shards
+    FIGURE_CACHE.set_data_version(DATA_PIPELINE.data_version())
     
     print("\n✓ Dashboard initialized successfully!")
     print("=" * 80 + "\n")
 
 
+def _share_frames():
+    """
+    Replace the heap frames with views over shared memory, so workers map
+    one copy (set AADHAR_SHARED_FRAMES=0 to keep private copies).
+    """
+    global BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF, INTEGRATED_DF
+
+    if os.environ.get('AADHAR_SHARED_FRAMES', '1') != '0':
+        try:
+            BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF, INTEGRATED_DF = DATA_PIPELINE.share_frames(
+                os.environ.get('AADHAR_SHARED_DIR'))
+        except Exception as e:
+            print(f"Warning: shared frames unavailable ({e}), keeping private copies")
+
+
+def refresh_data():
+    """
+    Ingest CSV shards added since startup without reloading everything.
+
+    The pipeline appends only the new shards; the cube is updated for the
+    dates they touch, and the KPIs, shared frames and figure cache follow.
+    Falls back to a full reload if a previously loaded shard changed. Run
+    periodically by start_refresh_timer() in every serving process.
+
+    Returns:
+        pd.DatetimeIndex of the refreshed dates, or None after a full reload
+    """
+    global BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF, INTEGRATED_DF, NATIONAL_KPIS
+    global DATE_DIMENSION
+
+    with _LOAD_LOCK:
+        try:
+            dates = DATA_PIPELINE.refresh()
+        except ValueError as e:
+            print(f"Incremental refresh unavailable ({e}) - reloading all data")
+            load_data_on_startup(sample_frac=DATA_PIPELINE.sample_frac)
+            return None
+        if len(dates) == 0:
+            return dates
+
+        BIOMETRIC_DF = DATA_PIPELINE.biometric_df
+        DEMOGRAPHIC_DF = DATA_PIPELINE.demographic_df
+        ENROLMENT_DF = DATA_PIPELINE.enrolment_df
+        INTEGRATED_DF = DATA_PIPELINE.integrated_df
+        CUBE.update(dates, BIOMETRIC_DF, DEMOGRAPHIC_DF, ENROLMENT_DF, INTEGRATED_DF,
+                    latency_sketches=DATA_PIPELINE.latency_sketches)
+        NATIONAL_KPIS = DATA_PIPELINE.get_national_kpis()
+        DATE_DIMENSION = DATA_PIPELINE.date_dimension()
+        _share_frames()
+        FIGURE_CACHE.set_data_version(DATA_PIPELINE.data_version())
+        return dates
+
+
+def _stream_chunksize_from_env():
+    """
+    Read AADHAR_STREAM_CHUNKSIZE: rows per chunk for the streaming loader
+    (bounds peak memory), or None (unset or 0) to load the full frames.
+    """
+    value = os.environ.get('AADHAR_STREAM_CHUNKSIZE', '').strip()
+    return int(value) if value and int(value) > 0 else None
+
+
+def _sample_frac_from_env(default=0.1):
+    """Read AADHAR_SAMPLE_FRAC ('none' or 'full' loads every row)."""
+    value = os.environ.get('AADHAR_SAMPLE_FRAC')
+    if value is None:
+        return default
+    if value.strip().lower() in ('none', 'full', ''):
+        return None
+    return float(value)
+
+
+def _refresh_interval_from_env():
+    """
+    Read AADHAR_REFRESH_INTERVAL: seconds between checks for new CSV shards,
+    or None (unset or 0) to never refresh after startup.
+    """
+    value = os.environ.get('AADHAR_REFRESH_INTERVAL', '').strip()
+    return float(value) if value and float(value) > 0 else None
+
+
+def _refresh_loop(interval):
+    """Call refresh_data() every interval seconds once the data is loaded."""
+    while True:
+        time.sleep(interval)
+        # Streamed aggregates cannot be appended to; refresh_data() would
+        # reload everything on every tick
+        if not DATA_READY.is_set() or DATA_PIPELINE.stream is not None:
+            continue
+        try:
+            refresh_data()
+        except Exception as e:
+            print(f"Warning: data refresh failed ({e})")
+
+
+def start_refresh_timer(interval='env'):
+    """
+    Periodically ingest CSV shards added since startup in this process.
+
+    Every serving process holds its own frames, cube and KPI engine, so each
+    runs its own timer and picks up new shards within one interval of them
+    landing. Under gunicorn the timer is started per worker by the post_fork
+    hook in gunicorn.conf.py, since threads do not survive the fork from the
+    preloaded master. Workers ingesting the same shards reach the same cache
+    key: the first to take the cache lock writes the entry's deltas and the
+    others find it complete and skip the write, then all of them attach to
+    the same shared frames (see refresh_data).
+
+    Args:
+        interval: Seconds between checks; 'env' reads AADHAR_REFRESH_INTERVAL,
+                  None disables the timer
+
+    Returns:
+        threading.Thread, or None if refreshing is disabled
+    """
+    if interval == 'env':
+        interval = _refresh_interval_from_env()
+    if not interval:
+        return None
+    thread = threading.Thread(target=_refresh_loop, args=(interval,), daemon=True,
+                              name='aadhar-data-refresh')
+    thread.start()
+    print(f"✓ Checking for new CSV shards every {interval:g}s (pid {os.getpid()})")
+    return thread
+
+
+def _load_once(sample_frac):
+    """Load data unless already loaded, then flag the app as ready."""
+    with _LOAD_LOCK:
+        if DATA_READY.is_set():
+            return
+        load_data_on_startup(sample_frac=sample_frac)
+        DATA_READY.set()
+
+
+def create_app(sample_frac='env', background=False):
+    """
+    WSGI application factory.
+
+    With gunicorn's --preload (see gunicorn.conf.py) this runs once in the
+    master, so the data is loaded and aggregated before the workers fork and
+    they share those pages copy-on-write instead of each loading its own copy.
+
+    Args:
+        sample_frac: Fraction of rows to load; 'env' reads AADHAR_SAMPLE_FRAC
+                     (default 0.1), None loads the full data
+        background: Load in a background thread and return immediately;
+                    /readyz reports 503 until loading finishes
+
+    Returns:
+        Flask server for the WSGI container
+    """
+    if sample_frac == 'env':
+        sample_frac = _sample_frac_from_env()
+
+    if background:
+        threading.Thread(target=_load_once, args=(sample_frac,), daemon=True,
+                         name='aadhar-data-loader').start()
+    else:
+        _load_once(sample_frac)
+        # Move the loaded objects out of the collector's generations so that
+        # collections in forked workers do not touch (and un-share) their pages
+        gc.freeze()
+
+    return server
+
+
+@server.route('/healthz')
+def healthz():
+    """Liveness probe: the process is up."""
+    return {'status': 'ok'}, 200
+
+
+@server.route('/readyz')
+def readyz():
+    """Readiness probe: 503 until the data has been loaded."""
+    if DATA_READY.is_set():
+        return {'status': 'ready', 'data_version': FIGURE_CACHE.data_version}, 200
+    return {'status': 'loading'}, 503
+
+
 def create_kpi_card(title, value, subtitle="", icon="fa-chart-line", color="primary", value_id=None, subtitle_id=None):
     """Create a KPI card for executive dashboard."""
     subtitle_props = {'className': 'text-secondary'}
@@ -502,9 +726,8 @@ app.layout = dbc.Container([
 )
 def update_state_filter(n_clicks):
     """Populate state filter dropdown."""
-    if BIOMETRIC_DF is not None:
-        states = sorted(BIOMETRIC_DF['state'].unique())
-        return [{'label': state, 'value': state} for state in states]
+    if CUBE is not None and CUBE.has('biometric'):
+        return [{'label': state, 'value': state} for state in CUBE.states['biometric']]
     return []
 
 
@@ -515,33 +738,30 @@ def update_state_filter(n_clicks):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_zonal_distribution(n_clicks, dataset, start_date, end_date):
     """Update zonal distribution donut chart."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        df = CUBE.slice('biometric', start_date, end_date)
         metric_col = 'total_transactions'
         title = 'Biometric Transactions by Zone'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        df = CUBE.slice('demographic', start_date, end_date)
         metric_col = 'total_demographic'
         title = 'Demographic Updates by Zone'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        df = CUBE.slice('enrolment', start_date, end_date)
         metric_col = 'total_enrolment'
         title = 'Enrolments by Zone'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        df = CUBE.slice('integrated', start_date, end_date)
         metric_col = 'bio_transactions'
         title = 'Integrated Metrics by Zone'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    zone_data = df.groupby('zone')[metric_col].sum().sort_values(ascending=False)
+    zone_data = df.groupby('zone', observed=True)[metric_col].sum().sort_values(ascending=False)
     
     fig = go.Figure(data=[go.Pie(
         labels=zone_data.index,
@@ -573,22 +793,32 @@ def update_zonal_distribution(n_clicks, dataset, start_date, end_date):
      Output('kpi-states-enrol', 'children'),
      Output('kpi-data-points', 'children')],
     [Input('refresh-button', 'n_clicks'),
-     Input('interval-component', 'n_intervals')]
+     Input('interval-component', 'n_intervals'),
+     Input('date-range-picker', 'start_date'),
+     Input('date-range-picker', 'end_date'),
+     Input('zone-filter', 'value'),
+     Input('state-filter', 'value')]
 )
-def update_kpi_cards(n_clicks, n_intervals):
-    """Update all KPI cards with loaded data."""
+def update_kpi_cards(n_clicks, n_intervals, start_date, end_date, zones, states):
+    """Update all KPI cards for the selected dates, zones and states."""
+    kpis = NATIONAL_KPIS
+    if KPI_ENGINE is not None:
+        # Like the charts, dates only filter once both ends are set
+        if not (start_date and end_date):
+            start_date = end_date = None
+        kpis = KPI_ENGINE.kpis(start_date, end_date, zones=zones, states=states)
     return (
-        f"{NATIONAL_KPIS.get('total_biometric_transactions', 0):,.0f}",
-        f"{NATIONAL_KPIS.get('total_enrolments', 0):,.0f}",
-        f"Infant: {NATIONAL_KPIS.get('infant_enrolments', 0):,.0f}",
-        f"{NATIONAL_KPIS.get('national_auth_success_rate', 0):.1f}%",
-        f"Total Records: {NATIONAL_KPIS.get('total_demographic_records', 0):,.0f}",
-        f"{NATIONAL_KPIS.get('p99_latency_ms', 0):.0f} ms",
-        f"Median: {NATIONAL_KPIS.get('median_latency_ms', 0):.0f} ms",
-        f"{NATIONAL_KPIS.get('active_states_biometric', 0)}",
-        f"Districts: {NATIONAL_KPIS.get('active_districts_biometric', 0):,}",
-        f"{NATIONAL_KPIS.get('active_states_enrolment', 0)}",
-        f"{NATIONAL_KPIS.get('total_data_points', 0):,.0f}"
+        f"{kpis.get('total_biometric_transactions', 0):,.0f}",
+        f"{kpis.get('total_enrolments', 0):,.0f}",
+        f"Infant: {kpis.get('infant_enrolments', 0):,.0f}",
+        f"{kpis.get('national_auth_success_rate', 0):.1f}%",
+        f"Total Records: {kpis.get('total_demographic_records', 0):,.0f}",
+        f"{kpis.get('p99_latency_ms', 0):.0f} ms",
+        f"Median: {kpis.get('median_latency_ms', 0):.0f} ms",
+        f"{kpis.get('active_states_biometric', 0)}",
+        f"Districts: {kpis.get('active_districts_biometric', 0):,}",
+        f"{kpis.get('active_states_enrolment', 0)}",
+        f"{kpis.get('total_data_points', 0):,.0f}"
     )
 
 
@@ -600,37 +830,30 @@ def update_kpi_cards(n_clicks, n_intervals):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_state_performance(n_clicks, dataset, zones, start_date, end_date):
     """Update top states bar chart."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        df = CUBE.slice('biometric', start_date, end_date, zones=zones)
         metric_col = 'total_transactions'
         title = 'Top 10 States - Biometric Transactions'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        df = CUBE.slice('demographic', start_date, end_date, zones=zones)
         metric_col = 'total_demographic'
         title = 'Top 10 States - Demographic Updates'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        df = CUBE.slice('enrolment', start_date, end_date, zones=zones)
         metric_col = 'total_enrolment'
         title = 'Top 10 States - Enrolments'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        df = CUBE.slice('integrated', start_date, end_date, zones=zones)
         metric_col = 'bio_transactions'
         title = 'Top 10 States - Integrated Metrics'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    # Filter by zone
-    if zones:
-        df = df[df['zone'].isin(zones)]
-    
-    state_data = df.groupby('state')[metric_col].sum().sort_values(ascending=False).head(10)
+    state_data = df.groupby('state', observed=True)[metric_col].sum().sort_values(ascending=False).head(10)
     
     fig = go.Figure(data=[go.Bar(
         x=state_data.values,
@@ -658,41 +881,32 @@ def update_state_performance(n_clicks, dataset, zones, start_date, end_date):
      Input('date-range-picker', 'end_date'),
      Input('aggregation-level', 'value')]
 )
+@FIGURE_CACHE.memoize
 def update_growth_trajectory(n_clicks, dataset, start_date, end_date, aggregation):
     """Update national growth trajectory line chart."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
-        metric_col = 'total_transactions'
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        daily = CUBE.daily('biometric', start_date, end_date)
         title = 'Biometric Transactions Growth'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
-        metric_col = 'total_demographic'
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        daily = CUBE.daily('demographic', start_date, end_date)
         title = 'Demographic Updates Growth'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
-        metric_col = 'total_enrolment'
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        daily = CUBE.daily('enrolment', start_date, end_date)
         title = 'Enrolment Growth'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
-        metric_col = 'bio_transactions'
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        daily = CUBE.daily('integrated', start_date, end_date)
         title = 'Integrated Metrics Growth'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    # Apply aggregation
+    # Apply aggregation by mapping the per-date totals to their week/month
     if aggregation == 'weekly':
-        df['period'] = df['date'].dt.to_period('W').dt.to_timestamp()
+        daily_data = DATE_DIMENSION.aggregate(daily, 'week_start')
     elif aggregation == 'monthly':
-        df['period'] = df['date'].dt.to_period('M').dt.to_timestamp()
+        daily_data = DATE_DIMENSION.aggregate(daily, 'month_start')
     else:
-        df['period'] = df['date']
-    
-    daily_data = df.groupby('period')[metric_col].sum().sort_index()
+        daily_data = daily
     cumulative = daily_data.cumsum()
     
     fig = go.Figure()
@@ -725,10 +939,11 @@ def update_growth_trajectory(n_clicks, dataset, start_date, end_date, aggregatio
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_modality_performance(n_clicks, dataset, start_date, end_date):
     """Update biometric modality performance chart."""
     # Modality data only available in demographic dataset
-    if dataset != 'demographic' or DEMOGRAPHIC_DF is None:
+    if dataset != 'demographic' or CUBE is None or CUBE.modality is None:
         fig = go.Figure()
         fig.add_annotation(
             text="Auth Modality analysis only available<br>for Demographic dataset",
@@ -739,19 +954,8 @@ def update_modality_performance(n_clicks, dataset, start_date, end_date):
         fig.update_layout(title="Auth Modality: Volume vs Success Rate", height=350)
         return fig
     
-    df = DEMOGRAPHIC_DF.copy()
-    
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    # Modality distribution
-    modality_counts = df['auth_modality'].value_counts()
-    
-    # Success rate by modality
-    success_by_modality = df.groupby('auth_modality')['auth_status'].apply(
-        lambda x: (x == 'Success').sum() / len(x) * 100
-    )
+    # Modality distribution and success rate by modality
+    modality_counts, success_by_modality = CUBE.modality_summary(start_date, end_date)
     
     fig = go.Figure()
     
@@ -792,10 +996,11 @@ def update_modality_performance(n_clicks, dataset, start_date, end_date):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_error_analysis(n_clicks, dataset, start_date, end_date):
     """Update error code analysis chart."""
     # Error code analysis only available in demographic dataset
-    if dataset != 'demographic' or DEMOGRAPHIC_DF is None:
+    if dataset != 'demographic' or CUBE is None or CUBE.errors is None:
         fig = go.Figure()
         fig.add_annotation(
             text="Error code analysis only available<br>for Demographic dataset",
@@ -806,14 +1011,7 @@ def update_error_analysis(n_clicks, dataset, start_date, end_date):
         fig.update_layout(title="Top Error Codes", height=350)
         return fig
     
-    df = DEMOGRAPHIC_DF.copy()
-    
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    errors = df[df['auth_status'] == 'Failure']
-    error_counts = errors['error_code'].value_counts()
+    error_counts = CUBE.error_counts(start_date, end_date)
     
     error_labels = {
         300: 'Biometric Mismatch',
@@ -850,10 +1048,11 @@ def update_error_analysis(n_clicks, dataset, start_date, end_date):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_latency_heatmap(n_clicks, dataset, states, start_date, end_date):
     """Update state latency performance heatmap."""
     # Latency data only available in demographic dataset
-    if dataset != 'demographic' or DEMOGRAPHIC_DF is None:
+    if dataset != 'demographic' or CUBE is None or CUBE.latency is None:
         fig = go.Figure()
         fig.add_annotation(
             text="Latency analysis only available<br>for Demographic dataset",
@@ -864,24 +1063,12 @@ def update_latency_heatmap(n_clicks, dataset, states, start_date, end_date):
         fig.update_layout(title="State-wise Latency Performance Matrix", height=350)
         return fig
     
-    df = DEMOGRAPHIC_DF.copy()
-    
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    if states:
-        df = df[df['state'].isin(states)]
+    # Latency metrics per state from the merged cube histograms
+    latency_metrics = CUBE.latency_summary(start_date, end_date, states)
     
     # Get top 15 states by volume
-    top_states = df.groupby('state')['response_time_ms'].count().sort_values(ascending=False).head(15).index
-    df = df[df['state'].isin(top_states)]
-    
-    # Calculate latency metrics
-    latency_metrics = df.groupby('state')['response_time_ms'].agg(['median', 'mean', 
-                                                                     lambda x: x.quantile(0.95),
-                                                                     lambda x: x.quantile(0.99)])
-    latency_metrics.columns = ['Median', 'Mean', 'P95', 'P99']
+    top_states = latency_metrics['Count'].sort_values(ascending=False).head(15).index
+    latency_metrics = latency_metrics.loc[top_states, ['Median', 'Mean', 'P95', 'P99']]
     latency_metrics = latency_metrics.sort_values('P99', ascending=False)
     
     fig = go.Figure(data=go.Heatmap(
@@ -912,41 +1099,28 @@ def update_latency_heatmap(n_clicks, dataset, states, start_date, end_date):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_temporal_patterns(n_clicks, dataset, start_date, end_date):
     """Update day-of-week patterns chart."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
-        metric_col = 'total_transactions'
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        daily = CUBE.daily('biometric', start_date, end_date)
         title = 'Biometric Volume by Day of Week'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
-        metric_col = 'total_demographic'
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        daily = CUBE.daily('demographic', start_date, end_date)
         title = 'Demographic Updates by Day of Week'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
-        metric_col = 'total_enrolment'
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        daily = CUBE.daily('enrolment', start_date, end_date)
         title = 'Enrolments by Day of Week'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
-        metric_col = 'bio_transactions'
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        daily = CUBE.daily('integrated', start_date, end_date)
         title = 'Integrated Metrics by Day of Week'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    # Ensure day_of_week column exists
-    if 'day_of_week' not in df.columns:
-        df['day_of_week'] = df['date'].dt.day_name()
-    
-    # Day of week order
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    
-    dow_data = df.groupby('day_of_week')[metric_col].sum()
-    dow_data = dow_data.reindex(day_order)
+    # Map the per-date totals to their day of week (Monday first)
+    dow_data = DATE_DIMENSION.aggregate(daily, 'day_of_week')
+    dow_data = dow_data.set_axis(dow_data.index.astype(str)).reindex(DAYS_OF_WEEK)
     
     colors = [COLORS['danger'] if day == 'Sunday' else COLORS['primary'] for day in dow_data.index]
     
@@ -984,36 +1158,30 @@ def update_temporal_patterns(n_clicks, dataset, start_date, end_date):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_district_inequality(n_clicks, dataset, states, start_date, end_date):
     """Update Lorenz curve for district inequality."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        df = CUBE.slice('biometric', start_date, end_date, states=states)
         metric_col = 'total_transactions'
         title = 'District Inequality - Biometric (Lorenz Curve)'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        df = CUBE.slice('demographic', start_date, end_date, states=states)
         metric_col = 'total_demographic'
         title = 'District Inequality - Demographic (Lorenz Curve)'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        df = CUBE.slice('enrolment', start_date, end_date, states=states)
         metric_col = 'total_enrolment'
         title = 'District Inequality - Enrolment (Lorenz Curve)'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        df = CUBE.slice('integrated', start_date, end_date, states=states)
         metric_col = 'bio_transactions'
         title = 'District Inequality - Integrated (Lorenz Curve)'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    if states:
-        df = df[df['state'].isin(states)]
-    
-    district_volumes = df.groupby('district')[metric_col].sum().sort_values()
+    district_volumes = df.groupby('district', observed=True)[metric_col].sum().sort_values()
     cumsum = district_volumes.cumsum()
     
     # Lorenz curve
@@ -1060,42 +1228,40 @@ def update_district_inequality(n_clicks, dataset, states, start_date, end_date):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_state_district_scatter(n_clicks, dataset, start_date, end_date):
     """Update state vs district concentration scatter."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        df = CUBE.slice('biometric', start_date, end_date)
         metric_col = 'total_transactions'
         title = 'State vs District Concentration - Biometric'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        df = CUBE.slice('demographic', start_date, end_date)
         metric_col = 'total_demographic'
         title = 'State vs District Concentration - Demographic'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        df = CUBE.slice('enrolment', start_date, end_date)
         metric_col = 'total_enrolment'
         title = 'State vs District Concentration - Enrolment'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        df = CUBE.slice('integrated', start_date, end_date)
         metric_col = 'bio_transactions'
         title = 'State vs District Concentration - Integrated'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
     # Calculate state totals and max district per state
-    state_totals = df.groupby('state')[metric_col].sum()
+    state_totals = df.groupby('state', observed=True)[metric_col].sum()
     
-    max_district_per_state = df.groupby(['state', 'district'])[metric_col].sum()\
-        .groupby('state').max()
+    max_district_per_state = df.groupby(['state', 'district'], observed=True)[metric_col].sum()\
+        .groupby('state', observed=True).max()
     
     scatter_df = pd.DataFrame({
         'state_total': state_totals,
         'max_district': max_district_per_state,
-        'zone': df.groupby('state')['zone'].first()
+        # Plain labels, so plotly does not add traces for unobserved zones
+        'zone': df.groupby('state', observed=True)['zone'].first().astype(object)
     })
     
     scatter_df['centralization_ratio'] = scatter_df['max_district'] / scatter_df['state_total'] * 100
@@ -1131,33 +1297,30 @@ def update_state_district_scatter(n_clicks, dataset, start_date, end_date):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_inclusion_gaps(n_clicks, dataset, start_date, end_date):
     """Update bottom 20 districts (inclusion gaps)."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        df = CUBE.slice('biometric', start_date, end_date)
         metric_col = 'total_transactions'
         title = 'Bottom 20 Districts - Biometric'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        df = CUBE.slice('demographic', start_date, end_date)
         metric_col = 'total_demographic'
         title = 'Bottom 20 Districts - Demographic'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        df = CUBE.slice('enrolment', start_date, end_date)
         metric_col = 'total_enrolment'
         title = 'Bottom 20 Districts - Enrolment'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        df = CUBE.slice('integrated', start_date, end_date)
         metric_col = 'bio_transactions'
         title = 'Bottom 20 Districts - Integrated'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    district_data = df.groupby(['state', 'district'])[metric_col].sum().sort_values().head(20)
+    district_data = df.groupby(['state', 'district'], observed=True)[metric_col].sum().sort_values().head(20)
     labels = [f"{d} ({s})" for s, d in district_data.index]
     
     fig = go.Figure(data=[go.Bar(
@@ -1188,32 +1351,29 @@ def update_inclusion_gaps(n_clicks, dataset, start_date, end_date):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_anomaly_detection(n_clicks, dataset, start_date, end_date):
     """Update anomaly detection Z-score chart."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        df = CUBE.slice('biometric', start_date, end_date)
         metric_col = 'total_transactions'
         title = 'Biometric Transaction Anomalies'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        df = CUBE.slice('demographic', start_date, end_date)
         metric_col = 'total_demographic'
         title = 'Demographic Update Anomalies'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        df = CUBE.slice('enrolment', start_date, end_date)
         metric_col = 'total_enrolment'
         title = 'Enrolment Anomalies'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        df = CUBE.slice('integrated', start_date, end_date)
         metric_col = 'bio_transactions'
         title = 'Integrated Metrics Anomalies'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
     daily_volume = df.groupby('date')[metric_col].sum().sort_index()
     
     # Calculate Z-scores
@@ -1267,32 +1427,29 @@ def update_anomaly_detection(n_clicks, dataset, start_date, end_date):
      Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date')]
 )
+@FIGURE_CACHE.memoize
 def update_forecast(n_clicks, dataset, start_date, end_date):
     """Update 30-day forecast chart using NumPy polynomial fitting."""
     # Select appropriate dataset
-    if dataset == 'biometric' and BIOMETRIC_DF is not None:
-        df = BIOMETRIC_DF.copy()
+    if dataset == 'biometric' and CUBE is not None and CUBE.has('biometric'):
+        df = CUBE.slice('biometric', start_date, end_date)
         metric_col = 'total_transactions'
         title = 'Biometric 30-Day Forecast'
-    elif dataset == 'demographic' and DEMOGRAPHIC_DF is not None:
-        df = DEMOGRAPHIC_DF.copy()
+    elif dataset == 'demographic' and CUBE is not None and CUBE.has('demographic'):
+        df = CUBE.slice('demographic', start_date, end_date)
         metric_col = 'total_demographic'
         title = 'Demographic 30-Day Forecast'
-    elif dataset == 'enrolment' and ENROLMENT_DF is not None:
-        df = ENROLMENT_DF.copy()
+    elif dataset == 'enrolment' and CUBE is not None and CUBE.has('enrolment'):
+        df = CUBE.slice('enrolment', start_date, end_date)
         metric_col = 'total_enrolment'
         title = 'Enrolment 30-Day Forecast'
-    elif dataset == 'integrated' and INTEGRATED_DF is not None:
-        df = INTEGRATED_DF.copy()
+    elif dataset == 'integrated' and CUBE is not None and CUBE.has('integrated'):
+        df = CUBE.slice('integrated', start_date, end_date)
         metric_col = 'bio_transactions'
         title = 'Integrated 30-Day Forecast'
     else:
         return go.Figure()
     
-    # Filter by date
-    if start_date and end_date:
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
     daily_volume = df.groupby('date')[metric_col].sum().sort_index()
     
     # Simple linear regression for forecast using NumPy
@@ -1351,20 +1508,14 @@ def update_forecast(n_clicks, dataset, start_date, end_date):
     Output('correlation-matrix-chart', 'figure'),
     Input('refresh-button', 'n_clicks')
 )
+@FIGURE_CACHE.memoize
 def update_correlation_matrix(n_clicks):
     """Update cross-dataset correlation matrix."""
-    if INTEGRATED_DF is None:
+    if CUBE is None or CUBE.state_metrics is None:
         return go.Figure()
     
-    # Select key metrics for correlation
-    correlation_cols = [
-        'bio_transactions', 'bio_youth', 'bio_adult',
-        'demo_total', 'auth_success_rate', 'median_latency_ms',
-        'enrol_total', 'enrol_infant', 'enrol_youth', 'enrol_adult'
-    ]
-    
-    # State-level aggregation
-    state_metrics = INTEGRATED_DF.groupby('state')[correlation_cols].sum()
+    # State-level aggregation of the key metrics (pre-computed in the cube)
+    state_metrics = CUBE.state_metrics
     
     # Calculate correlation matrix
     corr_matrix = state_metrics.corr()
@@ -1409,7 +1560,8 @@ def update_correlation_matrix(n_clicks):
 
 if __name__ == '__main__':
     # Load data on startup (use sample_frac=0.1 for fast testing, None for full data)
-    load_data_on_startup(sample_frac=0.1)
+    create_app(sample_frac=0.1)
+    start_refresh_timer()
     
     # Run the app
     print("\n" + "=" * 80)
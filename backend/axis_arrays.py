@@ -0,0 +1,66 @@
+"""
+Axis Arrays for the Integrated Aadhar Dashboard
+Arrays indexed by sorted date and state axes, shared by the KPI engine and
+the distinct-count index: mapping column values to axis positions, and
+growing an array when new dates or states extend its axes.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def axis_codes(axis, values):
+    """
+    Positions of values on an axis, via categorical codes when possible.
+
+    Args:
+        axis: pd.Index of axis labels (strings)
+        values: Column of labels to look up
+
+    Returns:
+        np.ndarray of positions, -1 where a value is missing or off the axis
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        positions = axis.get_indexer(values.cat.categories.astype(str))
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes >= 0, positions[codes], -1)
+    return axis.get_indexer(pd.Index(values).astype(str))
+
+
+def grow_axis(axis, values):
+    """
+    Sorted union of an axis and new labels.
+
+    Index.union returns the other index unsorted when the axis is empty, so
+    the result is sorted explicitly.
+
+    Args:
+        axis: Sorted pd.Index (or pd.DatetimeIndex) axis
+        values: pd.Index of new labels
+
+    Returns:
+        pd.Index: The grown axis, sorted
+    """
+    return axis.union(values).sort_values()
+
+
+def expand(array, positions, shape, offset=0):
+    """
+    Copy an array into a larger zero array at the given axis positions.
+
+    Args:
+        array: Array to copy
+        positions: Per leading axis, the new position of each old entry
+        shape: Shape of the result
+        offset: Start of the copy along the first trailing axis
+
+    Returns:
+        np.ndarray of the given shape, zero outside the copied entries
+    """
+    out = np.zeros(shape, dtype=array.dtype)
+    if array.size:
+        index = np.ix_(*positions)
+        if array.ndim > len(positions):
+            index += (slice(offset, offset + array.shape[len(positions)]),)
+        out[index] = array
+    return out
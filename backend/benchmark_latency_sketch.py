@@ -0,0 +1,145 @@
+"""
+Benchmark: Latency Quantile Sketches
+Checks the documented accuracy of LatencySketchIndex against exact pandas
+quantiles over random filter selections (dates, states, districts,
+modalities), checks that sketches merge (per-date rebuilds spliced in give
+the same index as one build), and times per-state percentiles from merged
+sketches against grouped quantiles over the raw rows.
+
+Usage:
+    python backend/benchmark_latency_sketch.py [rows] [selections]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from latency_sketch import LATENCY_SKETCH_ALPHA, LatencySketchIndex
+
+
+QUANTILES = [0.0, 0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 0.999, 1.0]
+
+
+def make_frame(rows=2_000_000, seed=7):
+    """Synthetic demographic rows with heavy-tailed integer latencies."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-03-01', '2025-12-31', freq='D')
+    states = np.array([f"State {i:02d}" for i in range(36)])
+    districts = np.array([f"District {i:03d}" for i in range(120)])
+    modalities = np.array(['Fingerprint', 'Iris', 'Face', 'OTP'])
+
+    # Per-state scale so states differ, plus a tail spanning 1 ms to ~100 s
+    state_codes = rng.integers(0, len(states), rows)
+    scale = rng.uniform(4.5, 6.0, len(states))[state_codes]
+    latency = np.clip(rng.lognormal(scale, 0.9), 1, 100_000).astype(np.int64)
+
+    return pd.DataFrame({
+        'date': dates[rng.integers(0, len(dates), rows)],
+        'state': pd.Categorical(states[state_codes]),
+        'district': pd.Categorical(districts[rng.integers(0, len(districts), rows)]),
+        'auth_modality': modalities[rng.choice(4, rows, p=[0.6, 0.2, 0.05, 0.15])],
+        'response_time_ms': latency,
+    }).sort_values('date', kind='stable').reset_index(drop=True)
+
+
+def random_filters(rng, df):
+    """A random filter combination in LatencySketchIndex.select's terms."""
+    dates = np.sort(df['date'].unique())
+    filters = {}
+    if rng.random() < 0.7:
+        lo, hi = np.sort(rng.integers(0, len(dates), 2))
+        filters['start_date'], filters['end_date'] = dates[lo], dates[hi]
+    for col, name in (('state', 'states'), ('district', 'districts'),
+                      ('auth_modality', 'modalities')):
+        if rng.random() < 0.5:
+            values = np.asarray(df[col].unique())
+            filters[name] = list(rng.choice(values, rng.integers(1, 4), replace=False))
+    return filters
+
+
+def exact_rows(df, filters):
+    """Raw rows matching a filter combination."""
+    mask = np.ones(len(df), dtype=bool)
+    if 'start_date' in filters:
+        mask &= ((df['date'] >= filters['start_date']) &
+                 (df['date'] <= filters['end_date'])).to_numpy()
+    for col, name in (('state', 'states'), ('district', 'districts'),
+                      ('auth_modality', 'modalities')):
+        if name in filters:
+            mask &= df[col].isin(filters[name]).to_numpy()
+    return df.loc[mask, 'response_time_ms']
+
+
+def best_of(func, repeats=3):
+    """Best wall-clock time of several runs, and the last result."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    selections = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print("=" * 80)
+    print("LATENCY QUANTILE SKETCH BENCHMARK")
+    print("=" * 80)
+
+    df = make_frame(rows)
+    build_time, index = best_of(lambda: LatencySketchIndex.build(df), repeats=1)
+    print(f"Rows:            {len(df):>12,}")
+    print(f"Sketch rows:     {len(index.table):>12,} (cell, bucket) pairs")
+    print(f"Build:           {build_time:>12.2f}s")
+
+    # Accuracy: every quantile of every selection within alpha of exact
+    rng = np.random.default_rng(0)
+    worst = 0.0
+    checked = 0
+    for _ in range(selections):
+        filters = random_filters(rng, df)
+        exact = exact_rows(df, filters)
+        if exact.empty:
+            continue
+        estimate = index.quantiles(QUANTILES, **filters)
+        truth = exact.quantile(QUANTILES).to_numpy()
+        error = np.abs(estimate - truth) / truth
+        assert (error <= LATENCY_SKETCH_ALPHA + 1e-9).all(), (filters, estimate, truth)
+        worst = max(worst, error.max())
+        checked += 1
+    print(f"\n✓ {checked} selections x {len(QUANTILES)} quantiles within "
+          f"{LATENCY_SKETCH_ALPHA:.4%} relative error (worst {worst:.4%})")
+
+    # Mergeability: splicing per-date sketches rebuilt from those dates'
+    # rows reproduces the single build
+    dates = np.sort(df['date'].unique())[::7]
+    spliced = index.replace_dates(dates, LatencySketchIndex.build(df[df['date'].isin(dates)]))
+    pd.testing.assert_frame_equal(spliced.summary(), index.summary())
+    print("✓ Spliced per-date sketches match the full build")
+
+    # Speed: per-state percentiles for a date range
+    start_date, end_date = dates[5], dates[30]
+
+    def exact_summary():
+        rows = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+        return rows.groupby('state', observed=True)['response_time_ms'].quantile([0.5, 0.95, 0.99])
+
+    exact_time, _ = best_of(exact_summary)
+    sketch_time, _ = best_of(lambda: index.summary(start_date=start_date, end_date=end_date))
+    print(f"\nPer-state median/P95/P99 for {pd.Timestamp(start_date).date()} to "
+          f"{pd.Timestamp(end_date).date()}:")
+    print(f"  Exact (grouped quantile): {exact_time:8.3f}s")
+    print(f"  Merged sketches:          {sketch_time:8.3f}s")
+    print(f"  Speedup:                  {exact_time / sketch_time:8.1f}x")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
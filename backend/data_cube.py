@@ -0,0 +1,524 @@
+"""
+Pre-Aggregated Dashboard Cube for the Integrated Aadhar Dashboard
+Built once at startup from the pipeline frames so that dashboard callbacks
+answer from (date x state x district) cells and small rollups instead of
+scanning millions of raw rows.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from date_slices import rows_for_dates
+from latency_sketch import LatencySketchIndex
+
+
+# Metric summed per cell for each dataset (the metric every chart plots)
+CUBE_METRICS = {
+    'biometric': 'total_transactions',
+    'demographic': 'total_demographic',
+    'enrolment': 'total_enrolment',
+    'integrated': 'bio_transactions',
+}
+
+# Integrated metrics rolled up per state for the correlation matrix
+STATE_CORRELATION_COLUMNS = [
+    'bio_transactions', 'bio_youth', 'bio_adult',
+    'demo_total', 'auth_success_rate', 'median_latency_ms',
+    'enrol_total', 'enrol_infant', 'enrol_youth', 'enrol_adult'
+]
+
+# Default number of filter masks kept by the LRU shared between callbacks
+MASK_CACHE_SIZE = 256
+
+
+def _splice_dates(table, rows, dates, sort_by):
+    """
+    Replace the rows of a date-sorted table dated on the given dates with
+    freshly aggregated rows, keeping categorical columns categorical.
+    """
+    kept = table[~table['date'].isin(dates).to_numpy()]
+    combined = pd.concat([kept, rows], ignore_index=True)
+    for col in table.columns:
+        if isinstance(table[col].dtype, pd.CategoricalDtype) and \
+                not isinstance(combined[col].dtype, pd.CategoricalDtype):
+            combined[col] = pd.Categorical(pd.api.types.union_categoricals(
+                [kept[col], rows[col].astype('category')], sort_categories=True))
+    return combined.sort_values(sort_by, kind='stable').reset_index(drop=True)
+
+
+class DashboardCube:
+    """
+    Pre-aggregated cells and rollups behind the dashboard callbacks.
+
+    For every dataset the cube holds one row per observed
+    (date, state, district) cell with the summed metric and the zone, sorted
+    by date so date ranges resolve to contiguous row ranges. The demographic
+    dataset also gets rollups per (date, modality), (date, error code) and
+    mergeable latency sketches per (date, state, district, modality) cell
+    (see LatencySketchIndex).
+
+    Row selections are memoized in a bounded LRU keyed by the normalized
+    filter state, so sibling callbacks reacting to the same filter change
+    (and users picking the same filters) compute each mask only once.
+
+    The cells and rollups live in one snapshot that update() replaces in a
+    single assignment, so concurrent callbacks see either the old or the new
+    tables. Masks are keyed by the generation of the snapshot they were
+    computed from and never applied to another one.
+    """
+
+    def __init__(self, mask_cache_size=MASK_CACHE_SIZE):
+        self.mask_cache_size = mask_cache_size
+        self.mask_cache_hits = 0
+        self.mask_cache_misses = 0
+        self._mask_cache = OrderedDict()
+        self._mask_lock = threading.Lock()
+        self._data = self._snapshot()
+
+    @staticmethod
+    def _snapshot(cells=None, states=None, state_metrics=None, modality=None, errors=None,
+                  latency=None, generation=0):
+        """Cells and rollups of one data version."""
+        return {
+            'generation': generation,
+            'cells': cells or {},
+            'states': states or {},
+            'state_metrics': state_metrics,
+            'modality': modality,
+            'errors': errors,
+            'latency': latency,
+        }
+
+    @property
+    def cells(self):
+        """Cells per dataset (read-only)."""
+        return self._data['cells']
+
+    @property
+    def states(self):
+        """Sorted states per dataset."""
+        return self._data['states']
+
+    @property
+    def state_metrics(self):
+        """Integrated metrics summed per state (None without an integrated view)."""
+        return self._data['state_metrics']
+
+    @property
+    def modality(self):
+        """Volume and successes per (date, auth_modality)."""
+        return self._data['modality']
+
+    @property
+    def errors(self):
+        """Failure count per (date, error_code)."""
+        return self._data['errors']
+
+    @property
+    def latency(self):
+        """LatencySketchIndex of the demographic rows."""
+        return self._data['latency']
+
+    @classmethod
+    def build(cls, biometric_df=None, demographic_df=None, enrolment_df=None,
+              integrated_df=None, mask_cache_size=MASK_CACHE_SIZE, latency_sketches=None):
+        """
+        Aggregate the pipeline frames into a cube.
+
+        Args:
+            biometric_df: Biometric DataFrame from the pipeline
+            demographic_df: Demographic DataFrame from the pipeline
+            enrolment_df: Enrolment DataFrame from the pipeline
+            integrated_df: Integrated view from create_integrated_view()
+            mask_cache_size: Maximum number of memoized filter masks
+            latency_sketches: LatencySketchIndex of demographic_df already
+                              built by the pipeline (built here if None)
+
+        Returns:
+            DashboardCube
+        """
+        cube = cls(mask_cache_size=mask_cache_size)
+        frames = {
+            'biometric': biometric_df,
+            'demographic': demographic_df,
+            'enrolment': enrolment_df,
+            'integrated': integrated_df,
+        }
+
+        data = cls._snapshot()
+        for dataset, df in frames.items():
+            if df is None:
+                continue
+            data['cells'][dataset] = cls._aggregate_cells(dataset, df)
+            data['states'][dataset] = sorted(df['state'].unique())
+
+        if integrated_df is not None:
+            data['state_metrics'] = cls._state_metrics(integrated_df)
+
+        if demographic_df is not None:
+            data.update(cls._demographic_rollups(demographic_df, latency_sketches))
+
+        cube._data = data
+        return cube
+
+    @classmethod
+    def from_aggregates(cls, cells, integrated_df=None, modality=None, errors=None,
+                        latency=None, mask_cache_size=MASK_CACHE_SIZE):
+        """
+        Build a cube from pre-aggregated tables instead of raw rows (see
+        StreamingAggregator), giving the same cells and rollups as build().
+
+        Args:
+            cells: dict of dataset -> one row per (state, district, date) with
+                   the dataset metric and zone
+            integrated_df: Integrated view
+            modality: Volume and successes per (date, auth_modality)
+            errors: Failure count per (date, error_code)
+            latency: LatencySketchIndex of the demographic rows
+            mask_cache_size: Maximum number of memoized filter masks
+
+        Returns:
+            DashboardCube
+        """
+        cube = cls(mask_cache_size=mask_cache_size)
+        frames = dict(cells)
+        if integrated_df is not None:
+            frames['integrated'] = integrated_df
+
+        data = cls._snapshot(modality=modality, errors=errors, latency=latency)
+        for dataset, df in frames.items():
+            data['cells'][dataset] = cls._aggregate_cells(dataset, df)
+            data['states'][dataset] = sorted(df['state'].unique())
+
+        if integrated_df is not None:
+            data['state_metrics'] = cls._state_metrics(integrated_df)
+
+        cube._data = data
+        return cube
+
+    @staticmethod
+    def _aggregate_cells(dataset, df):
+        """Sum the dataset metric per (date, state, district) cell."""
+        return df.groupby(['date', 'state', 'district'], observed=True, sort=True).agg({
+            CUBE_METRICS[dataset]: 'sum',
+            'zone': 'first'
+        }).reset_index()
+
+    @staticmethod
+    def _state_metrics(integrated_df):
+        """Integrated correlation metrics summed per state."""
+        return integrated_df.groupby('state', observed=True)[STATE_CORRELATION_COLUMNS].sum()
+
+    @staticmethod
+    def _modality_rollup(df, is_success):
+        """Volume and successes per (date, auth modality)."""
+        return df.assign(is_success=is_success).groupby(
+            ['date', 'auth_modality'], observed=True
+        ).agg(volume=('is_success', 'size'), successes=('is_success', 'sum')).reset_index()
+
+    @staticmethod
+    def _error_rollup(df, is_success):
+        """Failure counts per (date, error code)."""
+        failures = df.loc[~is_success, ['date', 'error_code']]
+        return failures.groupby(['date', 'error_code']).size().rename('count').reset_index()
+
+    @classmethod
+    def _demographic_rollups(cls, df, latency_sketches=None):
+        """Aggregate auth modality, error code and latency rollups."""
+        is_success = (df['auth_status'] == 'Success')
+        return {
+            'modality': cls._modality_rollup(df, is_success),
+            'errors': cls._error_rollup(df, is_success),
+            'latency': latency_sketches or LatencySketchIndex.build(df),
+        }
+
+    def update(self, dates, biometric_df=None, demographic_df=None, enrolment_df=None,
+               integrated_df=None, latency_sketches=None):
+        """
+        Refresh the cells and rollups of the given dates after rows were
+        appended (see IntegratedAadharDataPipeline.refresh).
+
+        Only the rows dated on those dates are re-aggregated, found by binary
+        search over the date-sorted frames, and spliced in place of the
+        previous cells. The per-state integrated totals are re-summed from
+        the (already aggregated) integrated view. The new tables are built
+        aside and swapped in with one assignment; callbacks still holding
+        the previous tables keep using them consistently.
+
+        Args:
+            dates: Dates whose rows changed
+            biometric_df: Updated biometric frame (None leaves it as is)
+            demographic_df: Updated demographic frame
+            enrolment_df: Updated enrolment frame
+            integrated_df: Updated integrated view
+            latency_sketches: Updated LatencySketchIndex of demographic_df
+                              (spliced here for the dates if None)
+        """
+        dates = pd.DatetimeIndex(dates).unique().sort_values()
+        frames = {
+            'biometric': biometric_df,
+            'demographic': demographic_df,
+            'enrolment': enrolment_df,
+            'integrated': integrated_df,
+        }
+
+        old = self._data
+        data = self._snapshot(dict(old['cells']), dict(old['states']), old['state_metrics'],
+                              old['modality'], old['errors'], old['latency'],
+                              generation=old['generation'] + 1)
+        for dataset, df in frames.items():
+            if df is None:
+                continue
+            if dataset not in data['cells']:
+                data['cells'][dataset] = self._aggregate_cells(dataset, df)
+                data['states'][dataset] = sorted(df['state'].unique())
+                continue
+            rows = rows_for_dates(df, dates)
+            data['cells'][dataset] = _splice_dates(data['cells'][dataset],
+                                                   self._aggregate_cells(dataset, rows),
+                                                   dates, ['date', 'state', 'district'])
+            data['states'][dataset] = sorted(set(data['states'][dataset]) |
+                                             set(rows['state'].unique()))
+
+        if integrated_df is not None:
+            data['state_metrics'] = self._state_metrics(integrated_df)
+
+        if demographic_df is not None:
+            if data['modality'] is None:
+                data.update(self._demographic_rollups(demographic_df, latency_sketches))
+            else:
+                data.update(self._spliced_demographic_rollups(
+                    data, rows_for_dates(demographic_df, dates), dates, latency_sketches))
+
+        # Masks of the previous generation can no longer be looked up
+        self._data = data
+        self.clear_mask_cache()
+
+    @classmethod
+    def _spliced_demographic_rollups(cls, data, rows, dates, latency_sketches=None):
+        """Demographic rollups and sketches of a snapshot with the given dates re-aggregated."""
+        is_success = (rows['auth_status'] == 'Success')
+        return {
+            'modality': _splice_dates(data['modality'], cls._modality_rollup(rows, is_success),
+                                      dates, ['date', 'auth_modality']),
+            'errors': _splice_dates(data['errors'], cls._error_rollup(rows, is_success),
+                                    dates, ['date', 'error_code']),
+            'latency': latency_sketches or data['latency'].replace_dates(
+                dates, LatencySketchIndex.build(rows)),
+        }
+
+    @staticmethod
+    def _date_bounds(dates, start_date, end_date):
+        """
+        Positional bounds [lo, hi) of the rows dated within the range, found
+        by binary search over date-sorted values.
+        """
+        if start_date is None or end_date is None:
+            return 0, len(dates)
+        values = np.asarray(dates, dtype='datetime64[ns]')
+        lo = np.searchsorted(values, pd.Timestamp(start_date).to_datetime64(), side='left')
+        hi = np.searchsorted(values, pd.Timestamp(end_date).to_datetime64(), side='right')
+        return lo, max(lo, hi)
+
+    @staticmethod
+    def _filter_key(table, start_date, end_date, zones=None, states=None):
+        """
+        Normalize a filter combination into a hashable cache key.
+
+        Dates are only applied when both ends are given (as the callbacks
+        always did) and are compared as timestamps, so '2025-03-01' and
+        '2025-03-01T00:00:00' share an entry. Zone and state lists are
+        order-insensitive.
+        """
+        if start_date and end_date:
+            dates = (pd.Timestamp(start_date), pd.Timestamp(end_date))
+        else:
+            dates = (None, None)
+        return (table, *dates,
+                tuple(sorted(zones)) if zones else None,
+                tuple(sorted(states)) if states else None)
+
+    def _cached_mask(self, key, compute, generation):
+        """
+        Return the memoized mask for key, computing it on a miss. A mask of
+        a snapshot replaced while it was computed is returned but not kept.
+        """
+        key = (generation,) + key
+        with self._mask_lock:
+            mask = self._mask_cache.get(key)
+            if mask is not None:
+                self._mask_cache.move_to_end(key)
+                self.mask_cache_hits += 1
+                return mask
+
+        mask = compute()
+        # Shared between callbacks, so guard against in-place edits
+        mask.flags.writeable = False
+
+        with self._mask_lock:
+            self.mask_cache_misses += 1
+            if generation != self._data['generation']:
+                return mask
+            self._mask_cache[key] = mask
+            self._mask_cache.move_to_end(key)
+            while len(self._mask_cache) > self.mask_cache_size:
+                self._mask_cache.popitem(last=False)
+        return mask
+
+    def clear_mask_cache(self):
+        """Drop every memoized mask (e.g. after the cells are rebuilt)."""
+        with self._mask_lock:
+            self._mask_cache.clear()
+
+    def mask(self, dataset, start_date=None, end_date=None, zones=None, states=None):
+        """
+        Boolean row mask over the cells of a dataset for a filter combination.
+
+        Masks are memoized (see MASK_CACHE_SIZE) and returned read-only.
+
+        Args:
+            dataset: 'biometric', 'demographic', 'enrolment' or 'integrated'
+            start_date: Inclusive start date (None for no date filter)
+            end_date: Inclusive end date (None for no date filter)
+            zones: Optional list of zones to keep
+            states: Optional list of states to keep
+
+        Returns:
+            np.ndarray of bool, one entry per cell
+        """
+        return self._mask(self._data, dataset, start_date, end_date, zones, states)
+
+    def _mask(self, data, dataset, start_date=None, end_date=None, zones=None, states=None):
+        """Memoized row mask over the cells of one snapshot."""
+        key = self._filter_key(dataset, start_date, end_date, zones, states)
+        cells = data['cells'][dataset]
+
+        def compute():
+            _, start, end, zone_list, state_list = key
+            lo, hi = self._date_bounds(cells['date'], start, end)
+            mask = np.zeros(len(cells), dtype=bool)
+            mask[lo:hi] = True
+            if zone_list:
+                mask[lo:hi] &= cells['zone'].iloc[lo:hi].isin(zone_list).to_numpy()
+            if state_list:
+                mask[lo:hi] &= cells['state'].iloc[lo:hi].isin(state_list).to_numpy()
+            return mask
+
+        return self._cached_mask(key, compute, data['generation'])
+
+    def _rollup_bounds(self, dates, start_date, end_date):
+        """Date bounds over one of the date-sorted demographic rollups."""
+        _, start, end, _, _ = self._filter_key(None, start_date, end_date)
+        return self._date_bounds(dates, start, end)
+
+    def slice(self, dataset, start_date=None, end_date=None, zones=None, states=None):
+        """
+        Select the cells of a dataset for a filter combination.
+
+        The cells are shared by every callback and must be treated as
+        read-only. Cells are sorted by date, so a date-only filter returns a
+        contiguous positional slice (a view, found by binary search); zone
+        or state filters materialize only the selected rows. Derive grouping
+        keys as separate Series instead of assigning columns.
+
+        Args:
+            dataset: 'biometric', 'demographic', 'enrolment' or 'integrated'
+            start_date: Inclusive start date (None for no date filter)
+            end_date: Inclusive end date (None for no date filter)
+            zones: Optional list of zones to keep
+            states: Optional list of states to keep
+
+        Returns:
+            pd.DataFrame with date, state, district, metric and zone columns
+        """
+        data = self._data
+        cells = data['cells'][dataset]
+        if not zones and not states:
+            _, start, end, _, _ = self._filter_key(dataset, start_date, end_date)
+            lo, hi = self._date_bounds(cells['date'], start, end)
+            return cells.iloc[lo:hi]
+
+        mask = self._mask(data, dataset, start_date, end_date, zones, states)
+        if mask.all():
+            return cells
+        return cells[mask]
+
+    def daily(self, dataset, start_date=None, end_date=None, zones=None, states=None):
+        """
+        Metric of a dataset summed per date for a filter combination.
+
+        The selected cells are date-sorted, so each date is one contiguous
+        run and the sums are a single reduceat. Calendar groupings (day of
+        week, week, month) map this date-level aggregate through a
+        DateDimension rather than the cells.
+
+        Args:
+            dataset: 'biometric', 'demographic', 'enrolment' or 'integrated'
+            start_date: Inclusive start date (None for no date filter)
+            end_date: Inclusive end date (None for no date filter)
+            zones: Optional list of zones to keep
+            states: Optional list of states to keep
+
+        Returns:
+            pd.Series of the CUBE_METRICS column indexed by date (sorted)
+        """
+        cells = self.slice(dataset, start_date, end_date, zones, states)
+        metric = CUBE_METRICS[dataset]
+        dates = cells['date'].to_numpy(dtype='datetime64[ns]')
+        values = cells[metric].to_numpy()
+        dtype = np.int64 if values.dtype.kind in 'iub' else np.float64
+        if not len(dates):
+            return pd.Series([], index=pd.DatetimeIndex([], name='date'), dtype=dtype, name=metric)
+        starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+        return pd.Series(np.add.reduceat(values, starts, dtype=dtype),
+                         index=pd.DatetimeIndex(dates[starts], name='date'), name=metric)
+
+    def has(self, dataset):
+        """Check whether the cube holds cells for a dataset."""
+        return dataset in self.cells
+
+    def modality_summary(self, start_date=None, end_date=None):
+        """
+        Volume and success rate per auth modality.
+
+        Returns:
+            tuple: (volume Series sorted descending,
+                    success rate % Series indexed by modality)
+        """
+        modality = self.modality
+        lo, hi = self._rollup_bounds(modality['date'], start_date, end_date)
+        rows = modality.iloc[lo:hi]
+        totals = rows.groupby('auth_modality', observed=True)[['volume', 'successes']].sum()
+        volume = totals['volume'].sort_values(ascending=False, kind='stable')
+        success_rate = totals['successes'] / totals['volume'] * 100
+        return volume, success_rate
+
+    def error_counts(self, start_date=None, end_date=None):
+        """Failure counts per error code, sorted descending."""
+        errors = self.errors
+        lo, hi = self._rollup_bounds(errors['date'], start_date, end_date)
+        rows = errors.iloc[lo:hi]
+        return rows.groupby('error_code')['count'].sum().sort_values(ascending=False, kind='stable')
+
+    def latency_summary(self, start_date=None, end_date=None, states=None):
+        """
+        Latency statistics per state from the merged cell sketches.
+
+        Count and Mean are exact; Median, P95 and P99 are within 1% relative
+        error (see LATENCY_SKETCH_ALPHA).
+
+        Args:
+            start_date: Inclusive start date
+            end_date: Inclusive end date
+            states: Optional list of states to keep
+
+        Returns:
+            pd.DataFrame indexed by state with Count, Median, Mean, P95, P99
+        """
+        _, start, end, _, _ = self._filter_key(None, start_date, end_date)
+        summary = self.latency.summary(by='state', start_date=start, end_date=end, states=states)
+        summary.index.name = None
+        return summary
@@ -8,25 +8,469 @@ import pandas as pd
 import numpy as np
 import glob
 import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from pandas.api.types import union_categoricals
+from date_dimension import DateDimension
+from date_slices import date_positions, rows_for_dates
+from distinct_index import DistinctCountIndex
+from encoding import (AGE_GROUP_DTYPE, AUTH_MODALITY_DTYPE, AUTH_STATUS_DTYPE, GENDER_DTYPE,
+                      encode_zones, from_codes, share_codes)
+from kpi_engine import KPIEngine
+from latency_sketch import LatencySketchIndex
+from pipeline_cache import CACHE_MAX_DELTAS, PipelineCache, build_manifest, new_sources
+from shared_frames import SharedFrameStore, private_key
+from stream_aggregator import StreamingAggregator
 import warnings
 warnings.filterwarnings('ignore')
 
 
+# Bump whenever the read schemas or enrichment change, so cached frames built
+# by an older pipeline are rebuilt instead of reused.
+PIPELINE_SCHEMA_VERSION = 9
+
+DATASETS = ['biometric', 'demographic', 'enrolment']
+
+# Read schemas for the raw CSV shards. Low-cardinality strings (date, state,
+# district) are read as categoricals, pincode as int32 and the age counts as
+# unsigned integers (integers are parsed as int64 and range-checked first, see
+# _coerce_counts). Only the listed columns are read from each shard.
+DATASET_SCHEMAS = {
+    'biometric': {
+        'pattern': 'api_data_aadhar_biometric_*.csv',
+        'dtypes': {
+            'date': 'category',
+            'state': 'category',
+            'district': 'category',
+            'pincode': 'int32',
+            'bio_age_5_17': 'uint32',
+            'bio_age_17_': 'uint32',
+        },
+        'count_cols': ['bio_age_5_17', 'bio_age_17_'],
+        'date_formats': ('%d-%m-%Y',),
+    },
+    'demographic': {
+        'pattern': 'api_data_aadhar_demographic_*.csv',
+        'dtypes': {
+            'date': 'category',
+            'state': 'category',
+            'district': 'category',
+            'pincode': 'int32',
+            'demo_age_5_17': 'uint32',
+            'demo_age_17_': 'uint32',
+        },
+        'count_cols': ['demo_age_5_17', 'demo_age_17_'],
+        'date_formats': ('%d-%m-%Y',),
+    },
+    'enrolment': {
+        'pattern': 'api_data_aadhar_enrolment_*.csv',
+        'dtypes': {
+            'date': 'category',
+            'state': 'category',
+            'district': 'category',
+            'pincode': 'int32',
+            'age_0_5': 'uint32',
+            'age_5_17': 'uint32',
+            'age_18_greater': 'uint32',
+        },
+        'count_cols': ['age_0_5', 'age_5_17', 'age_18_greater'],
+        # Enrolment shards mix DD-MM-YYYY and YYYY-MM-DD dates
+        'date_formats': ('%d-%m-%Y', '%Y-%m-%d'),
+    },
+}
+
+# Raw rows held in memory at once by load_streaming()
+STREAM_CHUNKSIZE = 200_000
+
+# Row-local columns derived per shard, kept at the end of every dataset.
+# Calendar attributes are not stored per row (see date_dimension()).
+DERIVED_COLUMNS = ['zone']
+
+
+def _parse_categorical_dates(series, formats):
+    """
+    Parse a categorical date column by converting only its distinct values.
+    
+    Args:
+        series: Categorical Series of date strings
+        formats: Date formats to try in order; later formats fill values
+                 the earlier ones could not parse
+            
+    Returns:
+        pd.Series of datetime64 values (NaT where no format matched)
+    """
+    categories = pd.Series(series.cat.categories.astype(str))
+    parsed = pd.to_datetime(categories, format=formats[0], errors='coerce')
+    for fmt in formats[1:]:
+        parsed = parsed.fillna(pd.to_datetime(categories, format=fmt, errors='coerce'))
+    
+    codes = series.cat.codes.to_numpy()
+    values = parsed.to_numpy()[codes]
+    values[codes == -1] = np.datetime64('NaT')
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _downcast_counts(df, count_cols):
+    """Shrink unsigned count columns to uint16 when every value fits."""
+    for col in count_cols:
+        if len(df) == 0 or df[col].max() <= np.iinfo(np.uint16).max:
+            df[col] = df[col].astype('uint16')
+    return df
+
+
+def _concat_shards(dfs):
+    """
+    Concatenate typed shards, unioning categorical columns so they stay
+    categorical instead of falling back to object dtype. Columns with the
+    same fixed dtype in every shard (see encoding) concatenate as they are.
+    """
+    if len(dfs) == 1:
+        return dfs[0]
+    
+    categorical_cols = [col for col in dfs[0].columns
+                        if isinstance(dfs[0][col].dtype, pd.CategoricalDtype) and
+                        not all(df[col].dtype == dfs[0][col].dtype and
+                                df[col].cat.categories.equals(dfs[0][col].cat.categories)
+                                for df in dfs[1:])]
+    unioned = {col: union_categoricals([df[col].astype('category') for df in dfs],
+                                       sort_categories=True)
+               for col in categorical_cols}
+    
+    df = pd.concat([d.drop(columns=categorical_cols) for d in dfs], ignore_index=True)
+    for col in categorical_cols:
+        df[col] = pd.Categorical(unioned[col])
+    
+    # Restore the shard column order
+    return df[dfs[0].columns]
+
+
+def _read_csv_typed(file, dataset):
+    """
+    Read one CSV shard using the dataset schema.
+    
+    Only the schema columns are read, with explicit dtypes, and the date
+    column is parsed from its distinct values while reading. Integer
+    columns are parsed as int64 and narrowed by _coerce_counts, so negative
+    or out-of-range values become 0 instead of wrapping. Shards with
+    missing or malformed counts fall back to coercing those columns to 0.
+    
+    Args:
+        file: Path to the CSV shard
+        dataset: 'biometric', 'demographic' or 'enrolment'
+        
+    Returns:
+        tuple: (pd.DataFrame with typed columns, dict of read statistics)
+    """
+    schema = DATASET_SCHEMAS[dataset]
+    dtypes = schema['dtypes']
+    start = time.perf_counter()
+    
+    try:
+        df = pd.read_csv(file, usecols=list(dtypes), dtype=_wide_dtypes(dtypes))
+    except (ValueError, OverflowError):
+        string_dtypes = {col: dtype for col, dtype in dtypes.items()
+                         if dtype == 'category'}
+        df = pd.read_csv(file, usecols=list(dtypes), dtype=string_dtypes)
+    df = _coerce_counts(df, dtypes)
+    
+    df['date'] = _parse_categorical_dates(df['date'], schema['date_formats'])
+    
+    elapsed = time.perf_counter() - start
+    stats = {
+        'dataset': dataset,
+        'file': Path(file).name,
+        'rows': len(df),
+        'seconds': elapsed,
+        'bytes_per_row': df.memory_usage(deep=True).sum() / max(len(df), 1),
+    }
+    
+    return df, stats
+
+
+def _wide_dtypes(dtypes):
+    """Read dtypes with every integer column widened to int64 (see _coerce_counts)."""
+    return {col: dtype if dtype == 'category' else 'int64' for col, dtype in dtypes.items()}
+
+
+def _coerce_counts(df, dtypes):
+    """
+    Coerce the integer columns of a shard to their schema dtype.
+    
+    Missing, malformed, negative or out-of-range values become 0, rather
+    than wrapping around when cast to an unsigned dtype.
+    
+    Args:
+        df: Shard read with _wide_dtypes (or with the integers as strings)
+        dtypes: Schema dtypes of the shard
+        
+    Returns:
+        pd.DataFrame with the integer columns in their schema dtype
+    """
+    for col, dtype in dtypes.items():
+        if dtype != 'category':
+            info = np.iinfo(dtype)
+            values = pd.to_numeric(df[col], errors='coerce')
+            # NaN compares False, so missing values are replaced as well
+            valid = (values >= info.min) & (values <= info.max)
+            df[col] = values.where(valid, 0).astype(dtype)
+    return df
+
+
+def _read_csv_chunks(file, dataset, chunksize):
+    """
+    Read one CSV shard as typed chunks of at most chunksize rows.
+    
+    Chunks are typed like _read_csv_typed (negative or out-of-range counts
+    become 0); if a chunk has missing or malformed counts, the rest of the
+    shard is re-read from that chunk on with the counts coerced to 0.
+    
+    Args:
+        file: Path to the CSV shard
+        dataset: 'biometric', 'demographic' or 'enrolment'
+        chunksize: Rows per chunk
+        
+    Yields:
+        pd.DataFrame chunks in file order
+    """
+    schema = DATASET_SCHEMAS[dataset]
+    dtypes = schema['dtypes']
+    rows_read = 0
+    
+    try:
+        for df in pd.read_csv(file, usecols=list(dtypes), dtype=_wide_dtypes(dtypes),
+                              chunksize=chunksize):
+            df = _coerce_counts(df, dtypes)
+            df['date'] = _parse_categorical_dates(df['date'], schema['date_formats'])
+            rows_read += len(df)
+            yield df
+    except (ValueError, OverflowError):
+        string_dtypes = {col: dtype for col, dtype in dtypes.items()
+                         if dtype == 'category'}
+        for df in pd.read_csv(file, usecols=list(dtypes), dtype=string_dtypes,
+                              chunksize=chunksize, skiprows=range(1, rows_read + 1)):
+            df = _coerce_counts(df, dtypes)
+            df['date'] = _parse_categorical_dates(df['date'], schema['date_formats'])
+            yield df
+
+
+def _shard_seed(file):
+    """Stable random seed of a shard, derived from its file name."""
+    return zlib.crc32(Path(file).name.encode('utf-8'))
+
+
+def _enrichment_rngs(seed):
+    """
+    Independent random generators for the synthetic columns of a shard.
+    
+    Every column draws from its own stream, so enriching a shard chunk by
+    chunk with the same generators yields the same values as enriching it
+    whole.
+    
+    Args:
+        seed: Random seed of the shard (see _shard_seed)
+        
+    Returns:
+        dict: column -> np.random.Generator
+    """
+    columns = ['gender', 'auth_modality', 'auth_status', 'error_code', 'response_time_ms']
+    seeds = np.random.SeedSequence(seed).spawn(len(columns))
+    return {col: np.random.default_rng(s) for col, s in zip(columns, seeds)}
+
+
+def _enrich_demographic(df, rngs):
+    """
+    Add the synthetic auth metrics to demographic rows.
+    
+    Args:
+        df: Demographic shard (or the next chunk of one)
+        rngs: Generators from _enrichment_rngs, advanced by the draws
+        
+    Returns:
+        pd.DataFrame with gender, auth modality/status, error code, response
+        time and dominant age group columns
+    """
+    n = len(df)
+    
+    # Labels are drawn as codes of the shared categorical dtypes (the same
+    # draws as choosing the labels themselves)
+    
+    # Gender distribution (51% Male, 48% Female, 1% Other)
+    df['gender'] = from_codes(rngs['gender'].choice(3, size=n, p=[0.51, 0.48, 0.01]),
+                              GENDER_DTYPE)
+    
+    # Auth modality (60% Fingerprint, 20% Iris, 5% Face, 15% OTP)
+    df['auth_modality'] = from_codes(
+        rngs['auth_modality'].choice(4, size=n, p=[0.60, 0.20, 0.05, 0.15]), AUTH_MODALITY_DTYPE)
+    
+    # Auth status (88% Success, 12% Failure)
+    is_failure = rngs['auth_status'].choice(2, size=n, p=[0.88, 0.12])
+    df['auth_status'] = from_codes(is_failure, AUTH_STATUS_DTYPE)
+    
+    # Error codes for failures only
+    error_codes = rngs['error_code'].choice([300, 510, 998, 570], size=n,
+                                            p=[0.45, 0.25, 0.20, 0.10])
+    df['error_code'] = np.where(is_failure == 1, error_codes, np.nan)
+    
+    # Response time (log-normal distribution, median ~200ms)
+    df['response_time_ms'] = np.clip(
+        rngs['response_time_ms'].lognormal(mean=5.3, sigma=0.5, size=n).astype(int), 50, 5000)
+    
+    # Dominant age group
+    df['dominant_age_group'] = from_codes(
+        np.where(df['demo_age_5_17'] >= df['demo_age_17_'], 0, 1), AGE_GROUP_DTYPE)
+    return df
+
+
+def _prepare_shard(df, dataset, state_to_zone, seed=0, rngs=None):
+    """
+    Apply the row-local cleaning steps of a dataset to one shard.
+    
+    Synthetic demographic enrichment is seeded per shard, so a shard is
+    enriched identically whether it is loaded with the others, appended
+    later or streamed in chunks. Sampling is not done here: callers sample
+    each prepared shard on its own, seeded by its file name (see
+    _load_shard), so the rows kept do not depend on the other shards.
+    Never sample after concatenating shards.
+    
+    Args:
+        df: Typed shard from _read_csv_typed (or a chunk of one)
+        dataset: 'biometric', 'demographic' or 'enrolment'
+        state_to_zone: Mapping of state name to zone
+        seed: Random seed of the shard's synthetic enrichment
+        rngs: Generators continuing the shard's enrichment (for its later
+              chunks); created from seed if None
+        
+    Returns:
+        pd.DataFrame with derived totals and zone
+    """
+    # Derive totals (widened so the sum cannot overflow)
+    if dataset == 'biometric':
+        df['total_transactions'] = df['bio_age_5_17'].astype('uint32') + df['bio_age_17_']
+    elif dataset == 'demographic':
+        df['total_demographic'] = df['demo_age_5_17'].astype('uint32') + df['demo_age_17_']
+        df = _enrich_demographic(df, _enrichment_rngs(seed) if rngs is None else rngs)
+    else:
+        df['total_enrolment'] = (df['age_0_5'].astype('uint32') + df['age_5_17'] +
+                                 df['age_18_greater'])
+    
+    # Add zone information
+    df['zone'] = encode_zones(df['state'], state_to_zone)
+    
+    return df
+
+
+def _build_date_index(dates):
+    """
+    Build a date -> row-offset index over a date-sorted column.
+    
+    Args:
+        dates: Date-sorted datetime Series (NaT rows, if any, sorted last)
+        
+    Returns:
+        tuple: (np.ndarray of distinct dates, np.ndarray of the offset of
+                each date's first row, with the end offset appended)
+    """
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    valid = values[~np.isnat(values)]
+    distinct = np.unique(valid)
+    offsets = np.searchsorted(values[:len(valid)], distinct, side='left')
+    return distinct, np.append(offsets, len(valid))
+
+
+def _integrated_keys(df):
+    """(state, district, date) keys of rows, comparable across frames."""
+    return pd.MultiIndex.from_arrays([df['state'].astype(str).to_numpy(),
+                                      df['district'].astype(str).to_numpy(),
+                                      df['date'].to_numpy()],
+                                     names=['state', 'district', 'date'])
+
+
+def _merge_integrated(bio_agg, demo_agg, enrol_agg):
+    """
+    Join per-dataset state-district-date aggregates into integrated records.
+    
+    Args:
+        bio_agg: bio_transactions, bio_youth, bio_adult and zone per key
+        demo_agg: demo_total, demo_youth, demo_adult, auth_success_rate and
+                  median_latency_ms per key
+        enrol_agg: enrol_total, enrol_infant, enrol_youth and enrol_adult per key
+        
+    Returns:
+        pd.DataFrame with one row per (state, district, date), unsorted
+    """
+    # Merge all three datasets (on shared state/district codes)
+    bio_agg, demo_agg, enrol_agg = share_codes([bio_agg, demo_agg, enrol_agg])
+    integrated = bio_agg.merge(demo_agg, on=['state', 'district', 'date'], how='outer')
+    integrated = integrated.merge(enrol_agg, on=['state', 'district', 'date'], how='outer')
+    
+    # Fill NaN values with 0 for numeric columns
+    numeric_cols = integrated.select_dtypes(include=[np.number]).columns
+    integrated[numeric_cols] = integrated[numeric_cols].fillna(0)
+    
+    # Add combined metrics
+    integrated['total_activity'] = (integrated['bio_transactions'] + 
+                                   integrated['demo_total'] + 
+                                   integrated['enrol_total'])
+    
+    return integrated
+
+
+def _overwrite(series, positions, values):
+    """Copy of a column's values with some positions replaced; categoricals stay categorical."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        copy = series.to_numpy(copy=True)
+        copy[positions] = values.to_numpy().astype(copy.dtype)
+        return copy
+    categories = series.cat.categories.union(pd.Index(values.dropna().unique()).astype(str))
+    codes = series.cat.set_categories(categories).cat.codes.to_numpy(copy=True)
+    codes[positions] = categories.get_indexer(values.astype(object))
+    return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories,
+                                                                      series.cat.ordered))
+
+
+def _load_shard(file, dataset, state_to_zone, sample_frac=None):
+    """
+    Read and clean one shard. Module-level so process pools can pickle it.
+    
+    A sample is drawn from the shard alone, seeded by its file name, so the
+    rows kept do not depend on which other shards are loaded with it.
+    """
+    df, stats = _read_csv_typed(file, dataset)
+    seed = _shard_seed(file)
+    df = _prepare_shard(df, dataset, state_to_zone, seed)
+    if sample_frac and 0 < sample_frac < 1:
+        df = df.sample(frac=sample_frac, random_state=seed)
+    return df, stats
+
+
 class IntegratedAadharDataPipeline:
     """
     Unified data loader for all three Aadhar datasets with standardization,
     enrichment, and cross-dataset join capabilities.
     """
     
-    def __init__(self, base_path=None):
+    def __init__(self, base_path=None, max_workers=None, executor='thread',
+                 use_cache=True, cache_dir=None, cache_format='parquet'):
         """
         Initialize the pipeline with base path to data folders.
         
         Args:
             base_path: Base directory containing the three dataset folders
+            max_workers: Number of concurrent shard readers (default: CPU count,
+                         1 reads the shards serially)
+            executor: 'thread' or 'process' pool for concurrent shard reads
+            use_cache: Reuse enriched frames cached from a previous load of
+                       the same source files
+            cache_dir: Cache directory (default: <base_path>/parquet_cache/pipeline)
+            cache_format: 'parquet' or 'arrow' (Arrow IPC, read as views over a
+                          memory mapping)
         """
+        if executor not in ('thread', 'process'):
+            raise ValueError("executor must be 'thread' or 'process'")
+        
         if base_path is None:
             self.base_path = Path(__file__).parent.parent
         else:
@@ -59,54 +503,146 @@ class IntegratedAadharDataPipeline:
         self.enrolment_df = None
         self.integrated_df = None
         
-    def load_biometric_data(self, sample_frac=None):
+        # Per-frame (distinct dates, row offsets) over date-sorted rows
+        self.date_index = {}
+        # Calendar attributes of the loaded dates (see date_dimension)
+        self.dates = None
+        
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+        
+        # Per-file read statistics (dataset, file, rows, seconds, bytes/row)
+        self.read_stats = []
+        
+        # Content-addressed cache of the enriched frames
+        self.cache = None
+        self.cache_key = None
+        # Source shards (and sample fraction) the loaded frames were built
+        # from; refresh() ingests only shards missing from it
+        self.manifest = None
+        self.sample_frac = None
+        # Shared-memory store backing the frames after share_frames()
+        self.shared_store = None
+        # Aggregates of the last load_streaming() (the raw frames stay unloaded)
+        self.stream = None
+        # Demographic latency sketches (see latency_sketch_index)
+        self.latency_sketches = None
+        # Distinct states, districts and pincodes (see distinct_count_index)
+        self.distinct_counts = None
+        # Running KPI totals (see kpi_engine)
+        self.kpi_totals = None
+        if use_cache:
+            if cache_dir is None:
+                cache_dir = self.base_path / "parquet_cache" / "pipeline"
+            self.cache = PipelineCache(cache_dir, PIPELINE_SCHEMA_VERSION, cache_format)
+        
+    def _dataset_path(self, dataset):
+        """Return the folder holding the CSV shards for a dataset."""
+        return {
+            'biometric': self.biometric_path,
+            'demographic': self.demographic_path,
+            'enrolment': self.enrolment_path,
+        }[dataset]
+    
+    def _list_csv_files(self, dataset):
         """
-        Load biometric authentication data (~1.86M rows from 4 CSV files).
+        List the CSV shards for a dataset.
+        
+        Raises:
+            FileNotFoundError: If the dataset folder has no matching shards
+        """
+        folder = self._dataset_path(dataset)
+        csv_files = sorted(glob.glob(str(folder / DATASET_SCHEMAS[dataset]['pattern'])))
+        
+        if not csv_files:
+            raise FileNotFoundError(f"No {dataset} CSV files found in {folder}")
+        
+        return csv_files
+    
+    def _read_shards(self, datasets, files=None, sample_frac=None):
+        """
+        Read and clean every CSV shard of the given datasets concurrently.
+        
+        All shards are submitted to one pool, so loading several datasets
+        overlaps their I/O and parsing as well.
         
         Args:
-            sample_frac: Optional fraction to sample (0-1) for faster testing
+            datasets: Iterable of 'biometric', 'demographic', 'enrolment'
+            files: Optional dict of dataset -> shard paths to read instead
+                   of every shard in the dataset folder
+            sample_frac: Optional fraction sampled from every shard
             
         Returns:
-            pd.DataFrame with biometric data
+            dict: dataset -> list of cleaned shard DataFrames in file order
         """
-        print("Loading Biometric Data...")
+        if files is None:
+            files = {dataset: self._list_csv_files(dataset) for dataset in datasets}
+        jobs = [(dataset, file) for dataset in datasets for file in files[dataset]]
+        workers = min(self.max_workers, len(jobs))
         
-        csv_files = glob.glob(str(self.biometric_path / "api_data_aadhar_biometric_*.csv"))
+        if workers <= 1:
+            results = [_load_shard(file, dataset, self.state_to_zone, sample_frac)
+                       for dataset, file in jobs]
+        else:
+            pool_cls = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+            with pool_cls(max_workers=workers) as pool:
+                results = list(pool.map(_load_shard,
+                                        [file for _, file in jobs],
+                                        [dataset for dataset, _ in jobs],
+                                        [self.state_to_zone] * len(jobs),
+                                        [sample_frac] * len(jobs)))
         
-        if not csv_files:
-            raise FileNotFoundError(f"No biometric CSV files found in {self.biometric_path}")
-            
-        dfs = []
-        for file in csv_files:
-            print(f"  Reading: {Path(file).name}")
-            df = pd.read_csv(file)
-            dfs.append(df)
-            
-        df = pd.concat(dfs, ignore_index=True)
+        shards = {dataset: [] for dataset in datasets}
+        for (dataset, _), (df, stats) in zip(jobs, results):
+            shards[dataset].append(df)
+            self.read_stats.append(stats)
+            print(f"  Reading: {stats['file']} ({stats['rows']:,} rows, "
+                  f"{stats['seconds']:.2f}s, {stats['bytes_per_row']:.0f} B/row)")
         
-        # Standardize date format
-        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+        return shards
+    
+    def _combine_shards(self, dataset, shards, sample_frac=None):
+        """
+        Concatenate the cleaned shards of a dataset, reading them first if
+        they were not supplied.
         
-        # Clean numeric columns
-        df['bio_age_5_17'] = pd.to_numeric(df['bio_age_5_17'], errors='coerce').fillna(0)
-        df['bio_age_17_'] = pd.to_numeric(df['bio_age_17_'], errors='coerce').fillna(0)
+        Args:
+            dataset: 'biometric', 'demographic' or 'enrolment'
+            shards: Optional list of shard DataFrames from _read_shards
+            sample_frac: Optional fraction sampled from every shard read here
+            
+        Returns:
+            pd.DataFrame with typed columns
+        """
+        if shards is None:
+            # Loaded outside load_all, so the frames no longer match the
+            # cache key or the manifest (and have no data version)
+            self.cache_key = None
+            self.manifest = None
+            shards = self._read_shards([dataset], sample_frac=sample_frac)[dataset]
         
-        # Derive total transactions
-        df['total_transactions'] = df['bio_age_5_17'] + df['bio_age_17_']
+        df = _concat_shards(shards)
+        return _downcast_counts(df, DATASET_SCHEMAS[dataset]['count_cols'])
+    
+    def load_biometric_data(self, sample_frac=None, shards=None):
+        """
+        Load biometric authentication data (~1.86M rows from 4 CSV files).
         
-        # Add zone information
-        df['zone'] = df['state'].map(self.state_to_zone).fillna('Unknown')
+        Args:
+            sample_frac: Optional fraction to sample (0-1) from every shard
+                         read here, for faster testing
+            shards: Optional pre-read (and sampled) shards from _read_shards
+            
+        Returns:
+            pd.DataFrame with biometric data
+        """
+        print("Loading Biometric Data...")
         
-        # Add temporal features
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['day_of_week'] = df['date'].dt.day_name()
-        df['week_of_year'] = df['date'].dt.isocalendar().week
-        df['month_year'] = df['date'].dt.to_period('M').astype(str)
+        # Totals and zone are derived per shard
+        df = self._combine_shards('biometric', shards, sample_frac)
         
-        # Sample if requested
-        if sample_frac and 0 < sample_frac < 1:
-            df = df.sample(frac=sample_frac, random_state=42)
+        # Store date-sorted so date ranges are contiguous slices
+        df = self._sort_and_index('biometric', df)
             
         self.biometric_df = df
         print(f"✓ Loaded {len(df):,} biometric records")
@@ -115,83 +651,26 @@ class IntegratedAadharDataPipeline:
         
         return df
     
-    def load_demographic_data(self, sample_frac=None):
+    def load_demographic_data(self, sample_frac=None, shards=None):
         """
         Load demographic data with synthetic enrichment (~2.07M rows from 5 CSV files).
         
         Args:
-            sample_frac: Optional fraction to sample (0-1)
+            sample_frac: Optional fraction to sample (0-1) from every shard
+                         read here
+            shards: Optional pre-read (and sampled) shards from _read_shards
             
         Returns:
             pd.DataFrame with demographic data including synthetic auth metrics
         """
         print("\nLoading Demographic Data...")
         
-        csv_files = glob.glob(str(self.demographic_path / "api_data_aadhar_demographic_*.csv"))
-        
-        if not csv_files:
-            raise FileNotFoundError(f"No demographic CSV files found in {self.demographic_path}")
-            
-        dfs = []
-        for file in csv_files:
-            print(f"  Reading: {Path(file).name}")
-            df = pd.read_csv(file)
-            dfs.append(df)
-            
-        df = pd.concat(dfs, ignore_index=True)
-        
-        # Standardize date format
-        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-        
-        # Clean numeric columns
-        df['demo_age_5_17'] = pd.to_numeric(df['demo_age_5_17'], errors='coerce').fillna(0)
-        df['demo_age_17_'] = pd.to_numeric(df['demo_age_17_'], errors='coerce').fillna(0)
-        
-        # Derive total demographic count
-        df['total_demographic'] = df['demo_age_5_17'] + df['demo_age_17_']
-        
-        # Synthetic enrichment (vectorized for performance)
-        np.random.seed(42)
-        n = len(df)
-        
-        # Gender distribution (51% Male, 48% Female, 1% Other)
-        df['gender'] = np.random.choice(['Male', 'Female', 'Other'], 
-                                       size=n, p=[0.51, 0.48, 0.01])
+        # Totals, synthetic auth metrics (seeded per shard) and zone are
+        # derived per shard
+        df = self._combine_shards('demographic', shards, sample_frac)
         
-        # Auth modality (60% Fingerprint, 20% Iris, 5% Face, 15% OTP)
-        df['auth_modality'] = np.random.choice(['Fingerprint', 'Iris', 'Face', 'OTP'],
-                                               size=n, p=[0.60, 0.20, 0.05, 0.15])
-        
-        # Auth status (88% Success, 12% Failure)
-        df['auth_status'] = np.random.choice(['Success', 'Failure'],
-                                            size=n, p=[0.88, 0.12])
-        
-        # Error codes for failures only
-        error_codes = np.random.choice([300, 510, 998, 570], 
-                                      size=n, p=[0.45, 0.25, 0.20, 0.10])
-        df['error_code'] = np.where(df['auth_status'] == 'Failure', error_codes, np.nan)
-        
-        # Response time (log-normal distribution, median ~200ms)
-        df['response_time_ms'] = np.random.lognormal(mean=5.3, sigma=0.5, size=n).astype(int)
-        df['response_time_ms'] = np.clip(df['response_time_ms'], 50, 5000)
-        
-        # Dominant age group
-        df['dominant_age_group'] = np.where(df['demo_age_5_17'] >= df['demo_age_17_'],
-                                           '5-17', '18+')
-        
-        # Add zone information
-        df['zone'] = df['state'].map(self.state_to_zone).fillna('Unknown')
-        
-        # Add temporal features
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['day_of_week'] = df['date'].dt.day_name()
-        df['week_of_year'] = df['date'].dt.isocalendar().week
-        df['month_year'] = df['date'].dt.to_period('M').astype(str)
-        
-        # Sample if requested
-        if sample_frac and 0 < sample_frac < 1:
-            df = df.sample(frac=sample_frac, random_state=42)
+        # Store date-sorted so date ranges are contiguous slices
+        df = self._sort_and_index('demographic', df)
             
         self.demographic_df = df
         print(f"✓ Loaded {len(df):,} demographic records")
@@ -200,57 +679,25 @@ class IntegratedAadharDataPipeline:
         
         return df
     
-    def load_enrolment_data(self, sample_frac=None):
+    def load_enrolment_data(self, sample_frac=None, shards=None):
         """
         Load enrolment data (~1.01M rows from 3 CSV files).
         
         Args:
-            sample_frac: Optional fraction to sample (0-1)
+            sample_frac: Optional fraction to sample (0-1) from every shard
+                         read here
+            shards: Optional pre-read (and sampled) shards from _read_shards
             
         Returns:
             pd.DataFrame with enrolment data
         """
         print("\nLoading Enrolment Data...")
         
-        csv_files = glob.glob(str(self.enrolment_path / "api_data_aadhar_enrolment_*.csv"))
+        # Totals and zone are derived per shard
+        df = self._combine_shards('enrolment', shards, sample_frac)
         
-        if not csv_files:
-            raise FileNotFoundError(f"No enrolment CSV files found in {self.enrolment_path}")
-            
-        dfs = []
-        for file in csv_files:
-            print(f"  Reading: {Path(file).name}")
-            df = pd.read_csv(file)
-            dfs.append(df)
-            
-        df = pd.concat(dfs, ignore_index=True)
-        
-        # Standardize date format (handle both DD-MM-YYYY and YYYY-MM-DD)
-        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-        if df['date'].isna().sum() > len(df) * 0.5:
-            df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
-        
-        # Clean numeric columns
-        df['age_0_5'] = pd.to_numeric(df['age_0_5'], errors='coerce').fillna(0)
-        df['age_5_17'] = pd.to_numeric(df['age_5_17'], errors='coerce').fillna(0)
-        df['age_18_greater'] = pd.to_numeric(df['age_18_greater'], errors='coerce').fillna(0)
-        
-        # Derive total enrolment
-        df['total_enrolment'] = df['age_0_5'] + df['age_5_17'] + df['age_18_greater']
-        
-        # Add zone information
-        df['zone'] = df['state'].map(self.state_to_zone).fillna('Unknown')
-        
-        # Add temporal features
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['day_of_week'] = df['date'].dt.day_name()
-        df['week_of_year'] = df['date'].dt.isocalendar().week
-        df['month_year'] = df['date'].dt.to_period('M').astype(str)
-        
-        # Sample if requested
-        if sample_frac and 0 < sample_frac < 1:
-            df = df.sample(frac=sample_frac, random_state=42)
+        # Store date-sorted so date ranges are contiguous slices
+        df = self._sort_and_index('enrolment', df)
             
         self.enrolment_df = df
         print(f"✓ Loaded {len(df):,} enrolment records")
@@ -260,12 +707,86 @@ class IntegratedAadharDataPipeline:
         
         return df
     
-    def load_all(self, sample_frac=None):
+    def _frame(self, name):
+        """Return a loaded frame by name (None if not loaded)."""
+        return {
+            'biometric': self.biometric_df,
+            'demographic': self.demographic_df,
+            'enrolment': self.enrolment_df,
+            'integrated': self.integrated_df,
+        }[name]
+    
+    def _set_frame(self, name, df):
+        """Replace a loaded frame by name."""
+        setattr(self, f"{name}_df", df)
+    
+    def _share_codes(self):
+        """Put the state and district columns of the datasets on one global code table."""
+        frames = share_codes([self._frame(dataset) for dataset in DATASETS])
+        for dataset, df in zip(DATASETS, frames):
+            self._set_frame(dataset, df)
+    
+    def _sort_and_index(self, name, df):
+        """
+        Stable-sort a frame by date and record its date -> row-offset index.
+        
+        Args:
+            name: 'biometric', 'demographic', 'enrolment' or 'integrated'
+            df: Frame with a datetime 'date' column
+            
+        Returns:
+            pd.DataFrame sorted by date
+        """
+        df = df.sort_values('date', kind='stable', na_position='last')
+        self.date_index[name] = _build_date_index(df['date'])
+        return df
+    
+    def get_date_range(self, name, start_date=None, end_date=None):
+        """
+        Rows of a loaded frame whose date lies in [start_date, end_date].
+        
+        Uses a binary search over the distinct dates and returns a contiguous
+        positional slice of the date-sorted frame, so no per-row comparison
+        or copy is made. Treat the result as read-only.
+        
+        Args:
+            name: 'biometric', 'demographic', 'enrolment' or 'integrated'
+            start_date: Inclusive start date (None for the first date)
+            end_date: Inclusive end date (None for the last date)
+            
+        Returns:
+            pd.DataFrame slice of the stored frame
+        """
+        df = self._frame(name)
+        if df is None:
+            raise ValueError(f"{name} data is not loaded")
+        
+        distinct, offsets = self.date_index[name]
+        lo = 0 if start_date is None else np.searchsorted(
+            distinct, pd.Timestamp(start_date).to_datetime64(), side='left')
+        hi = len(distinct) if end_date is None else np.searchsorted(
+            distinct, pd.Timestamp(end_date).to_datetime64(), side='right')
+        if start_date is None and end_date is None:
+            return df
+        return df.iloc[offsets[lo]:offsets[max(hi, lo)]]
+    
+    def load_all(self, sample_frac=None, incremental=True):
         """
         Load all three datasets in parallel.
         
+        Every CSV shard of the three datasets is read, cleaned, enriched
+        and (with sample_frac) sampled on its own on one worker pool (see
+        max_workers/executor), then each dataset's shards are concatenated
+        in file order. When caching is enabled and the source
+        shards are unchanged since the last load, the enriched frames are
+        read straight from the cache instead; when shards were only added,
+        the previous entry is loaded and just the new shards are appended.
+        
         Args:
-            sample_frac: Optional fraction to sample for faster testing
+            sample_frac: Optional fraction sampled from every shard for
+                         faster testing
+            incremental: Append new shards to the previous cache entry
+                         instead of rebuilding every frame
             
         Returns:
             tuple: (biometric_df, demographic_df, enrolment_df)
@@ -274,10 +795,354 @@ class IntegratedAadharDataPipeline:
         print("INTEGRATED AADHAR DATA PIPELINE - LOADING ALL DATASETS")
         print("=" * 80)
         
-        self.load_biometric_data(sample_frac)
-        self.load_demographic_data(sample_frac)
-        self.load_enrolment_data(sample_frac)
+        self.stream = None
+        self.latency_sketches = None
+        self.distinct_counts = None
+        self.kpi_totals = None
+        manifest = self._build_manifest(sample_frac)
+        self.sample_frac = sample_frac
+        if self.cache is not None:
+            self.cache_key = PipelineCache.key_for(manifest)
+            
+            if self._load_from_cache() or (incremental and self._load_incrementally(manifest)):
+                self.manifest = manifest
+                self._print_load_summary()
+                return self.biometric_df, self.demographic_df, self.enrolment_df
+        
+        start = time.perf_counter()
+        shards = self._read_shards(DATASETS, sample_frac=sample_frac)
+        print(f"Read {sum(len(s) for s in shards.values())} CSV shards in "
+              f"{time.perf_counter() - start:.2f}s with {self.max_workers} "
+              f"{self.executor} worker(s)\n")
+        
+        self.load_biometric_data(shards=shards['biometric'])
+        self.load_demographic_data(shards=shards['demographic'])
+        self.load_enrolment_data(shards=shards['enrolment'])
+        self._share_codes()
+        
+        self.manifest = manifest
+        if self.cache is not None:
+            self._write_to_cache({
+                'biometric': self.biometric_df,
+                'demographic': self.demographic_df,
+                'enrolment': self.enrolment_df,
+            }, manifest)
         
+        self._print_load_summary()
+        
+        return self.biometric_df, self.demographic_df, self.enrolment_df
+    
+    def load_streaming(self, chunksize=STREAM_CHUNKSIZE, sample_frac=None):
+        """
+        Aggregate every CSV shard chunk by chunk, without the raw frames.
+        
+        Shards are read one at a time, chunksize rows at a time; each chunk
+        is cleaned and enriched like a whole shard (the enrichment streams
+        continue across a shard's chunks, so values match load_all) and
+        folded into a StreamingAggregator, then dropped. Peak memory is one
+        chunk of raw rows plus the aggregates, which grow with the number
+        of distinct cells (and the latency sketch buckets they occupy)
+        rather than with rows. The raw frames stay None,
+        the integrated view is built from the aggregates and stored as
+        usual, and the cache is bypassed.
+        
+        Args:
+            chunksize: Raw rows held in memory at once
+            sample_frac: Optional fraction sampled from every chunk (not the
+                         same sample as load_all draws)
+            
+        Returns:
+            StreamingAggregator: source of national_kpis(), build_cube()
+            and the per-cell aggregates
+        """
+        print("=" * 80)
+        print(f"INTEGRATED AADHAR DATA PIPELINE - STREAMING ALL DATASETS ({chunksize:,} rows/chunk)")
+        print("=" * 80)
+        
+        start = time.perf_counter()
+        self.biometric_df = self.demographic_df = self.enrolment_df = self.integrated_df = None
+        self.date_index = {}
+        self.cache_key = None
+        # Recorded for data_version(); refresh() still refuses streamed
+        # aggregates, which cannot be appended to
+        self.manifest = {**self._build_manifest(sample_frac), 'stream_chunksize': chunksize}
+        self.sample_frac = sample_frac
+        
+        stream = StreamingAggregator(compact_rows=chunksize)
+        for dataset in DATASETS:
+            for file in self._list_csv_files(dataset):
+                file_start = time.perf_counter()
+                seed = _shard_seed(file)
+                rngs = _enrichment_rngs(seed)
+                rows = 0
+                peak_bytes = 0
+                for chunk_no, chunk in enumerate(_read_csv_chunks(file, dataset, chunksize)):
+                    chunk = _prepare_shard(chunk, dataset, self.state_to_zone, rngs=rngs)
+                    if sample_frac and 0 < sample_frac < 1:
+                        chunk = chunk.sample(frac=sample_frac,
+                                             random_state=(seed + chunk_no) % 2**32)
+                    peak_bytes = max(peak_bytes, chunk.memory_usage(deep=True).sum())
+                    rows += len(chunk)
+                    stream.add(dataset, chunk)
+                    # Release the chunk before the next one is read
+                    del chunk
+                
+                stats = {
+                    'dataset': dataset,
+                    'file': Path(file).name,
+                    'rows': rows,
+                    'seconds': time.perf_counter() - file_start,
+                    'bytes_per_row': peak_bytes / max(min(rows, chunksize), 1),
+                }
+                self.read_stats.append(stats)
+                print(f"  Streaming: {stats['file']} ({rows:,} rows, {stats['seconds']:.2f}s, "
+                      f"peak chunk {peak_bytes / 2**20:.1f} MiB)")
+        
+        self.latency_sketches = stream.latency_sketches()
+        integrated = _merge_integrated(*stream.integrated_aggregates(self.latency_sketches))
+        self.integrated_df = self._sort_and_index('integrated', integrated)
+        self.stream = stream
+        self.distinct_counts = stream.distinct
+        self.kpi_totals = None
+        
+        print(f"✓ Streamed {sum(stream.row_counts.values()):,} rows into "
+              f"{len(self.integrated_df):,} state-district-date records in "
+              f"{time.perf_counter() - start:.2f}s")
+        return stream
+    
+    def _load_from_cache(self):
+        """
+        Load the three enriched datasets from the cache entry of the current
+        cache key.
+        
+        Returns:
+            bool: True on a cache hit, False if the frames must be rebuilt
+        """
+        if not self.cache.has(self.cache_key, DATASETS):
+            print(f"Cache miss ({self.cache_key})")
+            return False
+        
+        start = time.perf_counter()
+        try:
+            frames = {dataset: [self.cache.read(self.cache_key, dataset)] +
+                      self.cache.read_deltas(self.cache_key, dataset) for dataset in DATASETS}
+        except Exception as e:
+            print(f"Cache read failed ({e}) - rebuilding from CSV")
+            return False
+        
+        for dataset, parts in frames.items():
+            df = parts[0]
+            if len(parts) > 1:
+                # Appended shards: merge them into the date order of the base
+                df = _downcast_counts(_concat_shards(parts), DATASET_SCHEMAS[dataset]['count_cols'])
+                df = df.sort_values('date', kind='stable', na_position='last')
+            self._set_frame(dataset, df)
+            self.date_index[dataset] = _build_date_index(df['date'])
+        self._share_codes()
+        print(f"✓ Loaded enriched datasets from cache {self.cache.entry_path(self.cache_key)} "
+              f"in {time.perf_counter() - start:.2f}s")
+        return True
+    
+    def data_version(self):
+        """
+        Token of the loaded data, for keying results derived from it (e.g.
+        cached figures).
+        
+        It is the content key of the manifest the data was built from (the
+        source shards, sample fraction and, for streamed aggregates, chunk
+        size), so every process that loaded the same data gets the same
+        token, whether or not the pipeline cache is enabled.
+        
+        Returns:
+            str, or None if nothing was loaded with load_all() or
+            load_streaming()
+        """
+        return None if self.manifest is None else PipelineCache.key_for(self.manifest)
+    
+    def _build_manifest(self, sample_frac):
+        """Manifest of the CSV shards currently on disk."""
+        source_files = {dataset: self._list_csv_files(dataset) for dataset in DATASETS}
+        return build_manifest(source_files, self.base_path, PIPELINE_SCHEMA_VERSION, sample_frac)
+    
+    def _source_path(self, entry):
+        """Absolute path of a manifest source entry."""
+        return self.base_path / entry['path']
+    
+    def _load_incrementally(self, manifest):
+        """
+        Load the newest cache entry for the sample fraction and append the
+        shards added since it was built.
+        
+        Args:
+            manifest: Manifest of the shards on disk now
+            
+        Returns:
+            bool: True if the frames were loaded, False if they must be
+                  rebuilt (no previous entry, or a recorded shard changed)
+        """
+        key = self.cache_key
+        previous_key, previous = self.cache.latest(manifest['sample_frac'])
+        if previous is None:
+            return False
+        added = new_sources(previous['sources'], manifest['sources'])
+        if not added or not any(added.values()):
+            return False
+        
+        print(f"Found {sum(len(entries) for entries in added.values())} new CSV shard(s) "
+              f"since cache {previous_key}")
+        self.cache_key = previous_key
+        if not self._load_from_cache():
+            self.cache_key = key
+            return False
+        self.manifest = previous
+        
+        # Carry the integrated view over too, so only the new dates are re-aggregated
+        self.integrated_df = None
+        if self.cache.has(previous_key, ['integrated']):
+            try:
+                self.integrated_df = self.cache.read(previous_key, 'integrated')
+                self.date_index['integrated'] = _build_date_index(self.integrated_df['date'])
+            except Exception as e:
+                print(f"Cache read failed ({e}) - integrated view will be rebuilt")
+                self.integrated_df = None
+        
+        self._append_shards(added, manifest)
+        return True
+    
+    def refresh(self):
+        """
+        Ingest CSV shards added since the frames were loaded.
+        
+        Only the new shards are parsed and enriched; their rows are appended
+        to the loaded frames, the integrated view is re-aggregated for the
+        dates they touch, and they are appended to the cache entry as delta
+        files. Previously processed shards are recognised from the manifest
+        of the last load.
+        
+        Returns:
+            pd.DatetimeIndex: Dates whose rows changed (empty if no shard was added)
+            
+        Raises:
+            ValueError: If nothing is loaded yet, or a processed shard changed
+                        or was removed (reload everything with load_all())
+        """
+        if self.stream is not None:
+            raise ValueError("Streamed aggregates cannot be appended to; "
+                             "reload with load_streaming()")
+        if self.manifest is None:
+            raise ValueError("Load all datasets first using load_all()")
+        
+        manifest = self._build_manifest(self.sample_frac)
+        added = new_sources(self.manifest['sources'], manifest['sources'])
+        if added is None:
+            raise ValueError("Previously loaded CSV shards changed or were removed; "
+                             "reload with load_all()")
+        if not any(added.values()):
+            print("✓ No new CSV shards")
+            return pd.DatetimeIndex([])
+        
+        return self._append_shards(added, manifest)
+    
+    def _append_shards(self, added, manifest):
+        """
+        Read, enrich and append new shards to the loaded frames.
+        
+        Parsing and enrichment cost is proportional to the new shards; the
+        frames are re-concatenated and merged into date order (two sorted
+        runs) in memory.
+        
+        Args:
+            added: dict of dataset -> new source entries (see new_sources)
+            manifest: Manifest including the new shards
+            
+        Returns:
+            pd.DatetimeIndex: Dates of the appended rows
+        """
+        start = time.perf_counter()
+        files = {dataset: [self._source_path(entry) for entry in entries]
+                 for dataset, entries in added.items() if entries}
+        shards = self._read_shards(list(files), files=files, sample_frac=self.sample_frac)
+        
+        deltas = {}
+        dates = []
+        for dataset, dfs in shards.items():
+            count_cols = DATASET_SCHEMAS[dataset]['count_cols']
+            delta = _downcast_counts(_concat_shards(dfs), count_cols)
+            combined = _downcast_counts(_concat_shards([self._frame(dataset), delta]), count_cols)
+            self._set_frame(dataset, self._sort_and_index(dataset, combined))
+            deltas[dataset] = delta
+            dates.append(delta['date'].dropna().unique())
+        dates = pd.DatetimeIndex(np.unique(np.concatenate(dates)))
+        self._share_codes()
+        
+        previous_key = self.cache_key
+        self.manifest = manifest
+        if self.cache is not None:
+            self.cache_key = PipelineCache.key_for(manifest)
+        
+        if self.integrated_df is not None:
+            self.update_integrated_view(deltas.get('biometric'), deltas.get('demographic'),
+                                        deltas.get('enrolment'))
+        if self.latency_sketches is not None and 'demographic' in deltas:
+            demo_dates = np.unique(deltas['demographic']['date'].dropna().to_numpy())
+            self.latency_sketches = self.latency_sketches.replace_dates(
+                demo_dates, LatencySketchIndex.build(self._rows_for_dates('demographic', demo_dates)))
+        for dataset, delta in deltas.items():
+            if self.distinct_counts is not None:
+                self.distinct_counts.add(dataset, delta)
+            if self.kpi_totals is not None:
+                self.kpi_totals.add(dataset, delta)
+        if self.cache is not None:
+            self._append_to_cache(previous_key, deltas)
+        
+        print(f"✓ Appended {sum(len(df) for df in deltas.values()):,} rows from "
+              f"{sum(len(f) for f in files.values())} new shard(s) touching {len(dates)} date(s) "
+              f"in {time.perf_counter() - start:.2f}s")
+        return dates
+    
+    def _append_to_cache(self, previous_key, deltas):
+        """
+        Store appended rows as delta files of a new cache entry (rewriting
+        the frames once too many deltas accumulate); failures only warn.
+        
+        Every process refreshing on the same shards reaches the same key, so
+        the entry is checked and written under the cache lock: the first
+        process writes it and the others leave it as it is.
+        """
+        entry = self.cache.entry_path(self.cache_key)
+        try:
+            with self.cache.lock():
+                if self.cache.has(self.cache_key, DATASETS):
+                    print(f"✓ Cache {entry} already written by another process")
+                elif (previous_key is not None and self.cache.has(previous_key, DATASETS) and
+                        all(self.cache.delta_count(previous_key, dataset) < CACHE_MAX_DELTAS
+                            for dataset in deltas)):
+                    self.cache.append(previous_key, self.cache_key, DATASETS, deltas, self.manifest)
+                    print(f"✓ Appended {', '.join(deltas)} to cache {entry}")
+                else:
+                    self.cache.write(self.cache_key, {dataset: self._frame(dataset)
+                                                      for dataset in DATASETS}, self.manifest)
+                    print(f"✓ Cached {', '.join(DATASETS)} in {entry}")
+                if self.integrated_df is not None and not self.cache.has(self.cache_key,
+                                                                         ['integrated']):
+                    self.cache.write(self.cache_key, {'integrated': self.integrated_df})
+        except Exception as e:
+            print(f"Warning: could not write pipeline cache ({e})")
+    
+    def _rows_for_dates(self, name, dates):
+        """Rows of a loaded frame dated on any of the given dates."""
+        return rows_for_dates(self._frame(name), dates)
+    
+    def _write_to_cache(self, frames, manifest=None):
+        """Store frames under the current cache key; failures only warn."""
+        try:
+            self.cache.write(self.cache_key, frames, manifest)
+            print(f"✓ Cached {', '.join(frames)} in {self.cache.entry_path(self.cache_key)}")
+        except Exception as e:
+            print(f"Warning: could not write pipeline cache ({e})")
+    
+    def _print_load_summary(self):
+        """Print record counts for the loaded datasets."""
         print("\n" + "=" * 80)
         print("DATA LOADING SUMMARY")
         print("=" * 80)
@@ -287,8 +1152,6 @@ class IntegratedAadharDataPipeline:
         print(f"{'─' * 40}")
         print(f"TOTAL:               {len(self.biometric_df) + len(self.demographic_df) + len(self.enrolment_df):>12,}")
         print("=" * 80)
-        
-        return self.biometric_df, self.demographic_df, self.enrolment_df
     
     def create_integrated_view(self):
         """
@@ -303,8 +1166,49 @@ class IntegratedAadharDataPipeline:
         if self.biometric_df is None or self.demographic_df is None or self.enrolment_df is None:
             raise ValueError("Load all datasets first using load_all()")
         
+        if self.cache is not None and self.cache_key is not None:
+            if self.cache.has(self.cache_key, ['integrated']):
+                try:
+                    self.integrated_df = self.cache.read(self.cache_key, 'integrated')
+                    self.date_index['integrated'] = _build_date_index(self.integrated_df['date'])
+                    print(f"✓ Loaded integrated view from cache "
+                          f"({len(self.integrated_df):,} state-district-date records)")
+                    return self.integrated_df
+                except Exception as e:
+                    print(f"Cache read failed ({e}) - rebuilding integrated view")
+        
+        integrated = self._aggregate_integrated(self.biometric_df, self.demographic_df,
+                                                self.enrolment_df, self.latency_sketch_index())
+        
+        integrated = self._sort_and_index('integrated', integrated)
+        self.integrated_df = integrated
+        if self.cache is not None and self.cache_key is not None:
+            self._write_to_cache({'integrated': integrated})
+        
+        print(f"✓ Created integrated view with {len(integrated):,} state-district-date records")
+        print(f"  Unique states: {integrated['state'].nunique()}")
+        print(f"  Unique districts: {integrated['district'].nunique()}")
+        print(f"  Date range: {integrated['date'].min()} to {integrated['date'].max()}")
+        
+        return integrated
+    
+    def _aggregate_integrated(self, biometric_df, demographic_df, enrolment_df,
+                              latency_sketches=None):
+        """
+        Aggregate raw rows into integrated state-district-date records.
+        
+        Args:
+            biometric_df: Biometric rows
+            demographic_df: Demographic rows
+            enrolment_df: Enrolment rows
+            latency_sketches: LatencySketchIndex of at least the demographic
+                              rows' records (sketched from them if None)
+            
+        Returns:
+            pd.DataFrame with one row per (state, district, date), unsorted
+        """
         # Aggregate biometric by state-date
-        bio_agg = self.biometric_df.groupby(['state', 'district', 'date']).agg({
+        bio_agg = biometric_df.groupby(['state', 'district', 'date'], observed=True).agg({
             'total_transactions': 'sum',
             'bio_age_5_17': 'sum',
             'bio_age_17_': 'sum',
@@ -313,20 +1217,33 @@ class IntegratedAadharDataPipeline:
         bio_agg.columns = ['state', 'district', 'date', 
                            'bio_transactions', 'bio_youth', 'bio_adult', 'zone']
         
-        # Aggregate demographic by state-date
-        demo_agg = self.demographic_df.groupby(['state', 'district', 'date']).agg({
+        # Aggregate demographic by state-date. The success rate is the mean
+        # of a precomputed boolean, so no Python callable runs per group.
+        is_success = (demographic_df['auth_status'] == 'Success').to_numpy()
+        demo_cols = ['state', 'district', 'date', 'total_demographic', 'demo_age_5_17',
+                     'demo_age_17_']
+        demo_agg = demographic_df[demo_cols].assign(is_success=is_success).groupby(
+            ['state', 'district', 'date'], observed=True
+        ).agg({
             'total_demographic': 'sum',
             'demo_age_5_17': 'sum',
             'demo_age_17_': 'sum',
-            'auth_status': lambda x: (x == 'Success').sum() / len(x) * 100,  # Success rate
-            'response_time_ms': 'median'
+            'is_success': 'mean'
         }).reset_index()
         demo_agg.columns = ['state', 'district', 'date',
                            'demo_total', 'demo_youth', 'demo_adult', 
-                           'auth_success_rate', 'median_latency_ms']
+                           'auth_success_rate']
+        demo_agg['auth_success_rate'] *= 100
+        
+        # Median latency from the merged cell sketches (within 1%), which a
+        # streamed load computes the same way
+        sketches = latency_sketches or LatencySketchIndex.build(demographic_df)
+        medians = sketches.medians(['state', 'district', 'date'])
+        demo_agg['median_latency_ms'] = medians.reindex(
+            pd.MultiIndex.from_frame(demo_agg[['state', 'district', 'date']])).to_numpy()
         
         # Aggregate enrolment by state-date
-        enrol_agg = self.enrolment_df.groupby(['state', 'district', 'date']).agg({
+        enrol_agg = enrolment_df.groupby(['state', 'district', 'date'], observed=True).agg({
             'total_enrolment': 'sum',
             'age_0_5': 'sum',
             'age_5_17': 'sum',
@@ -335,59 +1252,112 @@ class IntegratedAadharDataPipeline:
         enrol_agg.columns = ['state', 'district', 'date',
                             'enrol_total', 'enrol_infant', 'enrol_youth', 'enrol_adult']
         
-        # Merge all three datasets
-        integrated = bio_agg.merge(demo_agg, on=['state', 'district', 'date'], how='outer')
-        integrated = integrated.merge(enrol_agg, on=['state', 'district', 'date'], how='outer')
+        return _merge_integrated(bio_agg, demo_agg, enrol_agg)
+    
+    def update_integrated_view(self, biometric_rows=None, demographic_rows=None,
+                               enrolment_rows=None):
+        """
+        Upsert the integrated records touched by a batch of new rows.
         
-        # Fill NaN values with 0 for numeric columns
-        numeric_cols = integrated.select_dtypes(include=[np.number]).columns
-        integrated[numeric_cols] = integrated[numeric_cols].fillna(0)
+        The batch rows must already be part of the loaded frames. Only the
+        (state, district, date) keys they touch are re-aggregated, from the
+        raw rows of those keys (gathered through the date index), and the
+        results overwrite the matching records or are inserted as new ones;
+        total_activity is computed for those records only. The view is
+        replaced rather than modified in place, so readers holding the
+        previous view are unaffected.
         
-        # Add combined metrics
-        integrated['total_activity'] = (integrated['bio_transactions'] + 
-                                       integrated['demo_total'] + 
-                                       integrated['enrol_total'])
+        Args:
+            biometric_rows: New biometric rows
+            demographic_rows: New demographic rows
+            enrolment_rows: New enrolment rows
+            
+        Returns:
+            pd.DataFrame: Updated integrated view
+        """
+        if self.integrated_df is None:
+            raise ValueError("Create the integrated view first using create_integrated_view()")
         
-        # Add temporal features
-        integrated['year'] = integrated['date'].dt.year
-        integrated['month'] = integrated['date'].dt.month
-        integrated['month_year'] = integrated['date'].dt.to_period('M').astype(str)
+        batches = {'biometric': biometric_rows, 'demographic': demographic_rows,
+                   'enrolment': enrolment_rows}
+        touched = [_integrated_keys(rows) for rows in batches.values()
+                   if rows is not None and len(rows)]
+        if not touched:
+            return self.integrated_df
+        touched = touched[0].append(touched[1:]).unique()
+        dates = touched.get_level_values('date').unique().sort_values()
         
-        self.integrated_df = integrated
-        print(f"✓ Created integrated view with {len(integrated):,} state-district-date records")
-        print(f"  Unique states: {integrated['state'].nunique()}")
-        print(f"  Unique districts: {integrated['district'].nunique()}")
-        print(f"  Date range: {integrated['date'].min()} to {integrated['date'].max()}")
+        # Raw rows of the touched keys, from the touched dates' slices
+        key_rows = []
+        for dataset in DATASETS:
+            rows = self._rows_for_dates(dataset, dates)
+            key_rows.append(rows[_integrated_keys(rows).isin(touched)])
+        records = self._aggregate_integrated(*key_rows)
         
-        return integrated
+        # Locate the existing records of those keys within the same dates
+        integrated = self.integrated_df
+        candidates = date_positions(integrated['date'], dates)
+        found = _integrated_keys(integrated.iloc[candidates]).get_indexer(_integrated_keys(records))
+        existing = found >= 0
+        positions = candidates[found[existing]]
+        
+        # Overwrite the existing records column by column (on copies)
+        columns = {}
+        value_cols = [col for col in integrated.columns if col not in ('state', 'district', 'date')]
+        for col in integrated.columns:
+            if col in value_cols and existing.any():
+                columns[col] = _overwrite(integrated[col], positions, records[col][existing])
+            else:
+                columns[col] = integrated[col]
+        updated = pd.DataFrame(columns, index=integrated.index)
+        
+        inserted = records.loc[~existing, integrated.columns]
+        if len(inserted):
+            updated = _concat_shards([updated, inserted])
+            updated = self._sort_and_index('integrated', updated)
+        self.integrated_df = updated
+        
+        print(f"✓ Integrated view: updated {existing.sum():,} and inserted {len(inserted):,} "
+              f"state-district-date records")
+        return updated
     
     def get_national_kpis(self):
         """
         Calculate top-level national KPIs for executive dashboard.
         
+        After load_streaming() the KPIs come from the streamed aggregates.
+        
         Returns:
             dict: National-level metrics
         """
+        if self.stream is not None:
+            return self.stream.national_kpis(self.latency_sketches)
+        
         kpis = {}
         
         if self.biometric_df is not None:
             kpis['total_biometric_transactions'] = self.biometric_df['total_transactions'].sum()
-            kpis['active_states_biometric'] = self.biometric_df['state'].nunique()
-            kpis['active_districts_biometric'] = self.biometric_df['district'].nunique()
+            # Bitset popcounts instead of nunique() over the rows
+            distinct = self.distinct_count_index()
+            kpis['active_states_biometric'] = distinct.count('biometric', 'state')
+            kpis['active_districts_biometric'] = distinct.count('biometric', 'district')
             
         if self.demographic_df is not None:
             kpis['total_demographic_records'] = len(self.demographic_df)
             kpis['national_auth_success_rate'] = (
                 (self.demographic_df['auth_status'] == 'Success').sum() / len(self.demographic_df) * 100
             )
-            kpis['median_latency_ms'] = self.demographic_df['response_time_ms'].median()
-            kpis['p95_latency_ms'] = self.demographic_df['response_time_ms'].quantile(0.95)
-            kpis['p99_latency_ms'] = self.demographic_df['response_time_ms'].quantile(0.99)
+            # Within 1% of the exact quantiles (see latency_sketch), no sort
+            median, p95, p99 = self.latency_sketch_index().quantiles([0.5, 0.95, 0.99])
+            kpis['median_latency_ms'] = median
+            kpis['p95_latency_ms'] = p95
+            kpis['p99_latency_ms'] = p99
             
         if self.enrolment_df is not None:
             kpis['total_enrolments'] = self.enrolment_df['total_enrolment'].sum()
             kpis['infant_enrolments'] = self.enrolment_df['age_0_5'].sum()
-            kpis['active_states_enrolment'] = self.enrolment_df['state'].nunique()
+            kpis['active_states_enrolment'] = self.distinct_count_index().count(
+                'enrolment', 'state')
             
         # Combined metrics
         kpis['total_data_points'] = sum([
@@ -397,7 +1367,166 @@ class IntegratedAadharDataPipeline:
         ])
         
         return kpis
+
+    def latency_sketch_index(self):
+        """
+        Mergeable latency sketches of the demographic rows, one per
+        (date, state, district, auth modality) cell.
+        
+        Built on first use and spliced by refresh() for the dates it
+        touches, so percentiles for any filter merge cell sketches instead
+        of sorting the raw latencies.
+        
+        Returns:
+            LatencySketchIndex
+        """
+        if self.latency_sketches is None:
+            if self.demographic_df is None:
+                raise ValueError("Load all datasets first using load_all()")
+            self.latency_sketches = LatencySketchIndex.build(self.demographic_df)
+        return self.latency_sketches
+    
+    def date_dimension(self):
+        """
+        Calendar attributes (year, month, day of week, ISO week, month label
+        and week/month starts) of the distinct dates of the loaded frames.
+        
+        The frames store only the date; attributes are computed once per
+        distinct date and gathered for rows on demand (see calendar()). The
+        dimension is rebuilt only when refresh() brings new dates.
+        
+        Returns:
+            DateDimension
+        """
+        if not self.date_index:
+            raise ValueError("Load all datasets first using load_all()")
+        dates = np.unique(np.concatenate([distinct for distinct, _ in self.date_index.values()]))
+        if self.dates is None or not np.array_equal(self.dates.dates.to_numpy(), dates):
+            self.dates = DateDimension(dates)
+        return self.dates
+    
+    def calendar(self, name, columns=None, start_date=None, end_date=None):
+        """
+        Calendar attributes of the rows of a loaded frame, gathered from the
+        date dimension by date code.
+        
+        Args:
+            name: 'biometric', 'demographic', 'enrolment' or 'integrated'
+            columns: Attributes to return (default CALENDAR_COLUMNS)
+            start_date: Inclusive start date (None for the first date)
+            end_date: Inclusive end date (None for the last date)
+            
+        Returns:
+            pd.DataFrame aligned with get_date_range(name, start_date, end_date)
+        """
+        rows = self.get_date_range(name, start_date, end_date)
+        return self.date_dimension().attributes(rows['date'], columns)
+    
+    def kpi_engine(self):
+        """
+        Running KPI totals per (date, state) for filtered KPI cards.
+        
+        Built on first use (from the streamed aggregates after
+        load_streaming()) and updated by refresh() with the appended rows
+        only, so KPIs for any date range, zone and state selection never
+        rescan the frames.
+        
+        Returns:
+            KPIEngine
+        """
+        if self.kpi_totals is None:
+            if self.stream is not None:
+                self.kpi_totals = KPIEngine.from_cells(
+                    self.state_to_zone, self.distinct_count_index(),
+                    {dataset: self.stream.cells(dataset) for dataset in DATASETS},
+                    self.latency_sketches.table)
+            else:
+                self.kpi_totals = KPIEngine.from_frames(
+                    self.state_to_zone, self.distinct_count_index(), self.biometric_df,
+                    self.demographic_df, self.enrolment_df)
+        return self.kpi_totals
     
+    def distinct_count_index(self):
+        """
+        Distinct states, districts and pincodes per dataset, as bitsets over
+        the state and district codes and pincode HyperLogLog sketches.
+        
+        Built on first use (during ingestion by load_streaming()) and
+        updated by refresh() with the appended rows, so distinct counts for
+        any date range and states never run nunique() over the rows.
+        
+        Returns:
+            DistinctCountIndex
+        """
+        if self.distinct_counts is None:
+            frames = {'biometric': self.biometric_df, 'demographic': self.demographic_df,
+                      'enrolment': self.enrolment_df}
+            if all(df is None for df in frames.values()):
+                raise ValueError("Load all datasets first using load_all()")
+            self.distinct_counts = DistinctCountIndex.build(frames)
+        return self.distinct_counts
+    
+    def share_frames(self, shared_root=None, deployment=None):
+        """
+        Move the loaded frames into the shared-memory data plane.
+
+        Each frame is published once per data version (see data_version(),
+        whether or not the pipeline cache is enabled) as an Arrow file (in
+        /dev/shm by default) and replaced by zero-copy, read-only views over
+        the mapping. Processes loading the same data version attach to the
+        files already published instead of writing their own, so memory
+        stays roughly flat as the number of workers grows. String columns
+        come back as categoricals over shared codes.
+
+        Entries are kept under a sub-root of the deployment, which defaults
+        to one per data directory, so superseded versions are pruned without
+        touching other deployments sharing the root.
+
+        Args:
+            shared_root: Directory for the shared files (default: /dev/shm/aadhar_frames)
+            deployment: Sub-root name (default: derived from base_path)
+
+        Returns:
+            tuple: (biometric_df, demographic_df, enrolment_df, integrated_df)
+        """
+        frames = {
+            'biometric': self.biometric_df,
+            'demographic': self.demographic_df,
+            'enrolment': self.enrolment_df,
+            'integrated': self.integrated_df,
+        }
+        frames = {name: df for name, df in frames.items() if df is not None}
+
+        # Keyed on the data version, which every worker that loaded the same
+        # shards shares; frames not built by load_all()/load_streaming() have
+        # none and stay private to this process
+        key = self.data_version() or private_key()
+        if deployment is None:
+            base = str(Path(self.base_path).resolve()).encode('utf-8')
+            deployment = f"data-{zlib.crc32(base):08x}"
+        store = SharedFrameStore(key, shared_root, deployment)
+
+        start = time.perf_counter()
+        published = []
+        for name, df in frames.items():
+            if not store.has(name):
+                store.publish(name, df)
+                published.append(name)
+            frames[name] = store.attach(name)
+        store.prune()
+
+        self.biometric_df = frames.get('biometric')
+        self.demographic_df = frames.get('demographic')
+        self.enrolment_df = frames.get('enrolment')
+        self.integrated_df = frames.get('integrated')
+        self.shared_store = store
+
+        action = f"published {', '.join(published)} and attached" if published else "attached"
+        print(f"✓ Shared frames {action} at {store.directory} "
+              f"in {time.perf_counter() - start:.2f}s")
+
+        return self.biometric_df, self.demographic_df, self.enrolment_df, self.integrated_df
+
     def export_to_parquet(self, output_dir=None):
         """
         Export all datasets to Parquet format for 3-5x faster loading.
@@ -0,0 +1,100 @@
+"""
+Date Dimension for the Integrated Aadhar Data Pipeline
+Calendar attributes (year, month, day of week, ISO week, month label and
+week/month starts) computed once per distinct date and keyed by date code,
+instead of being materialized on every row. Rows gather them on demand, and
+date-level aggregates are regrouped by mapping their few hundred dates.
+"""
+
+import numpy as np
+import pandas as pd
+
+from encoding import encode_day_of_week, encode_month_year
+
+
+# Attributes of the dimension table, besides the date itself
+CALENDAR_COLUMNS = ['year', 'month', 'day_of_week', 'week_of_year', 'month_year',
+                    'week_start', 'month_start']
+
+
+class DateDimension:
+    """
+    Calendar attributes of a set of distinct dates.
+
+    Date codes are positions in the sorted distinct dates. The table is
+    built on first use; gathering attributes for rows is a take() on their
+    date codes.
+    """
+
+    def __init__(self, dates):
+        """
+        Wrap the distinct dates of one or more frames.
+
+        Args:
+            dates: Dates (duplicates and NaT are dropped)
+        """
+        dates = pd.DatetimeIndex(dates)
+        self.dates = dates[~dates.isna()].unique().sort_values()
+        self._table = None
+
+    @property
+    def table(self):
+        """Calendar attributes indexed by date code (built once)."""
+        if self._table is None:
+            dates = pd.Series(self.dates)
+            self._table = pd.DataFrame({
+                'date': self.dates,
+                'year': self.dates.year.astype('int32'),
+                'month': self.dates.month.astype('int32'),
+                'day_of_week': encode_day_of_week(dates),
+                'week_of_year': dates.dt.isocalendar().week.array,
+                'month_year': encode_month_year(self.dates),
+                'week_start': dates.dt.to_period('W').dt.to_timestamp().to_numpy(),
+                'month_start': dates.dt.to_period('M').dt.to_timestamp().to_numpy(),
+            }).rename_axis('date_code')
+        return self._table
+
+    def codes(self, dates):
+        """Date codes of dates (-1 for NaT or dates outside the dimension)."""
+        return self.dates.get_indexer(pd.DatetimeIndex(dates))
+
+    def attributes(self, dates, columns=None):
+        """
+        Calendar attributes of each of a sequence of dates (e.g. a frame's
+        'date' column), gathered from the table.
+
+        Args:
+            dates: Dates to look up
+            columns: Attributes to return (default CALENDAR_COLUMNS)
+
+        Returns:
+            pd.DataFrame aligned with dates (missing where a date is not in
+            the dimension)
+        """
+        columns = CALENDAR_COLUMNS if columns is None else columns
+        codes = self.codes(dates)
+        table = self.table[columns]
+        found = codes >= 0
+        if found.all():
+            result = table.take(codes)
+        else:
+            # Missing rows come from a reindex, which fills them with NA
+            result = table.reindex(np.where(found, codes, -1))
+        return result.set_axis(dates.index if isinstance(dates, pd.Series) else
+                               pd.RangeIndex(len(codes)))
+
+    def aggregate(self, daily, column):
+        """
+        Regroup a date-level aggregate by a calendar attribute.
+
+        Args:
+            daily: Values indexed by date (one per date)
+            column: Attribute to group by (e.g. 'day_of_week', 'week_start')
+
+        Returns:
+            pd.Series of sums indexed by the attribute's observed values, in
+            their natural order
+        """
+        # Keys as a bare array (categoricals keep their order), not aligned on index
+        keys = self.attributes(daily.index, [column])[column].array
+        return daily.groupby(keys, observed=True, sort=True).sum().rename_axis(column)
@@ -0,0 +1,33 @@
+"""
+Date Slices for the Integrated Aadhar Data Pipeline
+Row lookups by date over date-sorted frames, shared by the pipeline (which
+refreshes the rows of the dates new shards touch) and the dashboard cube
+(which re-aggregates the cells of those dates).
+"""
+
+import numpy as np
+
+
+def date_positions(values, dates):
+    """
+    Row positions of a date-sorted column (NaT last) dated on any of the
+    given dates, found by binary search without scanning the column.
+
+    Args:
+        values: Date-sorted datetime column
+        dates: Dates to look up
+
+    Returns:
+        np.ndarray of row positions, in date order
+    """
+    values = np.asarray(values, dtype='datetime64[ns]')
+    targets = np.asarray(dates, dtype='datetime64[ns]')
+    starts = np.searchsorted(values, targets, side='left')
+    ends = np.searchsorted(values, targets, side='right')
+    rows = [np.arange(start, end) for start, end in zip(starts, ends) if end > start]
+    return np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+
+
+def rows_for_dates(df, dates):
+    """Rows of a date-sorted frame dated on any of the given dates."""
+    return df.iloc[date_positions(df['date'], dates)]
@@ -0,0 +1,116 @@
+"""
+Shared Dictionary Encoding for the Integrated Aadhar Data Pipeline
+Fixed categorical dtypes for the low-cardinality string columns and one
+global code table for states and districts, so every dataset stores these
+columns as small integer codes with identical meanings, and groupbys and
+joins across datasets run on the codes.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Monday first, matching Series.dt.dayofweek
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+DAY_OF_WEEK_DTYPE = pd.CategoricalDtype(DAYS_OF_WEEK, ordered=True)
+GENDER_DTYPE = pd.CategoricalDtype(['Male', 'Female', 'Other'])
+AUTH_MODALITY_DTYPE = pd.CategoricalDtype(['Fingerprint', 'Iris', 'Face', 'OTP'])
+AUTH_STATUS_DTYPE = pd.CategoricalDtype(['Success', 'Failure'])
+AGE_GROUP_DTYPE = pd.CategoricalDtype(['5-17', '18+'])
+
+# Columns sharing one code table across the datasets
+GLOBAL_CODE_COLUMNS = ['state', 'district']
+
+
+def from_codes(codes, dtype):
+    """Categorical column from integer codes (-1 for missing) of a fixed dtype."""
+    return pd.Categorical.from_codes(np.asarray(codes), dtype=dtype)
+
+
+def zone_dtype(state_to_zone):
+    """Categorical dtype of the zones of a state mapping, plus 'Unknown'."""
+    return pd.CategoricalDtype(sorted(set(state_to_zone.values()) | {'Unknown'}))
+
+
+def encode_zones(states, state_to_zone):
+    """
+    Zone of each row, mapped once per distinct state.
+
+    Args:
+        states: State column (categorical or plain)
+        state_to_zone: Mapping of state name to zone ('Unknown' if absent)
+
+    Returns:
+        pd.Categorical with zone_dtype(state_to_zone)
+    """
+    dtype = zone_dtype(state_to_zone)
+    states = states if isinstance(states.dtype, pd.CategoricalDtype) else \
+        states.astype('category')
+    zones = dtype.categories.get_indexer(
+        [state_to_zone.get(state, 'Unknown') for state in states.cat.categories])
+    codes = states.cat.codes.to_numpy()
+    # Missing states map to 'Unknown' too
+    return from_codes(np.where(codes >= 0, zones[codes], dtype.categories.get_loc('Unknown')),
+                      dtype)
+
+
+def encode_day_of_week(dates):
+    """Day name of each date as DAY_OF_WEEK_DTYPE codes (NaT stays missing)."""
+    days = dates.dt.dayofweek
+    return from_codes(days.fillna(-1).to_numpy(dtype=np.int64), DAY_OF_WEEK_DTYPE)
+
+
+def encode_month_year(dates):
+    """
+    'YYYY-MM' of each date as a categorical, formatted once per distinct
+    month rather than per row (categories sort chronologically).
+    """
+    values = pd.DatetimeIndex(dates)
+    months = np.where(values.isna(), -1, values.year * 12 + values.month - 1)
+    distinct = np.unique(months[months >= 0])
+    labels = [f"{month // 12:04d}-{month % 12 + 1:02d}" for month in distinct]
+    codes = np.where(months >= 0, np.searchsorted(distinct, months), -1)
+    return from_codes(codes, pd.CategoricalDtype(labels))
+
+
+def share_codes(frames, columns=GLOBAL_CODE_COLUMNS):
+    """
+    Recode columns of several frames onto one global code table.
+
+    The table of a column is the sorted union of its values across the
+    frames, so codes mean the same in every frame (joins and stacked
+    groupbys stay categorical) and sort like the values. Frames already on
+    the table are returned unchanged; otherwise only codes are remapped.
+
+    Args:
+        frames: Frames to recode (None entries are passed through)
+        columns: Columns to share
+
+    Returns:
+        list: The frames, recoded
+    """
+    frames = list(frames)
+    for col in columns:
+        present = [df for df in frames if df is not None and col in df]
+        if not present:
+            continue
+        categories = set()
+        for df in present:
+            values = df[col].cat.categories if isinstance(df[col].dtype, pd.CategoricalDtype) \
+                else pd.Index(df[col].dropna().unique())
+            categories.update(values.astype(str))
+        dtype = pd.CategoricalDtype(sorted(categories))
+        for i, df in enumerate(frames):
+            if df is None or col not in df or (
+                    isinstance(df[col].dtype, pd.CategoricalDtype) and
+                    df[col].cat.categories.equals(dtype.categories)):
+                continue
+            df = df.copy(deep=False)
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].cat.rename_categories(df[col].cat.categories.astype(str)) \
+                    .cat.set_categories(dtype.categories)
+            else:
+                df[col] = df[col].astype(str).where(df[col].notna()).astype(dtype)
+            frames[i] = df
+    return frames
@@ -0,0 +1,271 @@
+"""
+Server-Side Figure Cache for Dash Callbacks
+Memoizes chart callbacks on their normalized inputs and a data-version token,
+with an in-process LRU, a diskcache store shared by the workers on one host,
+or a redis store.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# Callback inputs that only trigger a refresh and never change the figure
+DEFAULT_IGNORED_ARGS = ('n_clicks', 'n_intervals')
+
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+# Seconds a redis connect or command may block a callback thread
+REDIS_SOCKET_TIMEOUT = 0.5
+
+
+class _MemoryBackend:
+    """Thread-safe in-process LRU with optional TTL."""
+
+    shared = False
+
+    def __init__(self, maxsize=512, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._store = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._store[key]
+                return None
+            self._store.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._store[key] = (expires_at, value)
+            self._store.move_to_end(key)
+            while len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+
+class _DiskBackend:
+    """diskcache store that gunicorn workers on one host can share."""
+
+    shared = True
+
+    def __init__(self, directory, ttl=None, size_limit=2 ** 30):
+        import diskcache
+        self.ttl = ttl
+        self._cache = diskcache.Cache(directory, size_limit=size_limit,
+                                      eviction_policy='least-recently-used')
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        self._cache.set(key, value, expire=self.ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class _RedisBackend:
+    """redis store; eviction follows the server's maxmemory-policy."""
+
+    PREFIX = 'aadhar:figure:'
+    shared = True
+
+    def __init__(self, url, ttl=None, socket_timeout=REDIS_SOCKET_TIMEOUT):
+        import redis
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url, socket_connect_timeout=socket_timeout,
+                                            socket_timeout=socket_timeout)
+        # Connect now, so an unreachable server fails here (see FigureCache.from_env)
+        # rather than on every callback
+        self._client.ping()
+
+    def get(self, key):
+        payload = self._client.get(self.PREFIX + key)
+        return None if payload is None else pickle.loads(payload)
+
+    def set(self, key, value):
+        self._client.set(self.PREFIX + key, pickle.dumps(value), ex=self.ttl)
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self.PREFIX + '*'))
+        if keys:
+            self._client.delete(*keys)
+
+
+def _normalize(value):
+    """Canonical, hashable form of a callback input."""
+    if isinstance(value, str) and _ISO_DATE.match(value):
+        try:
+            return pd.Timestamp(value).isoformat()
+        except ValueError:
+            return value
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return None
+        return tuple(sorted(_normalize(v) for v in value))
+    return value
+
+
+class FigureCache:
+    """
+    Memoizing decorator for Dash chart callbacks.
+
+    The key is the callback name, its normalized inputs (ISO dates parsed,
+    lists order-insensitive, empty lists treated as None, refresh counters
+    ignored) and the current data-version token. Changing the token with
+    set_data_version() makes every earlier entry unreachable, so figures
+    are never served from data that has since been reloaded.
+    """
+
+    def __init__(self, backend='memory', maxsize=512, ttl=None, directory=None,
+                 redis_url=None, ignored_args=DEFAULT_IGNORED_ARGS):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: 'memory', 'disk', 'redis' or 'none' (disables caching)
+            maxsize: Maximum entries for the in-process LRU
+            ttl: Optional entry lifetime in seconds
+            directory: diskcache directory for the 'disk' backend
+            redis_url: Connection URL for the 'redis' backend
+            ignored_args: Argument names left out of the cache key
+        """
+        self.backend_name = backend
+        self.ignored_args = set(ignored_args)
+        self.data_version = None
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.per_callback = {}
+        self._lock = threading.Lock()
+
+        if backend == 'none':
+            self._backend = None
+        elif backend == 'disk':
+            self._backend = _DiskBackend(directory or 'figure_cache', ttl=ttl)
+        elif backend == 'redis':
+            self._backend = _RedisBackend(redis_url or 'redis://localhost:6379/0', ttl=ttl)
+        elif backend == 'memory':
+            self._backend = _MemoryBackend(maxsize=maxsize, ttl=ttl)
+        else:
+            raise ValueError("backend must be 'memory', 'disk', 'redis' or 'none'")
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build a cache from environment variables:
+        FIGURE_CACHE_BACKEND (memory|disk|redis|none, default memory),
+        FIGURE_CACHE_SIZE, FIGURE_CACHE_TTL, FIGURE_CACHE_DIR and REDIS_URL.
+        Falls back to the in-process LRU if the chosen backend is unavailable
+        (its package is missing or the redis server does not answer).
+        """
+        backend = os.environ.get('FIGURE_CACHE_BACKEND', 'memory')
+        ttl = os.environ.get('FIGURE_CACHE_TTL')
+        options = dict(
+            maxsize=int(os.environ.get('FIGURE_CACHE_SIZE', 512)),
+            ttl=float(ttl) if ttl else None,
+            directory=os.environ.get('FIGURE_CACHE_DIR'),
+            redis_url=os.environ.get('REDIS_URL'),
+        )
+        try:
+            return cls(backend, **options)
+        except Exception as e:
+            print(f"Warning: figure cache backend '{backend}' unavailable ({e}), "
+                  f"using in-process LRU")
+            return cls('memory', **options)
+
+    def set_data_version(self, token):
+        """
+        Switch to a new data-version token after the data is (re)loaded.
+
+        Entries for older tokens can no longer be hit. The in-process LRU is
+        cleared so they do not occupy space until evicted; the disk and
+        redis stores are left to their TTL and size limits, since other
+        workers may already have cached figures under the new token.
+        """
+        self.data_version = str(token)
+        if self._backend is not None and not self._backend.shared:
+            self.invalidate()
+
+    def invalidate(self):
+        """Remove every cached figure."""
+        if self._backend is not None:
+            try:
+                self._backend.clear()
+            except Exception as e:
+                print(f"Warning: could not clear figure cache ({e})")
+
+    def stats(self):
+        """Hit/miss counters of this process."""
+        with self._lock:
+            return {
+                'backend': self.backend_name,
+                'data_version': self.data_version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'per_callback': {name: dict(counts) for name, counts in self.per_callback.items()},
+            }
+
+    def _count(self, name, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            counts = self.per_callback.setdefault(name, {'hits': 0, 'misses': 0})
+            if outcome in counts:
+                counts[outcome] += 1
+
+    def memoize(self, func):
+        """Decorate a callback so identical inputs reuse the cached output."""
+        signature = inspect.signature(func)
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if self._backend is None:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            inputs = tuple((arg, _normalize(value)) for arg, value in bound.arguments.items()
+                           if arg not in self.ignored_args)
+            raw_key = repr((name, self.data_version, inputs)).encode('utf-8')
+            key = hashlib.sha1(raw_key).hexdigest()
+
+            try:
+                cached = self._backend.get(key)
+            except Exception:
+                self._count(name, 'errors')
+                cached = None
+
+            if cached is not None:
+                self._count(name, 'hits')
+                return cached
+
+            self._count(name, 'misses')
+            result = func(*args, **kwargs)
+            try:
+                self._backend.set(key, result)
+            except Exception:
+                self._count(name, 'errors')
+            return result
+
+        return wrapper
@@ -0,0 +1,262 @@
+"""
+KPI Engine for the Integrated Aadhar Dashboard
+Running totals and latency histograms per (date, state), kept as prefix
+sums over dates, plus the DistinctCountIndex for active states and
+districts, so the KPI cards can be answered for any date range, zone and
+state selection without touching the rows. New rows are folded in as they
+are appended.
+"""
+
+import numpy as np
+import pandas as pd
+
+from axis_arrays import axis_codes, expand, grow_axis
+from latency_sketch import bucket_value, histogram_quantiles, sketch_bucket
+
+
+# Additive measures kept per (date, state) for each dataset
+KPI_MEASURES = {
+    'biometric': ['rows', 'total_transactions'],
+    'demographic': ['rows', 'successes'],
+    'enrolment': ['rows', 'total_enrolment', 'age_0_5'],
+}
+
+
+class KPIEngine:
+    """
+    Constant-time KPIs for any (date range, zones, states) filter.
+
+    Per (date, state) the engine keeps row counts and summed metrics of each
+    dataset and a latency histogram (the LatencySketchIndex buckets, so
+    percentiles are within LATENCY_SKETCH_ALPHA relative error), stored as
+    prefix sums over dates, so a query costs O(states x buckets) whatever
+    the number of rows or dates. Active states and districts come from a
+    DistinctCountIndex, which its owner keeps current. Rows without a date
+    or state are not counted.
+
+    add() folds new rows in and swaps the derived arrays in one assignment,
+    so concurrent readers see either the old or the new totals.
+    """
+
+    def __init__(self, state_to_zone, distinct):
+        """
+        Initialize an empty engine.
+
+        Args:
+            state_to_zone: Mapping of state name to zone ('Unknown' if absent)
+            distinct: DistinctCountIndex of the same rows
+        """
+        self.state_to_zone = state_to_zone
+        self.distinct = distinct
+        self._data = {
+            'dates': pd.DatetimeIndex([]),
+            'states': pd.Index([], dtype=object),
+            'base': {(dataset, col): np.zeros((0, 0)) for dataset, cols in KPI_MEASURES.items()
+                     for col in cols},
+            'first_bucket': 0,
+            'latency': np.zeros((0, 0, 0), dtype=np.uint32),
+        }
+        self._derived = self._derive(self._data)
+
+    @classmethod
+    def from_frames(cls, state_to_zone, distinct, biometric_df=None, demographic_df=None,
+                    enrolment_df=None):
+        """
+        Build the engine from the pipeline frames.
+
+        Returns:
+            KPIEngine
+        """
+        engine = cls(state_to_zone, distinct)
+        frames = {'biometric': biometric_df, 'demographic': demographic_df,
+                  'enrolment': enrolment_df}
+        for dataset, df in frames.items():
+            if df is not None:
+                engine.add(dataset, df)
+        return engine
+
+    @classmethod
+    def from_cells(cls, state_to_zone, distinct, cells, latency_buckets=None):
+        """
+        Build the engine from per-(state, district, date) aggregates, such
+        as StreamingAggregator.cells().
+
+        Args:
+            state_to_zone: Mapping of state name to zone
+            distinct: DistinctCountIndex built while the rows were ingested
+            cells: dict of dataset -> cells with a 'rows' column and the
+                   KPI_MEASURES columns
+            latency_buckets: Requests per (date, state, sketch bucket), such
+                             as a LatencySketchIndex table ('bucket' and
+                             'count' columns)
+
+        Returns:
+            KPIEngine
+        """
+        engine = cls(state_to_zone, distinct)
+        for dataset, df in cells.items():
+            latency = None
+            if dataset == 'demographic' and latency_buckets is not None:
+                latency = (latency_buckets['date'], latency_buckets['state'],
+                           latency_buckets['bucket'].to_numpy(dtype=np.int64),
+                           latency_buckets['count'].to_numpy(dtype=float))
+            engine._fold(dataset, df, {col: df[col].to_numpy(dtype=float)
+                                       for col in KPI_MEASURES[dataset]}, latency)
+        return engine
+
+    def add(self, dataset, rows):
+        """
+        Fold new raw rows of a dataset into the totals.
+
+        Args:
+            dataset: 'biometric', 'demographic' or 'enrolment'
+            rows: New rows (cleaned pipeline rows)
+        """
+        values = {'rows': np.ones(len(rows))}
+        latency = None
+        if dataset == 'demographic':
+            values['successes'] = (rows['auth_status'] == 'Success').to_numpy(dtype=float)
+            latency = (rows['date'], rows['state'],
+                       sketch_bucket(rows['response_time_ms'].to_numpy()), None)
+        for col in KPI_MEASURES[dataset]:
+            if col not in values:
+                values[col] = rows[col].to_numpy(dtype=float)
+        self._fold(dataset, rows, values, latency)
+
+    def _fold(self, dataset, df, values, latency=None):
+        """Add per-row (or per-cell) measures and latency buckets."""
+        data = self._data
+        dates, states = data['dates'], data['states']
+
+        # Grow the date, state and bucket axes to cover the rows
+        new_dates = grow_axis(dates, pd.DatetimeIndex(df['date'].dropna().unique()))
+        new_states = grow_axis(states, pd.Index(df['state'].dropna().unique()).astype(str))
+        first_bucket, n_buckets = data['first_bucket'], data['latency'].shape[2]
+        if latency is not None and len(latency[2]):
+            buckets = latency[2]
+            lo = min(buckets.min(), first_bucket) if n_buckets else buckets.min()
+            hi = max(buckets.max() + 1, first_bucket + n_buckets)
+            first_bucket, n_buckets = int(lo), int(hi - lo)
+
+        n_dates, n_states = len(new_dates), len(new_states)
+        axes = (new_dates.get_indexer(dates), new_states.get_indexer(states))
+        base = {key: expand(array, axes, (n_dates, n_states))
+                for key, array in data['base'].items()}
+        hist = expand(data['latency'], axes, (n_dates, n_states, n_buckets),
+                       offset=data['first_bucket'] - first_bucket)
+
+        # Add the rows
+        date_codes = new_dates.get_indexer(df['date'])
+        state_codes = axis_codes(new_states, df['state'])
+        valid = (date_codes >= 0) & (state_codes >= 0)
+        cell = date_codes[valid] * n_states + state_codes[valid]
+        for col, weights in values.items():
+            base[(dataset, col)] += np.bincount(cell, weights=np.asarray(weights)[valid],
+                                                minlength=n_dates * n_states)\
+                .reshape(n_dates, n_states)
+
+        if latency is not None and len(latency[2]):
+            lat_dates, lat_states, lat_buckets, lat_weights = latency
+            d = new_dates.get_indexer(lat_dates)
+            s = axis_codes(new_states, lat_states)
+            ok = (d >= 0) & (s >= 0)
+            b = lat_buckets[ok] - first_bucket
+            weights = None if lat_weights is None else lat_weights[ok]
+            hist += np.bincount((d[ok] * n_states + s[ok]) * n_buckets + b, weights=weights,
+                                minlength=n_dates * n_states * n_buckets)\
+                .reshape(n_dates, n_states, n_buckets).astype(np.uint32)
+
+        data = {
+            'dates': new_dates,
+            'states': new_states,
+            'base': base,
+            'first_bucket': first_bucket,
+            'latency': hist,
+        }
+        derived = self._derive(data)
+        self._data, self._derived = data, derived
+
+    def _derive(self, data):
+        """Prefix sums over dates of the totals and histograms."""
+        def prefix(array):
+            zero = np.zeros((1,) + array.shape[1:], dtype=array.dtype)
+            return np.concatenate([zero, np.cumsum(array, axis=0, dtype=array.dtype)])
+
+        n_buckets = data['latency'].shape[2]
+        first = data['first_bucket']
+        zones = np.array([self.state_to_zone.get(state, 'Unknown') for state in data['states']],
+                         dtype=object)
+        return {
+            'dates': data['dates'].to_numpy(dtype='datetime64[ns]'),
+            'states': data['states'],
+            'zones': zones,
+            'totals': {key: prefix(array) for key, array in data['base'].items()},
+            'latency': prefix(data['latency']),
+            'bucket_values': bucket_value(np.arange(first, first + n_buckets)),
+        }
+
+    def kpis(self, start_date=None, end_date=None, zones=None, states=None):
+        """
+        KPIs of a filter combination, with the keys of get_national_kpis().
+
+        Args:
+            start_date: Inclusive start date (None for the first date)
+            end_date: Inclusive end date (None for the last date)
+            zones: Optional list of zones to keep
+            states: Optional list of states to keep
+
+        Returns:
+            dict: KPI values (0 for rates and latencies of empty selections)
+        """
+        derived = self._derived
+        dates = derived['dates']
+        lo = 0 if start_date is None else int(np.searchsorted(
+            dates, pd.Timestamp(start_date).to_datetime64(), side='left'))
+        hi = len(dates) if end_date is None else int(np.searchsorted(
+            dates, pd.Timestamp(end_date).to_datetime64(), side='right'))
+        hi = max(lo, hi)
+
+        mask = np.ones(len(derived['states']), dtype=bool)
+        if zones:
+            mask &= np.isin(derived['zones'], list(zones))
+        if states:
+            mask &= derived['states'].isin(states)
+        selected = np.flatnonzero(mask)
+
+        def per_state(dataset, col):
+            totals = derived['totals'][(dataset, col)]
+            return totals[hi, selected] - totals[lo, selected]
+
+        def total(dataset, col):
+            return int(round(per_state(dataset, col).sum()))
+
+        # Distinct counts over the same dates and states
+        names = None if mask.all() else list(derived['states'][selected])
+
+        def distinct(dataset, column):
+            return self.distinct.count(dataset, column, start_date, end_date, states=names)
+
+        hist = derived['latency'][hi, selected].astype(np.int64) - \
+            derived['latency'][lo, selected]
+        hist = hist.sum(axis=0)
+        if hist.sum():
+            median, p95, p99 = histogram_quantiles(hist, derived['bucket_values'], [0.5, 0.95, 0.99])
+        else:
+            median = p95 = p99 = 0.0
+
+        records = total('demographic', 'rows')
+        successes = total('demographic', 'successes')
+        return {
+            'total_biometric_transactions': total('biometric', 'total_transactions'),
+            'active_states_biometric': distinct('biometric', 'state'),
+            'active_districts_biometric': distinct('biometric', 'district'),
+            'total_demographic_records': records,
+            'national_auth_success_rate': successes / records * 100 if records else 0.0,
+            'median_latency_ms': median,
+            'p95_latency_ms': p95,
+            'p99_latency_ms': p99,
+            'total_enrolments': total('enrolment', 'total_enrolment'),
+            'infant_enrolments': total('enrolment', 'age_0_5'),
+            'active_states_enrolment': distinct('enrolment', 'state'),
+            'total_data_points': sum(total(dataset, 'rows') for dataset in KPI_MEASURES),
+        }
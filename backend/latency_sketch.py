@@ -0,0 +1,302 @@
+"""
+Mergeable Latency Quantile Sketches
+One log-bucket histogram (the DDSketch mapping with a fixed growth factor)
+per (date, state, district, auth modality) cell. Sketches merge by adding
+bucket counts, so percentiles for any state, district, modality or date
+selection come from summing the few hundred selected cells instead of
+sorting millions of latencies.
+
+Accuracy: bucket i holds latencies in [gamma^i, gamma^(i+1)) and reports
+them as 2 * gamma^(i+1) / (gamma + 1), which is within
+alpha = (gamma - 1) / (gamma + 1) relative error of every value in the
+bucket (0.99% for gamma = 1.02). Quantiles use pandas' linear
+interpolation rule between the two order statistics around rank
+q * (n - 1); each of those is off by at most alpha and interpolation is a
+convex combination, so every reported quantile is within alpha relative
+error of the exact pandas quantile of the same rows, for any selection and
+any q. Counts and means are exact (each bucket also carries the sum of its
+latencies). The bound holds for latencies >= 1 ms; smaller values are
+counted in the 1 ms bucket. tests/test_latency_sketch.py checks it.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Growth factor between bucket edges; see LATENCY_SKETCH_ALPHA
+LATENCY_SKETCH_GAMMA = 1.02
+
+# Guaranteed relative error of every quantile: (gamma - 1) / (gamma + 1)
+LATENCY_SKETCH_ALPHA = (LATENCY_SKETCH_GAMMA - 1) / (LATENCY_SKETCH_GAMMA + 1)
+
+# Cell dimensions, in sort order (date first, so date ranges are row ranges)
+SKETCH_DIMENSIONS = ['date', 'state', 'district', 'auth_modality']
+
+# Summary columns and the quantile behind each
+SKETCH_QUANTILES = {'Median': 0.5, 'P95': 0.95, 'P99': 0.99}
+
+
+def sketch_bucket(values):
+    """Map latencies (ms) to log-spaced bucket indexes."""
+    values = np.maximum(np.asarray(values, dtype=float), 1.0)
+    return np.floor(np.log(values) / np.log(LATENCY_SKETCH_GAMMA)).astype(np.int64)
+
+
+def bucket_value(buckets):
+    """Reported value of buckets: the point of least relative error."""
+    upper = LATENCY_SKETCH_GAMMA ** (np.asarray(buckets, dtype=float) + 1)
+    return upper * 2 / (LATENCY_SKETCH_GAMMA + 1)
+
+
+def histogram_quantiles(counts, values, quantiles):
+    """
+    Quantiles of histograms using the same rank rule as pandas' linear
+    interpolation (rank q * (n - 1) over the sorted values).
+
+    Args:
+        counts: Counts of shape (groups, bins) or (bins,)
+        values: Value of each bin, ascending
+        quantiles: Quantiles in [0, 1]
+
+    Returns:
+        np.ndarray of shape (groups, quantiles) or (quantiles,); NaN for
+        empty histograms
+    """
+    counts = np.asarray(counts)
+    single = counts.ndim == 1
+    counts = np.atleast_2d(counts)
+    values = np.asarray(values, dtype=float)
+    quantiles = np.asarray(quantiles, dtype=float)
+
+    cumulative = np.cumsum(counts, axis=1)
+    total = cumulative[:, -1:]
+    rank = quantiles[None, :] * np.maximum(total - 1, 0)
+    lower, upper = np.floor(rank), np.ceil(rank)
+    # Index of the bin holding each rank (searchsorted side='right' per row)
+    lower_bin = (cumulative[:, None, :] <= lower[:, :, None]).sum(axis=2)
+    upper_bin = (cumulative[:, None, :] <= upper[:, :, None]).sum(axis=2)
+    last = len(values) - 1
+    frac = rank - lower
+    result = (values[np.minimum(lower_bin, last)] * (1 - frac) +
+              values[np.minimum(upper_bin, last)] * frac)
+    result[total[:, 0] == 0] = np.nan
+    return result[0] if single else result
+
+
+def _grouped_median(table, keys, value, count):
+    """
+    Median per group from counted values, with pandas' rule (the mean of
+    the two middle values for an even count).
+
+    Args:
+        table: One row per (group, value), sorted by keys then value
+        keys: Group key columns
+        value: Value column
+        count: Column holding how often each value occurs
+
+    Returns:
+        pd.Series of medians indexed by the group keys
+    """
+    if table.empty:
+        return pd.Series([], index=pd.MultiIndex.from_frame(table[keys]), dtype=float)
+    counts = table[count].to_numpy()
+    cumulative = np.cumsum(counts)
+    codes = table.groupby(keys, observed=True, sort=False).ngroup().to_numpy()
+    first = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    before = np.r_[0, cumulative[:-1]][first]
+    n = cumulative[np.r_[first[1:], len(table)] - 1] - before
+
+    lower = np.searchsorted(cumulative, before + (n - 1) // 2, side='right')
+    upper = np.searchsorted(cumulative, before + n // 2, side='right')
+    values = table[value].to_numpy(dtype=float)
+    index = pd.MultiIndex.from_frame(table.iloc[first][keys])
+    return pd.Series((values[lower] + values[upper]) / 2, index=index)
+
+
+class LatencySketchIndex:
+    """
+    Sparse sketches of every (date, state, district, auth_modality) cell.
+
+    Stored as one date-sorted table with a row per non-empty (cell, bucket)
+    holding its count and latency total, so merging a selection is a
+    bincount over a contiguous date range. The index is immutable: updates
+    return a new index.
+    """
+
+    def __init__(self, table):
+        """
+        Wrap a sketch table (see build).
+
+        Args:
+            table: Rows of (date, state, district, auth_modality, bucket,
+                   count, total), sorted by the dimensions and bucket
+        """
+        self.table = table
+        self._dates = table['date'].to_numpy(dtype='datetime64[ns]')
+        buckets = table['bucket'].to_numpy()
+        self.first_bucket = int(buckets.min()) if len(buckets) else 0
+        self.n_buckets = int(buckets.max()) - self.first_bucket + 1 if len(buckets) else 1
+        self.bucket_values = bucket_value(np.arange(self.first_bucket,
+                                                    self.first_bucket + self.n_buckets))
+
+    @classmethod
+    def build(cls, df, latency='response_time_ms', weights=None):
+        """
+        Sketch the latencies of rows (or of pre-counted latencies).
+
+        Args:
+            df: Frame with the SKETCH_DIMENSIONS columns and latencies
+            latency: Latency column (ms)
+            weights: Optional column with the number of requests behind each
+                     row (e.g. counts of each distinct latency)
+
+        Returns:
+            LatencySketchIndex
+        """
+        values = df[latency].to_numpy()
+        count = np.ones(len(df), dtype=np.int64) if weights is None else \
+            df[weights].to_numpy(dtype=np.int64)
+        rows = pd.DataFrame({
+            'date': df['date'].to_numpy(),
+            'state': pd.Categorical(df['state']),
+            'district': pd.Categorical(df['district']),
+            'auth_modality': pd.Categorical(df['auth_modality']),
+            'bucket': sketch_bucket(values).astype(np.int16),
+            'count': count,
+            'total': values * count,
+        })
+        table = rows.groupby(SKETCH_DIMENSIONS + ['bucket'], observed=True, sort=True).agg(
+            count=('count', 'sum'), total=('total', 'sum')).reset_index()
+        return cls(table)
+
+    def replace_dates(self, dates, other):
+        """
+        Return an index whose cells for the given dates come from another
+        index (sketched from just those dates' rows) and the rest from this.
+
+        Args:
+            dates: Dates to replace
+            other: LatencySketchIndex of the replacement rows
+
+        Returns:
+            LatencySketchIndex
+        """
+        kept = self.table[~self.table['date'].isin(pd.DatetimeIndex(dates)).to_numpy()]
+        table = pd.concat([kept, other.table], ignore_index=True)
+        for col in ('state', 'district', 'auth_modality'):
+            if not isinstance(table[col].dtype, pd.CategoricalDtype):
+                table[col] = table[col].astype(str).astype('category')
+        return LatencySketchIndex(table.sort_values(SKETCH_DIMENSIONS + ['bucket'],
+                                                    kind='stable').reset_index(drop=True))
+
+    def select(self, start_date=None, end_date=None, states=None, districts=None,
+               modalities=None):
+        """
+        Sketch rows of the cells matching a filter.
+
+        Args:
+            start_date: Inclusive start date (None for no date filter)
+            end_date: Inclusive end date (None for no date filter)
+            states: Optional list of states to keep
+            districts: Optional list of districts to keep
+            modalities: Optional list of auth modalities to keep
+
+        Returns:
+            pd.DataFrame slice of the table (read-only)
+        """
+        lo, hi = 0, len(self.table)
+        if start_date is not None:
+            lo = np.searchsorted(self._dates, pd.Timestamp(start_date).to_datetime64(), side='left')
+        if end_date is not None:
+            hi = np.searchsorted(self._dates, pd.Timestamp(end_date).to_datetime64(), side='right')
+        rows = self.table.iloc[lo:max(lo, hi)]
+
+        mask = None
+        for col, keep in (('state', states), ('district', districts),
+                          ('auth_modality', modalities)):
+            if keep:
+                col_mask = rows[col].isin(keep).to_numpy()
+                mask = col_mask if mask is None else mask & col_mask
+        return rows if mask is None else rows[mask]
+
+    def merge(self, rows, by=None):
+        """
+        Merge sketch rows into one histogram per group.
+
+        Args:
+            rows: Rows from select()
+            by: Optional dimension to group by (e.g. 'state')
+
+        Returns:
+            tuple: (group labels (None without by), counts of shape
+                    (groups, buckets), exact latency totals per group)
+        """
+        if by is None:
+            codes, labels = np.zeros(len(rows), dtype=np.int64), None
+            n_groups = 1
+        else:
+            # Dimensions are categorical: group on their codes
+            codes = rows[by].cat.codes.to_numpy().astype(np.int64)
+            labels = rows[by].cat.categories.astype(str)
+            n_groups = len(labels)
+        buckets = rows['bucket'].to_numpy(dtype=np.int64) - self.first_bucket
+        counts = np.bincount(codes * self.n_buckets + buckets,
+                             weights=rows['count'].to_numpy(dtype=float),
+                             minlength=n_groups * self.n_buckets)
+        totals = np.bincount(codes, weights=rows['total'].to_numpy(dtype=float),
+                             minlength=n_groups)
+        return labels, counts.reshape(n_groups, self.n_buckets).astype(np.int64), totals
+
+    def quantiles(self, quantiles, **filters):
+        """
+        Latency quantiles of a selection (see select for the filters).
+
+        Returns:
+            np.ndarray of the quantiles, each within LATENCY_SKETCH_ALPHA
+            relative error of the exact value
+        """
+        _, counts, _ = self.merge(self.select(**filters))
+        return histogram_quantiles(counts[0], self.bucket_values, quantiles)
+
+    def medians(self, by=('state', 'district', 'date')):
+        """
+        Median latency per group of cells, merging the sketches of each
+        group (e.g. the modalities of a state-district-date record).
+
+        Args:
+            by: Dimensions to group by
+
+        Returns:
+            pd.Series of medians (within LATENCY_SKETCH_ALPHA relative
+            error) indexed by the group keys
+        """
+        by = list(by)
+        table = self.table.groupby(by + ['bucket'], observed=True, sort=True)['count'] \
+            .sum().reset_index()
+        table['value'] = bucket_value(table['bucket'].to_numpy())
+        return _grouped_median(table, by, 'value', 'count')
+
+    def summary(self, by='state', **filters):
+        """
+        Latency statistics per group of a selection.
+
+        Count and Mean are exact; Median, P95 and P99 are within
+        LATENCY_SKETCH_ALPHA relative error.
+
+        Args:
+            by: Dimension to group by
+            **filters: See select
+
+        Returns:
+            pd.DataFrame indexed by group with Count, Median, Mean, P95, P99
+        """
+        labels, counts, totals = self.merge(self.select(**filters), by=by)
+        n = counts.sum(axis=1)
+        keep = n > 0
+        values = histogram_quantiles(counts[keep], self.bucket_values,
+                                     list(SKETCH_QUANTILES.values()))
+        result = pd.DataFrame(values, index=pd.Index(labels[keep], name=by),
+                              columns=list(SKETCH_QUANTILES))
+        result.insert(0, 'Count', n[keep])
+        result.insert(2, 'Mean', totals[keep] / n[keep])
+        return result
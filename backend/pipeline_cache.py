@@ -0,0 +1,358 @@
+"""
+Content-Addressed Cache for the Integrated Aadhar Data Pipeline
+Stores the enriched, typed DataFrames as Parquet or Arrow IPC files keyed by
+the source CSV shards (path, size, mtime) and the pipeline schema version.
+New shards are appended to an entry as delta files, so a daily refresh
+writes only the new rows.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: the cache lock is a no-op
+    fcntl = None
+
+import pandas as pd
+
+
+CACHE_FORMATS = ('parquet', 'arrow')
+
+# Delta files per frame before an append rewrites the frame as one base file
+CACHE_MAX_DELTAS = 8
+
+
+def build_manifest(source_files, base_path, schema_version, sample_frac=None):
+    """
+    Describe the source shards (path, size, mtime) that frames are built from.
+
+    Args:
+        source_files: dict of dataset -> list of CSV paths
+        base_path: Paths are recorded relative to this directory
+        schema_version: Pipeline schema version
+        sample_frac: Sample fraction the frames were loaded with
+
+    Returns:
+        dict: JSON-serializable manifest
+    """
+    base_path = Path(base_path)
+    sources = {}
+    for dataset, files in sorted(source_files.items()):
+        entries = []
+        for file in sorted(files):
+            stat = Path(file).stat()
+            try:
+                rel_path = str(Path(file).relative_to(base_path))
+            except ValueError:
+                rel_path = str(Path(file).resolve())
+            entries.append({
+                'path': rel_path,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+            })
+        sources[dataset] = entries
+
+    return {
+        'schema_version': schema_version,
+        'sample_frac': sample_frac,
+        'sources': sources,
+    }
+
+
+def new_sources(previous, current):
+    """
+    Shards listed in the current sources that a previous manifest lacks.
+
+    Args:
+        previous: 'sources' of the manifest the loaded frames were built from
+        current: 'sources' of a manifest of the shards on disk now
+
+    Returns:
+        dict: dataset -> list of new source entries, or None when a recorded
+              shard changed or disappeared (the frames must be rebuilt)
+    """
+    if set(previous) - set(current):
+        return None
+
+    added = {}
+    for dataset, entries in current.items():
+        known = {entry['path']: entry for entry in previous.get(dataset, [])}
+        if not set(known) <= {entry['path'] for entry in entries}:
+            return None
+        added[dataset] = []
+        for entry in entries:
+            if entry['path'] not in known:
+                added[dataset].append(entry)
+            elif known[entry['path']] != entry:
+                return None
+    return added
+
+
+class PipelineCache:
+    """
+    Directory of cache entries, one sub-folder per content key.
+
+    An entry is only valid for the exact set of source files (and their sizes
+    and modification times), schema version and sample fraction it was built
+    from, so any change to the inputs produces a new key and a cache miss.
+    """
+
+    def __init__(self, cache_dir, schema_version, cache_format='parquet'):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Root directory for cache entries
+            schema_version: Pipeline schema version included in every key
+            cache_format: 'parquet' or 'arrow' (Arrow IPC, read as read-only
+                          views over a memory mapping of the file)
+        """
+        if cache_format not in CACHE_FORMATS:
+            raise ValueError(f"cache_format must be one of {CACHE_FORMATS}")
+
+        self.cache_dir = Path(cache_dir)
+        self.schema_version = schema_version
+        self.cache_format = cache_format
+
+    @contextlib.contextmanager
+    def lock(self):
+        """
+        Hold an exclusive lock on the cache directory.
+
+        Processes serving the same data (e.g. gunicorn workers refreshing on
+        their own timers) check for and write an entry under this lock, so
+        only the first writes it and the others find it complete. Without
+        fcntl (Windows) the lock is a no-op.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / '.lock', 'a') as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    @staticmethod
+    def key_for(manifest):
+        """Return the content key (hex digest) of a manifest."""
+        payload = json.dumps(manifest, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()[:20]
+
+    def entry_path(self, key):
+        """Return the folder of a cache entry."""
+        return self.cache_dir / key
+
+    def _frame_path(self, key, name):
+        suffix = 'parquet' if self.cache_format == 'parquet' else 'arrow'
+        return self.entry_path(key) / f"{name}.{suffix}"
+
+    def _delta_paths(self, key, name):
+        """Delta files of a frame, in append order."""
+        suffix = 'parquet' if self.cache_format == 'parquet' else 'arrow'
+        return sorted(self.entry_path(key).glob(f"{name}.delta-*.{suffix}"))
+
+    def delta_count(self, key, name):
+        """Number of delta files appended to a frame."""
+        return len(self._delta_paths(key, name))
+
+    def latest(self, sample_frac):
+        """
+        Find the newest complete entry for a sample fraction.
+
+        Args:
+            sample_frac: Sample fraction the entry was built with
+
+        Returns:
+            tuple: (key, manifest), or (None, None) if there is no entry
+        """
+        best_key, best_manifest, best_mtime = None, None, -1
+        if not self.cache_dir.exists():
+            return None, None
+        for entry in self.cache_dir.iterdir():
+            manifest_path = entry / 'manifest.json'
+            if not entry.is_dir() or not manifest_path.exists():
+                continue
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if (manifest.get('schema_version') != self.schema_version or
+                    manifest.get('sample_frac') != sample_frac):
+                continue
+            mtime = manifest_path.stat().st_mtime_ns
+            if mtime > best_mtime:
+                best_key, best_manifest, best_mtime = entry.name, manifest, mtime
+        return best_key, best_manifest
+
+    def has(self, key, names):
+        """Check whether an entry holds every named frame."""
+        return ((self.entry_path(key) / 'manifest.json').exists() and
+                all(self._frame_path(key, name).exists() for name in names))
+
+    def read(self, key, name):
+        """
+        Read the base file of one cached frame (see read_deltas).
+
+        Args:
+            key: Content key
+            name: Frame name (e.g. 'biometric', 'integrated')
+
+        Returns:
+            pd.DataFrame
+        """
+        return self._read_file(self._frame_path(key, name))
+
+    def read_deltas(self, key, name):
+        """
+        Read the rows appended to a cached frame since its base was written.
+
+        Args:
+            key: Content key
+            name: Frame name
+
+        Returns:
+            list: DataFrames in append order (empty if nothing was appended)
+        """
+        return [self._read_file(path) for path in self._delta_paths(key, name)]
+
+    def _read_file(self, path):
+        """
+        Read one Parquet or Arrow IPC file.
+
+        Arrow IPC columns come back as zero-copy, read-only views over the
+        memory-mapped file (columns holding nulls are copied), so their
+        pages stay in the OS page cache. The frames keep the mapping alive.
+        """
+        if self.cache_format == 'parquet':
+            return pd.read_parquet(path)
+
+        import pyarrow as pa
+        source = pa.memory_map(str(path), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(split_blocks=True)
+
+    def write(self, key, frames, manifest=None):
+        """
+        Write frames into an entry.
+
+        Each file is written under a temporary name and renamed into place,
+        and the manifest is written last, so readers never see a partially
+        written entry. Writing a manifest also prunes stale entries built
+        from the same sample fraction.
+
+        Args:
+            key: Content key
+            frames: dict of name -> DataFrame
+            manifest: Manifest from build_manifest (omit when adding frames
+                      to an existing entry)
+        """
+        entry = self.entry_path(key)
+        entry.mkdir(parents=True, exist_ok=True)
+
+        for name, df in frames.items():
+            for path in self._delta_paths(key, name):
+                path.unlink()
+            self._write_file(self._frame_path(key, name), df)
+
+        if manifest is not None:
+            self._write_manifest(key, manifest)
+
+    def append(self, previous_key, key, names, deltas, manifest):
+        """
+        Create an entry from a previous one plus newly appended rows.
+
+        The previous entry's files for the named frames are hard-linked
+        (copied where links are unsupported) rather than rewritten, and each
+        delta frame is added as a new delta file, so the cost is proportional
+        to the new rows. The manifest is written last and prunes the
+        previous entry.
+
+        Delta files are named after their position in the previous entry and
+        the new key, so writing the same append twice replaces the file
+        rather than adding a duplicate. Call under lock() when several
+        processes may append the same rows.
+
+        Args:
+            previous_key: Key of the entry the deltas extend
+            key: Content key of the new entry
+            names: Frames carried over from the previous entry
+            deltas: dict of name -> DataFrame of appended rows
+            manifest: Manifest of the new entry
+
+        Returns:
+            bool: False if the entry was already complete (nothing written)
+        """
+        if self.has(key, names):
+            return False
+        sequences = {name: self.delta_count(previous_key, name) + 1 for name in deltas}
+
+        entry = self.entry_path(key)
+        entry.mkdir(parents=True, exist_ok=True)
+
+        for name in names:
+            for source in [self._frame_path(previous_key, name)] + \
+                    self._delta_paths(previous_key, name):
+                target = entry / source.name
+                if target.exists():
+                    target.unlink()
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+
+        for name, df in deltas.items():
+            path = self._frame_path(key, name)
+            self._write_file(path.with_name(
+                f"{name}.delta-{sequences[name]:04d}-{key}{path.suffix}"), df)
+
+        self._write_manifest(key, manifest)
+        return True
+
+    def _write_file(self, path, df):
+        """Write a frame under a temporary name and rename it into place."""
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{time.time_ns()}.tmp")
+        try:
+            if self.cache_format == 'parquet':
+                df.to_parquet(tmp, compression='snappy')
+            else:
+                import pyarrow as pa
+                table = pa.Table.from_pandas(df)
+                with pa.OSFile(str(tmp), 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def _write_manifest(self, key, manifest):
+        """Write an entry's manifest last, then prune stale entries."""
+        entry = self.entry_path(key)
+        tmp = entry / f".manifest.{os.getpid()}.{time.time_ns()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, entry / 'manifest.json')
+        self.prune(key, manifest.get('sample_frac'))
+
+    def prune(self, keep_key, sample_frac):
+        """Remove entries for the same sample fraction other than keep_key."""
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.name == keep_key:
+                continue
+            manifest_path = entry / 'manifest.json'
+            if not manifest_path.exists():
+                continue
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('sample_frac') == sample_frac:
+                shutil.rmtree(entry, ignore_errors=True)
@@ -0,0 +1,209 @@
+"""
+Shared-Memory Data Plane for Multi-Worker Serving
+Publishes the pipeline's DataFrames as uncompressed Arrow IPC files (in
+/dev/shm where available) and attaches to them as zero-copy, read-only
+NumPy/pandas views, so every worker process maps the same physical pages.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def default_shared_root():
+    """Return /dev/shm/aadhar_frames, or a temp directory without /dev/shm."""
+    shm = Path('/dev/shm')
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm / 'aadhar_frames'
+    return Path(tempfile.gettempdir()) / 'aadhar_frames'
+
+
+def private_key():
+    """Return an entry key private to this process (for frames with no data version)."""
+    return f"pid-{os.getpid()}-{time.time_ns()}"
+
+
+def _private_owner(name):
+    """Process id encoded in a private entry key, or None for a data version."""
+    parts = name.split('-')
+    if len(parts) != 3 or parts[0] != 'pid' or not parts[1].isdigit():
+        return None
+    return int(parts[1])
+
+
+def _process_alive(pid):
+    """Whether a process with the given id is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Running, but owned by another user
+        return True
+    return True
+
+
+def _to_arrow_table(df):
+    """
+    Convert a frame to a single-chunk Arrow table.
+
+    String (object) columns are dictionary-encoded so that their codes can be
+    shared as well; they come back as pandas categoricals on attach.
+    """
+    import pyarrow as pa
+
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object:
+            series = series.astype('category')
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            dictionary = pa.array(series.cat.categories.to_numpy())
+            if pa.types.is_null(dictionary.type):
+                # No categories (e.g. an empty frame): store an empty string dictionary
+                dictionary = pa.array([], type=pa.string())
+            # Missing values keep their -1 code in the indices buffer
+            indices = pa.array(codes, mask=codes < 0)
+            columns[col] = pa.DictionaryArray.from_arrays(indices, dictionary,
+                                                          ordered=series.cat.ordered)
+        elif isinstance(series.dtype, np.dtype):
+            # Keep NaN/NaT as values rather than nulls so attach stays zero-copy
+            columns[col] = pa.array(series.to_numpy(), from_pandas=False)
+        else:
+            columns[col] = pa.Array.from_pandas(series)
+    return pa.table(columns).combine_chunks()
+
+
+def _dictionary_to_categorical(array):
+    """Wrap an Arrow dictionary array as a Categorical over its index buffer."""
+    index_dtype = np.dtype(array.indices.type.to_pandas_dtype())
+    codes = np.frombuffer(array.indices.buffers()[1], dtype=index_dtype,
+                          count=len(array), offset=array.offset * index_dtype.itemsize)
+    if array.null_count:
+        codes = np.where(array.is_null().to_numpy(zero_copy_only=False), -1, codes)
+    categories = pd.Index(array.dictionary.to_pandas())
+    return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories,
+                                                                      array.type.ordered))
+
+
+class SharedFrameStore:
+    """
+    Directory of Arrow IPC files, one sub-folder per data version, under a
+    sub-root of the deployment that writes them.
+
+    The publishing process writes each frame once; every process (including
+    the publisher) then attaches to the memory-mapped files. Numeric and
+    datetime columns and categorical codes are views over the mapping, so
+    their pages live in the OS page cache rather than in any worker's heap.
+    """
+
+    def __init__(self, key, root=None, deployment='default'):
+        """
+        Initialize the store.
+
+        Args:
+            key: Data version (e.g. the pipeline cache key) naming the entry
+            root: Parent directory; defaults to default_shared_root()
+            deployment: Name of the sub-root holding this deployment's
+                        entries, so instances serving other data sets from
+                        the same root are left alone by prune()
+        """
+        root = Path(root) if root is not None else default_shared_root()
+        self.root = root / str(deployment)
+        self.key = str(key)
+        self.directory = self.root / self.key
+        self._mappings = {}
+
+    def path(self, name):
+        """Return the Arrow file of a frame."""
+        return self.directory / f"{name}.arrow"
+
+    def has(self, name):
+        """Check whether a frame has been published."""
+        return self.path(name).exists()
+
+    def publish(self, name, df):
+        """
+        Write a frame into the store (atomically, via a temporary file).
+
+        Args:
+            name: Frame name (e.g. 'biometric')
+            df: DataFrame to publish
+        """
+        import pyarrow as pa
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        table = _to_arrow_table(df)
+        path = self.path(name)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{time.time_ns()}.tmp")
+        try:
+            with pa.OSFile(str(tmp), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def attach(self, name):
+        """
+        Map a published frame as zero-copy, read-only views.
+
+        Args:
+            name: Frame name
+
+        Returns:
+            pd.DataFrame backed by the shared mapping
+        """
+        import pyarrow as pa
+
+        source = pa.memory_map(str(self.path(name)), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        self._mappings[name] = source
+
+        dictionary_cols = [field.name for field in table.schema
+                           if pa.types.is_dictionary(field.type)]
+        plain = table.drop(dictionary_cols).to_pandas(split_blocks=True)
+
+        data = {}
+        for field in table.schema:
+            if field.name in dictionary_cols:
+                column = table.column(field.name)
+                # An empty frame is written without record batches
+                array = column.chunk(0) if column.num_chunks else column.combine_chunks()
+                data[field.name] = _dictionary_to_categorical(array)
+            else:
+                data[field.name] = plain[field.name]
+        return pd.DataFrame(data, copy=False)
+
+    def prune(self):
+        """
+        Remove this deployment's entries that are no longer needed.
+
+        Only the deployment's sub-root is scanned. Private entries (see
+        private_key()) of other running processes are never removed; this
+        process's earlier private entries and those of exited processes
+        are. Entries for other data versions are removed only by a store
+        keyed on a data version. Processes still attached to a removed
+        entry keep their mapping; the pages are released once the last of
+        them unmaps.
+        """
+        if not self.root.exists():
+            return
+        versioned = _private_owner(self.key) is None
+        for entry in self.root.iterdir():
+            if not entry.is_dir() or entry.name == self.key:
+                continue
+            owner = _private_owner(entry.name)
+            if owner is None:
+                stale = versioned
+            else:
+                stale = owner == os.getpid() or not _process_alive(owner)
+            if stale:
+                shutil.rmtree(entry, ignore_errors=True)
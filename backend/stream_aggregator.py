@@ -0,0 +1,250 @@
+"""
+Streaming Aggregates for the Integrated Aadhar Data Pipeline
+Folds enriched CSV chunks into additive partial aggregates at the
+(state, district, date) grain, so the integrated view, the national KPIs
+and the dashboard cube are built without ever holding the raw rows.
+"""
+
+import pandas as pd
+
+from data_cube import DashboardCube
+from distinct_index import DistinctCountIndex
+from latency_sketch import SKETCH_DIMENSIONS, LatencySketchIndex
+
+
+CELL_KEYS = ['state', 'district', 'date']
+
+# Columns summed per dataset: the derived total first, then the age counts
+STREAM_SUM_COLUMNS = {
+    'biometric': ['total_transactions', 'bio_age_5_17', 'bio_age_17_'],
+    'demographic': ['total_demographic', 'demo_age_5_17', 'demo_age_17_'],
+    'enrolment': ['total_enrolment', 'age_0_5', 'age_5_17', 'age_18_greater'],
+}
+
+# Integrated column names of the summed columns (see _aggregate_integrated)
+INTEGRATED_NAMES = {
+    'biometric': ['bio_transactions', 'bio_youth', 'bio_adult'],
+    'demographic': ['demo_total', 'demo_youth', 'demo_adult'],
+    'enrolment': ['enrol_total', 'enrol_infant', 'enrol_youth', 'enrol_adult'],
+}
+
+
+class _PartialTable:
+    """
+    Additive partial aggregates of one grain. Per-chunk partials are
+    re-aggregated into one compacted table whenever they outgrow it, so the
+    pending partials stay within a chunk's worth of rows (or the compacted
+    table's size) and the total work stays linear.
+    """
+
+    def __init__(self, keys, agg, compact_rows):
+        self.keys = keys
+        self.agg = agg
+        self.compact_rows = compact_rows
+        self.compacted = None
+        self.pending = []
+        self.pending_rows = 0
+
+    def add(self, part):
+        """Queue a partial aggregate, compacting when enough have piled up."""
+        self.pending.append(part)
+        self.pending_rows += len(part)
+        compacted_rows = 0 if self.compacted is None else len(self.compacted)
+        if self.pending_rows > max(self.compact_rows, compacted_rows):
+            self.compact()
+
+    def compact(self):
+        """Merge the pending partials into the compacted table."""
+        if not self.pending:
+            return
+        parts = self.pending if self.compacted is None else [self.compacted] + self.pending
+        df = pd.concat(parts, ignore_index=True)
+        # Chunks carry their own categories; re-encode the mixed strings
+        for col in ('state', 'district'):
+            if col in df and df[col].dtype == object:
+                df[col] = df[col].astype('category')
+        self.compacted = df.groupby(self.keys, observed=True, sort=True).agg(self.agg).reset_index()
+        self.pending = []
+        self.pending_rows = 0
+
+    def result(self):
+        """The fully merged table (sorted by the keys)."""
+        self.compact()
+        return self.compacted
+
+
+class StreamingAggregator:
+    """
+    Running aggregates of enriched chunks from the three datasets.
+
+    Per chunk it records, per (state, district, date) cell, the summed
+    counts, row count and zone (plus successes for demographic rows); the
+    demographic (date, modality) and (date, error code) counts behind the
+    cube rollups; the latency sketch rows (count and total per cell,
+    modality and log bucket, see LatencySketchIndex) behind the latency
+    charts, the cell medians and the KPI quantiles; national totals; and the
+    DistinctCountIndex of states, districts and pincodes. Every aggregate is
+    additive, so the result does not depend on how the rows were chunked.
+
+    Raw rows are held one chunk at a time, so their memory is bounded by
+    the chunk size. The aggregates are not: they grow with the number of
+    distinct cells, and the latency sketches with cells x modalities x
+    occupied buckets (at most a few hundred buckets per cell, whatever its
+    number of requests). They never grow with the raw columns.
+    """
+
+    def __init__(self, compact_rows=200_000):
+        """
+        Initialize empty aggregates.
+
+        Args:
+            compact_rows: Pending partial rows per table before compaction
+        """
+        self.compact_rows = compact_rows
+        self.row_counts = {dataset: 0 for dataset in STREAM_SUM_COLUMNS}
+        self.totals = {dataset: dict.fromkeys(cols, 0)
+                       for dataset, cols in STREAM_SUM_COLUMNS.items()}
+        self.distinct = DistinctCountIndex()
+        self.successes = 0
+
+        self._cells = {}
+        for dataset, cols in STREAM_SUM_COLUMNS.items():
+            extra = ['successes'] if dataset == 'demographic' else []
+            agg = {col: 'sum' for col in cols + extra + ['rows']}
+            self._cells[dataset] = _PartialTable(CELL_KEYS, {**agg, 'zone': 'first'}, compact_rows)
+        self._latency = _PartialTable(SKETCH_DIMENSIONS + ['bucket'],
+                                      {'count': 'sum', 'total': 'sum'}, compact_rows)
+        self._modality = _PartialTable(['date', 'auth_modality'],
+                                       {'volume': 'sum', 'successes': 'sum'}, compact_rows)
+        self._errors = _PartialTable(['date', 'error_code'], {'count': 'sum'}, compact_rows)
+
+    def add(self, dataset, chunk):
+        """
+        Fold one enriched chunk into the aggregates. The chunk is not kept.
+
+        Args:
+            dataset: 'biometric', 'demographic' or 'enrolment'
+            chunk: Cleaned rows (see _prepare_shard)
+        """
+        cols = STREAM_SUM_COLUMNS[dataset]
+        self.row_counts[dataset] += len(chunk)
+        for col in cols:
+            self.totals[dataset][col] += int(chunk[col].sum())
+        self.distinct.add(dataset, chunk)
+
+        values = chunk[CELL_KEYS + cols + ['zone']]
+        extra = []
+        if dataset == 'demographic':
+            is_success = (chunk['auth_status'] == 'Success').to_numpy()
+            self.successes += int(is_success.sum())
+            values = values.assign(successes=is_success)
+            extra = ['successes']
+            self._latency.add(LatencySketchIndex.build(chunk).table)
+            self._modality.add(DashboardCube._modality_rollup(chunk, is_success))
+            self._errors.add(DashboardCube._error_rollup(chunk, is_success))
+
+        agg = {col: (col, 'sum') for col in cols + extra}
+        self._cells[dataset].add(values.groupby(CELL_KEYS, observed=True).agg(
+            **agg, rows=('zone', 'size'), zone=('zone', 'first')).reset_index())
+
+    def cells(self, dataset):
+        """
+        Aggregates of a dataset per (state, district, date).
+
+        Returns:
+            pd.DataFrame with the summed columns, rows (row count), zone and,
+            for demographic, successes
+        """
+        return self._cells[dataset].result()
+
+    def latency_sketches(self):
+        """LatencySketchIndex of the demographic latencies."""
+        return LatencySketchIndex(self._latency.result())
+
+    def integrated_aggregates(self, latency_sketches=None):
+        """
+        Per-dataset state-district-date aggregates in the layout that
+        _merge_integrated expects; the median latency is the sketch median,
+        as in the loaded integrated view.
+
+        Args:
+            latency_sketches: LatencySketchIndex from latency_sketches()
+                              (built here if None)
+
+        Returns:
+            tuple: (bio_agg, demo_agg, enrol_agg)
+        """
+        bio = self.cells('biometric')
+        bio_agg = bio[CELL_KEYS + STREAM_SUM_COLUMNS['biometric'] + ['zone']]
+        bio_agg.columns = CELL_KEYS + INTEGRATED_NAMES['biometric'] + ['zone']
+
+        demo = self.cells('demographic')
+        demo_agg = demo[CELL_KEYS + STREAM_SUM_COLUMNS['demographic']].copy()
+        demo_agg.columns = CELL_KEYS + INTEGRATED_NAMES['demographic']
+        demo_agg['auth_success_rate'] = demo['successes'] / demo['rows']
+        demo_agg['auth_success_rate'] *= 100
+        medians = (latency_sketches or self.latency_sketches()).medians(CELL_KEYS)
+        demo_agg['median_latency_ms'] = medians.reindex(
+            pd.MultiIndex.from_frame(demo[CELL_KEYS])).to_numpy()
+
+        enrol = self.cells('enrolment')
+        enrol_agg = enrol[CELL_KEYS + STREAM_SUM_COLUMNS['enrolment']]
+        enrol_agg.columns = CELL_KEYS + INTEGRATED_NAMES['enrolment']
+
+        return bio_agg, demo_agg, enrol_agg
+
+    def national_kpis(self, latency_sketches=None):
+        """
+        National KPIs, as get_national_kpis() computes them from the raw
+        frames; the latency quantiles come from the same merged sketches.
+
+        Args:
+            latency_sketches: LatencySketchIndex from latency_sketches()
+                              (built here if None)
+
+        Returns:
+            dict: National-level metrics
+        """
+        bio, enrol = self.totals['biometric'], self.totals['enrolment']
+        records = self.row_counts['demographic']
+        if records:
+            sketches = latency_sketches or self.latency_sketches()
+            median, p95, p99 = sketches.quantiles([0.5, 0.95, 0.99])
+        else:
+            median = p95 = p99 = 0.0
+
+        return {
+            'total_biometric_transactions': bio['total_transactions'],
+            'active_states_biometric': self.distinct.count('biometric', 'state'),
+            'active_districts_biometric': self.distinct.count('biometric', 'district'),
+            'total_demographic_records': records,
+            'national_auth_success_rate': self.successes / records * 100 if records else 0.0,
+            'median_latency_ms': median,
+            'p95_latency_ms': p95,
+            'p99_latency_ms': p99,
+            'total_enrolments': enrol['total_enrolment'],
+            'infant_enrolments': enrol['age_0_5'],
+            'active_states_enrolment': self.distinct.count('enrolment', 'state'),
+            'total_data_points': sum(self.row_counts.values()),
+        }
+
+    def build_cube(self, integrated_df=None, latency_sketches=None, **kwargs):
+        """
+        Build the dashboard cube from the aggregates.
+
+        Args:
+            integrated_df: Integrated view built from integrated_aggregates()
+            latency_sketches: LatencySketchIndex from latency_sketches()
+                              (built here if None)
+            **kwargs: Passed to DashboardCube.from_aggregates
+
+        Returns:
+            DashboardCube
+        """
+        return DashboardCube.from_aggregates(
+            {dataset: self.cells(dataset) for dataset in STREAM_SUM_COLUMNS},
+            integrated_df=integrated_df,
+            modality=self._modality.result(),
+            errors=self._errors.result(),
+            latency=latency_sketches or self.latency_sketches(),
+            **kwargs)
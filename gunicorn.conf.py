@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for the Aadhar Dashboard.
+The app factory runs once in the master (preload) so data is loaded and
+aggregated before forking and shared copy-on-write by the workers.
+"""
+
+import os
+
+wsgi_app = "app:create_app()"
+preload_app = True
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8050)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = 120
+
+
+def post_fork(server, worker):
+    """
+    Start the worker's refresh timer (see app.start_refresh_timer): threads
+    do not survive the fork, so each worker checks for new CSV shards itself
+    every AADHAR_REFRESH_INTERVAL seconds and updates its own data.
+    """
+    import app
+    app.start_refresh_timer()
@@ -4,13 +4,15 @@ Uses Waitress to serve the Dash/Flask application securely on the local network.
 """
 
 from waitress import serve
-from app import server, load_data_on_startup
+from app import create_app, start_refresh_timer
 import os
 
 if __name__ == "__main__":
     # 1. Load data (10% sample by default, change to None for full data)
     print("Initializing data pipeline...")
-    load_data_on_startup(sample_frac=0.1)
+    server = create_app(sample_frac=0.1)
+    # Ingest new CSV shards every AADHAR_REFRESH_INTERVAL seconds (if set)
+    start_refresh_timer()
     
     # 2. Start Waitress Server
     port = int(os.environ.get("PORT", 8050))
@@ -0,0 +1,98 @@
+"""
+Shared pytest setup: makes the backend and analytics modules importable and
+writes synthetic CSV shards in the raw Aadhar layout.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+for folder in ('backend', 'analytics'):
+    sys.path.insert(0, str(ROOT / folder))
+
+
+DATASET_FOLDERS = {
+    'biometric': 'api_data_aadhar_biometric_gov_analysis',
+    'demographic': 'api_data_aadhar_demographic gov analysis',
+    'enrolment': 'api_data_aadhar_enrolment gov analysis',
+}
+
+COUNT_COLUMNS = {
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_'],
+    'enrolment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+}
+
+STATES = {
+    'Karnataka': ['Bidar', 'Mysuru', 'Udupi'],
+    'Madhya Pradesh': ['Shajapur', 'Indore'],
+    'Assam': ['Kamrup', 'Dhubri'],
+    'Punjab': ['Amritsar'],
+    'Gujarat': ['Surat', 'Rajkot'],
+}
+
+
+@pytest.fixture
+def write_shard(tmp_path):
+    """
+    Write a synthetic CSV shard in the raw Aadhar layout under tmp_path.
+
+    Returns a function (dataset, name, start, days, rows, seed) -> path;
+    the shard is named api_data_aadhar_<dataset>_<name>.csv and spans days
+    dates from start.
+    """
+    def write(dataset, name, start='2025-03-01', days=10, rows=400, seed=0):
+        rng = np.random.default_rng(seed)
+        dates = pd.date_range(start, periods=days, freq='D')
+        pairs = [(state, district) for state, districts in STATES.items()
+                 for district in districts]
+        picks = rng.integers(0, len(pairs), rows)
+        date_strings = dates[rng.integers(0, days, rows)].strftime('%d-%m-%Y')
+        if dataset == 'enrolment':
+            # Enrolment shards mix DD-MM-YYYY and YYYY-MM-DD dates
+            iso = dates[rng.integers(0, days, rows)].strftime('%Y-%m-%d')
+            date_strings = np.where(rng.random(rows) < 0.3, iso, date_strings)
+        df = pd.DataFrame({
+            'date': date_strings,
+            'state': [pairs[i][0] for i in picks],
+            'district': [pairs[i][1] for i in picks],
+            'pincode': 560000 + picks * 10 + rng.integers(0, 5, rows),
+        })
+        for col in COUNT_COLUMNS[dataset]:
+            df[col] = rng.integers(0, 40, rows)
+
+        folder = tmp_path / DATASET_FOLDERS[dataset]
+        folder.mkdir(exist_ok=True)
+        path = folder / f"api_data_aadhar_{dataset}_{name}.csv"
+        df.to_csv(path, index=False)
+        return path
+
+    return write
+
+
+@pytest.fixture
+def write_dataset(write_shard):
+    """Write one shard of every dataset (see write_shard) and return tmp_path."""
+    def write(name='0', seed=0, **kwargs):
+        paths = [write_shard(dataset, name, seed=seed + offset, **kwargs)
+                 for offset, dataset in enumerate(DATASET_FOLDERS)]
+        return paths[0].parent.parent
+
+    return write
+
+
+@pytest.fixture
+def canonical():
+    """Function turning a frame into plain string columns sorted by every column."""
+    def convert(df):
+        df = df.copy()
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype) or df[col].dtype == object:
+                df[col] = df[col].astype(str)
+        return df.sort_values(list(df.columns), kind='stable').reset_index(drop=True)
+
+    return convert
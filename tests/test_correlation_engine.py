@@ -0,0 +1,265 @@
+"""CorrelationEngine features and correlations match pandas references."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sklearn')
+
+from benchmark_state_features import legacy_state_level_features, make_frames
+from correlation_engine import CorrelationEngine
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return make_frames(demographic_rows=12_000, seed=7)
+
+
+@pytest.mark.parametrize('layout', ['object', 'category'])
+def test_state_features_match_legacy_builder(frames, layout):
+    bio, demo, enrol = frames
+    if layout == 'category':
+        demo = demo.astype({'auth_modality': 'category', 'auth_status': 'category'})
+    features = CorrelationEngine(bio, demo, enrol).create_state_level_features()
+    legacy = legacy_state_level_features(bio, demo, enrol)
+    assert list(features.columns) == list(legacy.columns)
+    pd.testing.assert_frame_equal(features, legacy, check_dtype=False, rtol=1e-9)
+
+
+def test_state_features_with_missing_dates_and_states(frames):
+    bio, demo, enrol = (df.copy() for df in frames)
+    for df in (bio, demo, enrol):
+        df.loc[df.index[::97], 'date'] = pd.NaT
+    enrol.loc[enrol.index[::89], 'state'] = np.nan
+    features = CorrelationEngine(bio, demo, enrol).create_state_level_features()
+    legacy = legacy_state_level_features(bio, demo, enrol)
+    pd.testing.assert_frame_equal(features, legacy, check_dtype=False, rtol=1e-9)
+
+
+def _counting_builds(engine, monkeypatch):
+    """Count calls to the engine's feature builder."""
+    calls = []
+    build = engine._build_state_level_features
+
+    def counted():
+        calls.append(1)
+        return build()
+
+    monkeypatch.setattr(engine, '_build_state_level_features', counted)
+    return calls
+
+
+def test_features_and_matrices_are_memoized(frames, monkeypatch):
+    engine = CorrelationEngine(*frames, data_version='v1')
+    calls = _counting_builds(engine, monkeypatch)
+
+    features = engine.create_state_level_features()
+    features.iloc[:, 0] = -1.0
+    pearson = engine.calculate_correlation_matrix('pearson')
+    engine.calculate_correlation_matrices(('pearson', 'spearman'))
+
+    assert len(calls) == 1
+    assert not (engine.create_state_level_features().iloc[:, 0] == -1.0).all()
+    assert engine._correlation_matrices['pearson'] is not pearson
+    pd.testing.assert_frame_equal(engine.calculate_correlation_matrix('pearson'), pearson)
+    assert len(calls) == 1
+
+
+def test_invalidate_recomputes_after_in_place_change(frames, monkeypatch):
+    bio, demo, enrol = (df.copy() for df in frames)
+    engine = CorrelationEngine(bio, demo, enrol, data_version='v1')
+    calls = _counting_builds(engine, monkeypatch)
+    before = engine.calculate_correlation_matrix('spearman')
+
+    # Same object, shape and columns: only invalidate() can notice this
+    bio['bio_age_5_17'] = bio['bio_age_5_17'].to_numpy()[::-1]
+    pd.testing.assert_frame_equal(engine.calculate_correlation_matrix('spearman'), before)
+    assert len(calls) == 1
+
+    engine.invalidate()
+    after = engine.calculate_correlation_matrix('spearman')
+    assert len(calls) == 2
+    expected = engine.create_state_level_features().corr(method='spearman')
+    pd.testing.assert_frame_equal(after, expected, rtol=1e-9)
+    assert not after.equals(before)
+
+
+@pytest.mark.parametrize('change', ['data_version', 'invalidate', 'replace_frame'])
+def test_new_data_version_or_frame_recomputes(frames, monkeypatch, change):
+    engine = CorrelationEngine(*frames, data_version='v1')
+    calls = _counting_builds(engine, monkeypatch)
+    engine.calculate_correlation_matrix('pearson')
+    cached = engine._correlation_matrices['pearson']
+
+    if change == 'data_version':
+        engine.data_version = 'v2'
+    elif change == 'invalidate':
+        engine.invalidate(data_version='v2')
+    else:
+        engine.enrolment_df = frames[2].copy()
+    engine.calculate_correlation_matrix('pearson')
+
+    assert len(calls) == 2
+    assert engine._correlation_matrices['pearson'] is not cached
+
+
+def _brute_force_pairs(corr):
+    """Every upper-triangle pair of a correlation matrix, strongest first."""
+    pairs = [(corr.index[i], corr.columns[j], corr.iat[i, j])
+             for i in range(len(corr)) for j in range(i + 1, len(corr))
+             if not np.isnan(corr.iat[i, j])]
+    return sorted(pairs, key=lambda pair: -abs(pair[2]))
+
+
+def _as_pairs(df):
+    return [(a, b, value) for a, b, value in
+            zip(df['Variable 1'], df['Variable 2'], df['Correlation'])]
+
+
+def _assert_same_pairs(actual, expected):
+    assert {(a, b) for a, b, _ in actual} == {(a, b) for a, b, _ in expected}
+    expected = {(a, b): value for a, b, value in expected}
+    for a, b, value in actual:
+        assert value == pytest.approx(expected[a, b], rel=1e-9, abs=1e-12)
+
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman', 'kendall'])
+@pytest.mark.parametrize('block_size', [None, 3])
+def test_top_k_pairs_match_brute_force(frames, method, block_size):
+    engine = CorrelationEngine(*frames)
+    corr = engine.create_state_level_features().corr(method=method)
+    expected = _brute_force_pairs(corr)
+
+    for k in (1, 5, len(expected) + 3):
+        top = engine.top_k_pairs(k=k, method=method, block_size=block_size)
+        assert len(top) == min(k, len(expected))
+        assert top['Abs_Correlation'].is_monotonic_decreasing
+        # Ties at the cut-off may pick either pair; compare strengths there
+        cutoff = abs(expected[min(k, len(expected)) - 1][2])
+        _assert_same_pairs([pair for pair in _as_pairs(top) if abs(pair[2]) > cutoff + 1e-12],
+                           [pair for pair in expected[:k] if abs(pair[2]) > cutoff + 1e-12])
+        np.testing.assert_allclose(top['Abs_Correlation'],
+                                   [abs(pair[2]) for pair in expected[:k]], rtol=1e-9)
+
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman', 'kendall'])
+@pytest.mark.parametrize('threshold', [0.3, 0.7])
+def test_strong_correlations_match_brute_force(frames, method, threshold):
+    engine = CorrelationEngine(*frames)
+    corr = engine.create_state_level_features().corr(method=method)
+    expected = [pair for pair in _brute_force_pairs(corr) if abs(pair[2]) >= threshold]
+
+    dense = engine.identify_strong_correlations(threshold, method=method)
+    blockwise = engine.identify_strong_correlations(threshold, method=method, block_size=3)
+    for strong in (dense, blockwise):
+        _assert_same_pairs(_as_pairs(strong), expected)
+        assert strong['Abs_Correlation'].is_monotonic_decreasing
+        np.testing.assert_array_equal(
+            strong['Strength'],
+            np.where(strong['Correlation'] > 0, 'Strong Positive', 'Strong Negative'))
+
+
+def _keyed_by(frames, grain):
+    """Frames whose 'state' column holds the unit key at the given grain."""
+    keyed = []
+    for df in frames:
+        df = df.copy()
+        if grain == 'district':
+            df['state'] = df['state'].astype(str) + '|' + df['district'].astype(str)
+        else:
+            df['state'] = df['pincode']
+        keyed.append(df)
+    return keyed
+
+
+@pytest.mark.parametrize('grain', ['district', 'pincode'])
+def test_grain_features_match_legacy_builder_per_unit(frames, grain):
+    # Fold pincodes into a few hundred so the per-group legacy builder stays quick
+    frames = [df.assign(pincode=110000 + df['pincode'] % 300) for df in frames]
+    features = CorrelationEngine(*frames, grain=grain).create_state_level_features()
+    legacy = legacy_state_level_features(*_keyed_by(frames, grain))
+
+    if grain == 'district':
+        assert features.index.names == ['state', 'district']
+        features.index = ['|'.join(unit) for unit in features.index]
+    pd.testing.assert_frame_equal(features, legacy, check_dtype=False, check_index_type=False,
+                                  check_names=False, rtol=1e-9)
+
+
+def test_grain_is_part_of_the_cache_key(frames):
+    engine = CorrelationEngine(*frames)
+    n_states = len(engine.create_state_level_features())
+    engine.grain = 'district'
+    assert len(engine.create_state_level_features()) > n_states
+
+
+def test_blockwise_pairs_over_wide_features(frames):
+    engine = CorrelationEngine(*frames, grain='district')
+    # Units as variables: a wide matrix whose dense matrix is never needed
+    wide = engine.create_state_level_features().T.reset_index(drop=True)
+    wide.columns = [f'unit {i}' for i in range(wide.shape[1])]
+    corr = wide.corr().to_numpy()
+    rows, cols = np.triu_indices(len(corr), k=1)
+    values = corr[rows, cols]
+    keep = ~np.isnan(values)
+    rows, cols, values = rows[keep], cols[keep], values[keep]
+
+    strong = engine.identify_strong_correlations(0.999, features=wide, block_size=64)
+    expected = np.abs(values) >= 0.999
+    _assert_same_pairs(_as_pairs(strong),
+                       [(wide.columns[i], wide.columns[j], value) for i, j, value
+                        in zip(rows[expected], cols[expected], values[expected])])
+    top = engine.top_k_pairs(k=25, features=wide, block_size=64)
+    np.testing.assert_allclose(top['Abs_Correlation'], np.sort(np.abs(values))[::-1][:25],
+                               rtol=1e-9)
+
+
+@pytest.mark.parametrize('grain', ['state', 'district', 'pincode'])
+def test_correlation_methods_match_dataframe_corr(frames, grain):
+    engine = CorrelationEngine(*frames, grain=grain)
+    features = engine.create_state_level_features()
+    matrices = engine.calculate_correlation_matrices()
+
+    assert set(matrices) == {'pearson', 'spearman', 'kendall'}
+    for method, corr in matrices.items():
+        expected = features.corr(method=method)
+        if method == 'kendall':
+            # Same scipy tau-b per pair as pandas: equal to the last bit
+            pd.testing.assert_frame_equal(corr, expected, check_exact=True)
+        else:
+            pd.testing.assert_frame_equal(corr, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_parallel_kendall_matches_serial(frames, monkeypatch):
+    import correlation_engine
+
+    monkeypatch.setattr(correlation_engine, 'KENDALL_PARALLEL_MIN_WORK', 0)
+    features = CorrelationEngine(*frames, grain='district').create_state_level_features()
+    parallel = CorrelationEngine(*frames, grain='district', max_workers=2)
+    pd.testing.assert_frame_equal(parallel.calculate_correlation_matrix('kendall'),
+                                  features.corr(method='kendall'), check_exact=True)
+
+
+@pytest.mark.parametrize('volume, expected', [
+    (dict(correlation=0.6, ci_lower=0.3, ci_upper=0.8, significant=True), 'Significant positive'),
+    (dict(correlation=0.05, ci_lower=-0.2, ci_upper=0.25, significant=False), 'No significant'),
+    # Too wide to rule out a real effect: no claim either way
+    (dict(correlation=0.2, ci_lower=-0.1, ci_upper=0.5, significant=False), None),
+    (dict(correlation=0, ci_lower=np.nan, ci_upper=np.nan, significant=False), None),
+])
+def test_volume_insight_needs_a_conclusive_interval(frames, monkeypatch, volume, expected):
+    engine = CorrelationEngine(*frames)
+    unrelated = dict(correlation=0.0, ci_lower=-0.5, ci_upper=0.5, p_value=0.9, significant=False)
+    results = {'correlation_enrol_bio_volume': dict(volume, p_value=0.01),
+               'correlation_enrol_growth_bio_growth': unrelated,
+               'correlation_infant_enrol_youth_bio': unrelated}
+    monkeypatch.setattr(engine, '_significance_analysis', lambda pairs: (
+        {name: result['correlation'] for name, result in results.items()}, results))
+
+    insights = engine.analyze_enrolment_biometric_relationship()['insights']
+    volume_insights = [text for text in insights if 'enrolment and biometric volumes' in text]
+    if expected is None:
+        assert volume_insights == []
+    else:
+        assert len(volume_insights) == 1 and volume_insights[0].startswith(expected)
+
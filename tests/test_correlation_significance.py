@@ -0,0 +1,63 @@
+"""correlation_significance: reproducibility, p-value floor and estimates."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import correlation_significance as significance_module
+from correlation_significance import correlation_significance
+
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=60)
+    return pd.DataFrame({
+        'x': x,
+        'linked': x + rng.normal(scale=0.05, size=60),
+        'noise': rng.normal(size=60),
+        # Integer counts: ties for Spearman's average ranks
+        'counts': rng.integers(0, 6, 60),
+    })
+
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman'])
+def test_same_seed_same_result_across_workers(features, monkeypatch, method):
+    monkeypatch.setattr(significance_module, 'SIGNIFICANCE_PARALLEL_MIN_WORK', 0)
+    kwargs = dict(method=method, n_resamples=400, seed=11, batch_size=50)
+
+    serial = correlation_significance(features, max_workers=1, **kwargs)
+    parallel = correlation_significance(features, max_workers=3, **kwargs)
+    pd.testing.assert_frame_equal(serial, parallel, check_exact=True)
+
+    other_seed = correlation_significance(features, max_workers=1,
+                                          **dict(kwargs, seed=12))
+    assert not other_seed['CI_Lower'].equals(serial['CI_Lower'])
+
+
+@pytest.mark.parametrize('n_resamples', [99, 1000])
+def test_p_value_floor_is_one_over_resamples_plus_one(features, n_resamples):
+    result = correlation_significance(features, n_resamples=n_resamples, max_workers=1)
+    floor = 1 / (n_resamples + 1)
+
+    assert (result['P_Value'] >= floor).all()
+    assert (result['P_Value'] <= 1).all()
+    # No permutation comes close to a near-identical pair
+    linked = result[(result['Variable 1'] == 'x') & (result['Variable 2'] == 'linked')]
+    assert linked['P_Value'].iloc[0] == floor
+
+
+@pytest.mark.parametrize('method', ['pearson', 'spearman'])
+def test_point_estimates_match_dataframe_corr(features, method):
+    result = correlation_significance(features, method=method, n_resamples=50, max_workers=1)
+    corr = features.corr(method=method)
+
+    expected = [corr.loc[a, b] for a, b in zip(result['Variable 1'], result['Variable 2'])]
+    np.testing.assert_allclose(result['Correlation'], expected, rtol=1e-12, atol=1e-12)
+    assert (result['CI_Lower'] <= result['CI_Upper']).all()
+
+
+def test_constant_column_has_no_estimate(features):
+    result = correlation_significance(features.assign(flat=1.0), n_resamples=50, max_workers=1)
+    flat = result[(result['Variable 1'] == 'flat') | (result['Variable 2'] == 'flat')]
+    assert flat[['Correlation', 'CI_Lower', 'CI_Upper', 'P_Value']].isna().all().all()
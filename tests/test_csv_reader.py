@@ -0,0 +1,56 @@
+"""Typed CSV reads turn invalid counts into 0 instead of wrapping them."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_pipeline import _read_csv_chunks, _read_csv_typed
+
+
+COLUMNS = ['date', 'state', 'district', 'pincode', 'bio_age_5_17', 'bio_age_17_']
+# A negative count and one beyond uint32
+ROWS = [
+    ['01-03-2025', 'Karnataka', 'Bidar', 585330, 2, 3],
+    ['01-03-2025', 'Karnataka', 'Bidar', 585402, -7, 4],
+    ['02-03-2025', 'Punjab', 'Amritsar', 143001, 5000000000, 1],
+    ['02-03-2025', 'Punjab', 'Amritsar', 143002, 6, 70000],
+]
+
+
+def _write(path, rows):
+    pd.DataFrame(rows, columns=COLUMNS).to_csv(path, index=False)
+    return path
+
+
+def _check(df):
+    assert df['bio_age_5_17'].dtype == np.uint32
+    assert df['bio_age_5_17'].tolist() == [2, 0, 0, 6]
+    assert df['bio_age_17_'].tolist() == [3, 4, 1, 70000]
+    assert df['pincode'].dtype == np.int32
+    assert df['pincode'].tolist() == [585330, 585402, 143001, 143002]
+
+
+def test_negative_and_overflowing_counts_become_zero(tmp_path):
+    df, stats = _read_csv_typed(_write(tmp_path / 'shard.csv', ROWS), 'biometric')
+    _check(df)
+    assert stats['rows'] == 4
+
+
+@pytest.mark.parametrize('malformed', ['n/a', '', '1e30', '99999999999999999999999'])
+def test_fallback_read_also_zeroes_negative_and_overflowing_counts(tmp_path, malformed):
+    # A malformed cell sends the shard through the string fallback
+    rows = [row[:] for row in ROWS] + [['02-03-2025', 'Punjab', 'Amritsar', 143003,
+                                        malformed, 5]]
+    df, _ = _read_csv_typed(_write(tmp_path / 'shard.csv', rows), 'biometric')
+    _check(df.iloc[:4])
+    assert df['bio_age_5_17'].iloc[4] == 0
+
+
+@pytest.mark.parametrize('chunksize', [1, 3, 10])
+def test_chunked_read_matches(tmp_path, chunksize):
+    rows = [row[:] for row in ROWS] + [['02-03-2025', 'Punjab', 'Amritsar', 143003, 'n/a', 5]]
+    path = _write(tmp_path / 'shard.csv', rows)
+    whole, _ = _read_csv_typed(path, 'biometric')
+    chunks = pd.concat(list(_read_csv_chunks(path, 'biometric', chunksize)), ignore_index=True)
+    pd.testing.assert_frame_equal(chunks[['bio_age_5_17', 'bio_age_17_', 'pincode']],
+                                  whole[['bio_age_5_17', 'bio_age_17_', 'pincode']])
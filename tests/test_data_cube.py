@@ -0,0 +1,200 @@
+"""DashboardCube answers match brute-force pandas filters over the frames."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cube import CUBE_METRICS, DashboardCube
+from data_pipeline import IntegratedAadharDataPipeline
+from latency_sketch import LATENCY_SKETCH_ALPHA
+
+
+DATE_RANGES = [
+    (None, None),
+    ('2025-03-04', None),
+    (None, '2025-03-09'),
+    ('2025-03-04', '2025-03-09'),
+    ('2025-03-06', '2025-03-06'),
+    ('2025-03-09', '2025-03-04'),
+    ('2025-03-03T00:00:00', '2025-03-12'),
+    ('2024-01-01', '2024-02-01'),
+]
+ZONES = [None, [], ['South'], ['North', 'North East']]
+STATES = [None, ['Karnataka'], ['Assam', 'Punjab', 'Gujarat'], ['Nowhere']]
+
+
+@pytest.fixture
+def pipeline(write_dataset, write_shard):
+    base = write_dataset('1', start='2025-03-01', days=12, rows=1500)
+    for seed, dataset in enumerate(['biometric', 'demographic'], start=30):
+        write_shard(dataset, '2', start='2025-03-05', days=4, rows=600, seed=seed)
+    pipeline = IntegratedAadharDataPipeline(base, max_workers=1, use_cache=False)
+    pipeline.load_all()
+    pipeline.create_integrated_view()
+    return pipeline
+
+
+@pytest.fixture
+def cube(pipeline):
+    return DashboardCube.build(pipeline.biometric_df, pipeline.demographic_df,
+                               pipeline.enrolment_df, pipeline.integrated_df,
+                               latency_sketches=pipeline.latency_sketch_index())
+
+
+def _filter(df, start_date=None, end_date=None, zones=None, states=None):
+    """Rows matching a filter; dates apply only when both ends are given, like the cube."""
+    mask = np.ones(len(df), dtype=bool)
+    if start_date and end_date:
+        mask &= ((df['date'] >= pd.Timestamp(start_date)) &
+                 (df['date'] <= pd.Timestamp(end_date))).to_numpy()
+    if zones:
+        mask &= df['zone'].isin(zones).to_numpy()
+    if states:
+        mask &= df['state'].isin(states).to_numpy()
+    return df[mask]
+
+
+def _combinations():
+    return itertools.product(DATE_RANGES, ZONES, STATES)
+
+
+def test_slice_and_daily_match_brute_force(pipeline, cube):
+    for dataset, metric in CUBE_METRICS.items():
+        frame = pipeline._frame(dataset)
+        for (start, end), zones, states in _combinations():
+            rows = _filter(frame, start, end, zones, states)
+            expected = rows.groupby(['date', 'state', 'district'], observed=True)[metric] \
+                .sum().reset_index()
+            expected['state'] = expected['state'].astype(str)
+            expected['district'] = expected['district'].astype(str)
+
+            cells = cube.slice(dataset, start, end, zones, states)
+            got = cells[['date', 'state', 'district', metric]].astype(
+                {'state': str, 'district': str}).reset_index(drop=True)
+            context = (dataset, start, end, zones, states)
+            pd.testing.assert_frame_equal(got, expected.reset_index(drop=True),
+                                          check_dtype=False, obj=str(context))
+
+            daily = cube.daily(dataset, start, end, zones, states)
+            expected_daily = rows.groupby('date')[metric].sum()
+            np.testing.assert_allclose(daily.to_numpy(), expected_daily.to_numpy(),
+                                       err_msg=str(context))
+            assert daily.index.equals(pd.DatetimeIndex(expected_daily.index, name='date'))
+
+
+def test_demographic_rollups_match_brute_force(pipeline, cube):
+    demographic = pipeline.demographic_df
+    for start, end in DATE_RANGES:
+        rows = _filter(demographic, start, end)
+        context = (start, end)
+
+        volume, success_rate = cube.modality_summary(start, end)
+        expected_volume = rows['auth_modality'].astype(str).value_counts()
+        assert volume.rename(index=str).to_dict() == expected_volume.to_dict(), context
+        assert list(volume) == sorted(volume, reverse=True)
+        success = (rows['auth_status'] == 'Success').groupby(
+            rows['auth_modality'].astype(str)).mean() * 100
+        np.testing.assert_allclose(success_rate.rename(index=str)[success.index].to_numpy(),
+                                   success.to_numpy(), err_msg=str(context))
+
+        errors = cube.error_counts(start, end)
+        expected_errors = rows.loc[rows['auth_status'] == 'Failure', 'error_code'].value_counts()
+        assert errors.to_dict() == expected_errors.to_dict(), context
+        assert list(errors) == sorted(errors, reverse=True)
+
+        for states in STATES:
+            summary = cube.latency_summary(start, end, states)
+            selected = _filter(rows, states=states)
+            grouped = selected.groupby(selected['state'].astype(str))['response_time_ms']
+            assert sorted(summary.index) == sorted(grouped.groups), (context, states)
+            if summary.empty:
+                continue
+            summary = summary.loc[sorted(grouped.groups)]
+            np.testing.assert_array_equal(summary['Count'].to_numpy(), grouped.size().to_numpy())
+            np.testing.assert_allclose(summary['Mean'].to_numpy(), grouped.mean().to_numpy())
+            for column, q in (('Median', 0.5), ('P95', 0.95), ('P99', 0.99)):
+                truth = grouped.quantile(q).to_numpy()
+                error = np.abs(summary[column].to_numpy() - truth) / truth
+                assert (error <= LATENCY_SKETCH_ALPHA + 1e-9).all(), (context, states, column)
+
+
+def test_update_matches_rebuild(pipeline, write_shard, canonical):
+    cube = DashboardCube.build(pipeline.biometric_df, pipeline.demographic_df,
+                               pipeline.enrolment_df, pipeline.integrated_df)
+    write_shard('demographic', '3', start='2025-03-10', days=6, rows=500, seed=77)
+    write_shard('enrolment', '3', start='2025-03-02', days=3, rows=300, seed=78)
+    dates = pipeline.refresh()
+    cube.update(dates, pipeline.biometric_df, pipeline.demographic_df, pipeline.enrolment_df,
+                pipeline.integrated_df)
+    rebuilt = DashboardCube.build(pipeline.biometric_df, pipeline.demographic_df,
+                                  pipeline.enrolment_df, pipeline.integrated_df)
+
+    for dataset in CUBE_METRICS:
+        pd.testing.assert_frame_equal(canonical(cube.cells[dataset]),
+                                      canonical(rebuilt.cells[dataset]), check_dtype=False)
+    pd.testing.assert_frame_equal(canonical(cube.modality), canonical(rebuilt.modality),
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(canonical(cube.errors), canonical(rebuilt.errors),
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(cube.latency_summary(), rebuilt.latency_summary())
+
+
+def test_masks_are_memoized_and_read_only(cube):
+    mask = cube.mask('biometric', '2025-03-04', '2025-03-09', ['South'])
+    assert mask.flags.writeable is False
+    with pytest.raises(ValueError):
+        mask[0] = True
+    assert (cube.mask_cache_hits, cube.mask_cache_misses) == (0, 1)
+
+    # Equivalent filters (timestamps, list order) hit the same entry
+    again = cube.mask('biometric', '2025-03-04T00:00:00', '2025-03-09', ['South'])
+    assert again is mask
+    same_states = cube.mask('biometric', None, None, states=['Assam', 'Punjab'])
+    assert cube.mask('biometric', None, None, states=['Punjab', 'Assam']) is same_states
+    assert (cube.mask_cache_hits, cube.mask_cache_misses) == (2, 2)
+
+    # Another dataset or filter is a miss
+    cube.mask('demographic', '2025-03-04', '2025-03-09', ['South'])
+    cube.mask('biometric', '2025-03-04', '2025-03-10', ['South'])
+    assert cube.mask_cache_misses == 4
+
+
+def test_mask_cache_evicts_least_recently_used(pipeline):
+    cube = DashboardCube.build(pipeline.biometric_df, mask_cache_size=2)
+    first = cube.mask('biometric', states=['Assam'])
+    cube.mask('biometric', states=['Punjab'])
+    # Touch the first so the second is the least recently used
+    assert cube.mask('biometric', states=['Assam']) is first
+    cube.mask('biometric', states=['Gujarat'])
+    assert len(cube._mask_cache) == 2
+
+    misses = cube.mask_cache_misses
+    assert cube.mask('biometric', states=['Assam']) is first
+    cube.mask('biometric', states=['Punjab'])
+    assert cube.mask_cache_misses == misses + 1
+
+
+def test_update_never_reuses_older_masks(pipeline, write_shard):
+    cube = DashboardCube.build(pipeline.biometric_df, pipeline.demographic_df)
+    old_data = cube._data
+    old_mask = cube.mask('biometric', states=['Karnataka'])
+    assert len(old_mask) == len(cube.cells['biometric'])
+
+    write_shard('biometric', '3', start='2025-03-14', days=3, rows=300, seed=90)
+    dates = pipeline.refresh()
+    cube.update(dates, biometric_df=pipeline.biometric_df)
+    assert cube._data['generation'] == old_data['generation'] + 1
+
+    new_mask = cube.mask('biometric', states=['Karnataka'])
+    assert new_mask is not old_mask
+    assert len(new_mask) == len(cube.cells['biometric']) > len(old_mask)
+    np.testing.assert_array_equal(
+        new_mask, (cube.cells['biometric']['state'] == 'Karnataka').to_numpy())
+
+    # A mask computed from the replaced snapshot is returned but not kept
+    stale = cube._mask(old_data, 'biometric', states=['Assam'])
+    assert len(stale) == len(old_data['cells']['biometric'])
+    assert all(key[0] == cube._data['generation'] for key in cube._mask_cache)
+    assert len(cube.mask('biometric', states=['Assam'])) == len(cube.cells['biometric'])
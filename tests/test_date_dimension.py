@@ -0,0 +1,88 @@
+"""DateDimension attributes and regrouping match per-row pandas date logic."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from date_dimension import CALENDAR_COLUMNS, DateDimension
+from encoding import DAYS_OF_WEEK
+
+
+@pytest.fixture
+def rows():
+    # Spans month and year ends, with gaps and missing dates
+    rng = np.random.default_rng(4)
+    dates = pd.date_range('2024-12-20', '2025-03-10', freq='D')
+    dates = dates[rng.random(len(dates)) < 0.7]
+    date = pd.Series(dates[rng.integers(0, len(dates), 2_000)])
+    date[rng.random(len(date)) < 0.05] = pd.NaT
+    return pd.DataFrame({'date': date, 'count': rng.integers(0, 100, len(date))})
+
+
+@pytest.fixture
+def dimension(rows):
+    return DateDimension(rows['date'])
+
+
+def test_week_start_is_the_monday_of_the_week(dimension):
+    table = dimension.table
+    assert (table['week_start'].dt.dayofweek == 0).all()
+    offset = table['date'] - table['week_start']
+    assert ((offset >= pd.Timedelta(0)) & (offset < pd.Timedelta(days=7))).all()
+    assert (table['month_start'] == table['date'] - pd.to_timedelta(table['date'].dt.day - 1,
+                                                                    unit='D')).all()
+
+
+def test_day_of_week_is_ordered_monday_first(dimension):
+    days = dimension.table['day_of_week']
+    assert days.cat.ordered
+    assert list(days.cat.categories) == DAYS_OF_WEEK
+    assert (days.astype(str) == dimension.table['date'].dt.day_name()).all()
+
+
+def test_attributes_match_per_row_values(rows, dimension):
+    attributes = dimension.attributes(rows['date'])
+    assert list(attributes.columns) == CALENDAR_COLUMNS
+    assert attributes.index.equals(rows.index)
+
+    dated = rows['date'].notna()
+    date = rows.loc[dated, 'date']
+    found = attributes[dated]
+    assert (found['year'] == date.dt.year).all()
+    assert (found['month'] == date.dt.month).all()
+    assert (found['week_of_year'] == date.dt.isocalendar().week).all()
+    assert (found['month_year'].astype(str) == date.dt.strftime('%Y-%m')).all()
+
+
+def test_dates_outside_the_dimension_are_missing(dimension):
+    known = dimension.dates[5]
+    dates = pd.Series([known, pd.Timestamp('2030-01-01'), pd.NaT, pd.Timestamp('2024-12-01')])
+    attributes = dimension.attributes(dates)
+
+    assert list(dimension.codes(dates)) == [5, -1, -1, -1]
+    assert attributes.iloc[1:].isna().all().all()
+    assert attributes.iloc[0]['year'] == known.year
+    assert attributes.iloc[0]['week_start'] == known - pd.Timedelta(days=known.dayofweek)
+
+
+@pytest.mark.parametrize('column, per_row', [
+    ('week_start', lambda date: date.dt.to_period('W').dt.to_timestamp()),
+    ('month_start', lambda date: date.dt.to_period('M').dt.to_timestamp()),
+])
+def test_aggregate_matches_per_row_period_grouping(rows, dimension, column, per_row):
+    daily = rows.groupby('date')['count'].sum()
+    expected = rows.groupby(per_row(rows['date']))['count'].sum()
+
+    result = dimension.aggregate(daily, column)
+    pd.testing.assert_series_equal(result, expected, check_names=False, check_index_type=False)
+    assert result.index.name == column
+
+
+def test_aggregate_by_day_of_week_keeps_calendar_order(rows, dimension):
+    daily = rows.groupby('date')['count'].sum()
+    expected = rows.groupby(rows['date'].dt.day_name())['count'].sum()
+
+    result = dimension.aggregate(daily, 'day_of_week')
+    assert list(result.index) == [day for day in DAYS_OF_WEEK if day in expected.index]
+    pd.testing.assert_series_equal(result.rename(index=str), expected.loc[list(result.index)],
+                                   check_names=False, check_index_type=False)
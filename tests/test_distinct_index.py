@@ -0,0 +1,169 @@
+"""DistinctCountIndex counts match brute-force nunique() over the rows."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from distinct_index import (HLL_PRECISION, HLL_RELATIVE_ERROR, DistinctCountIndex,
+                            hll_estimate, hll_hash, hll_observations)
+
+
+DATES = pd.date_range('2025-03-01', periods=40, freq='D')
+STATES = [f"State {i:02d}" for i in range(70)]
+
+
+def _rows(rng, n, pincodes):
+    """Rows over DATES (2025-03-20 left empty), 70 states and shared district names."""
+    days = DATES[rng.integers(0, len(DATES), n)]
+    days = days.where(days != pd.Timestamp('2025-03-20'), pd.Timestamp('2025-03-21'))
+    return pd.DataFrame({
+        'date': days,
+        'state': pd.Categorical(np.array(STATES)[rng.integers(0, len(STATES), n)]),
+        'district': pd.Categorical([f"District {i:03d}" for i in rng.integers(0, 150, n)]),
+        'pincode': rng.integers(100000, 100000 + pincodes, n).astype('int32'),
+    })
+
+
+@pytest.fixture(scope='module')
+def frames():
+    rng = np.random.default_rng(5)
+    return {'biometric': _rows(rng, 60_000, 40_000), 'enrolment': _rows(rng, 20_000, 2_000)}
+
+
+@pytest.fixture(scope='module')
+def index(frames):
+    return DistinctCountIndex.build(frames)
+
+
+def _selections(seed=0, count=60):
+    """Random (start, end, states) filters, with empty and single-day ranges."""
+    yield {}
+    yield {'start_date': DATES[7], 'end_date': DATES[7]}
+    yield {'start_date': '2025-03-20', 'end_date': '2025-03-20'}
+    yield {'start_date': DATES[30], 'end_date': DATES[2]}
+    yield {'start_date': '2026-01-01'}
+    yield {'states': ['Nowhere']}
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        filters = {}
+        if rng.random() < 0.8:
+            lo = rng.integers(0, len(DATES))
+            hi = lo if rng.random() < 0.2 else rng.integers(lo, len(DATES))
+            filters['start_date'], filters['end_date'] = DATES[lo], DATES[hi]
+        if rng.random() < 0.5:
+            filters['states'] = list(rng.choice(STATES, rng.integers(1, 40), replace=False))
+        yield filters
+
+
+def _filter(df, start_date=None, end_date=None, states=None):
+    mask = np.ones(len(df), dtype=bool)
+    if start_date is not None:
+        mask &= (df['date'] >= pd.Timestamp(start_date)).to_numpy()
+    if end_date is not None:
+        mask &= (df['date'] <= pd.Timestamp(end_date)).to_numpy()
+    if states is not None:
+        mask &= df['state'].isin(states).to_numpy()
+    return df[mask]
+
+
+def test_state_and_district_counts_exact(frames, index):
+    for filters in _selections():
+        for dataset, df in frames.items():
+            rows = _filter(df, **filters)
+            for column in ('state', 'district'):
+                assert index.count(dataset, column, **filters) == rows[column].nunique(), \
+                    (dataset, column, filters)
+
+
+def test_pincode_counts_within_error_bound(frames, index):
+    checked = 0
+    for filters in _selections(seed=1):
+        for dataset, df in frames.items():
+            truth = _filter(df, **filters)['pincode'].nunique()
+            estimate = index.count(dataset, 'pincode', **filters)
+            if truth == 0:
+                assert estimate == 0, (dataset, filters)
+                continue
+            # Three standard errors, plus rounding for tiny counts
+            assert abs(estimate - truth) <= 3 * HLL_RELATIVE_ERROR * truth + 1, \
+                (dataset, filters, estimate, truth)
+            checked += 1
+    assert checked >= 100
+
+
+@pytest.mark.parametrize('cardinality', [10, 500, 3_000, 20_000, 200_000])
+def test_hll_error_within_documented_bound(cardinality):
+    errors = []
+    for seed in range(20):
+        values = np.random.default_rng(seed).choice(10**9, cardinality, replace=False)
+        registers = np.zeros(2 ** HLL_PRECISION, dtype=np.uint8)
+        register, rank = hll_observations(hll_hash(values))
+        np.maximum.at(registers, register, rank)
+        errors.append(hll_estimate(registers) / cardinality - 1)
+    errors = np.array(errors)
+    # Every sketch within three standard errors, and the spread about one
+    assert np.abs(errors).max() <= 3 * HLL_RELATIVE_ERROR
+    assert np.sqrt(np.mean(errors ** 2)) <= 1.5 * HLL_RELATIVE_ERROR
+
+
+def test_added_rows_match_one_build(frames, index):
+    # Folding rows in batches (new dates, states and districts each time),
+    # and adding rows twice, gives the same counts as one build
+    incremental = DistinctCountIndex()
+    for dataset, df in frames.items():
+        for part in np.array_split(np.arange(len(df)), 4):
+            incremental.add(dataset, df.iloc[part])
+    incremental.add('biometric', frames['biometric'].iloc[:1000])
+
+    for filters in _selections(seed=2, count=20):
+        for dataset in frames:
+            for column in ('state', 'district', 'pincode'):
+                assert incremental.count(dataset, column, **filters) == \
+                    index.count(dataset, column, **filters), (dataset, column, filters)
+
+
+def test_unknown_dataset_and_column(index):
+    assert index.count('demographic', 'state') == 0
+    with pytest.raises(ValueError):
+        index.count('biometric', 'zone')
+
+
+def test_add_touches_only_its_dataset(frames):
+    index = DistinctCountIndex.build({'biometric': frames['biometric'].iloc[:5000],
+                                      'enrolment': frames['enrolment'].iloc[:5000]})
+    biometric = index._data['datasets']['biometric']
+    enrolment = index._data['datasets']['enrolment']
+    before = {key: value.copy() for key, value in enrolment.items()}
+    index.count('biometric', 'district')
+    spans = index._derived['biometric']
+
+    # New dates, states and districts for enrolment only
+    late = frames['enrolment'].iloc[5000:].copy()
+    late['date'] += pd.Timedelta(days=60)
+    late['state'] = late['state'].cat.rename_categories(lambda s: f"{s} (new)")
+    late['district'] = late['district'].cat.rename_categories(lambda d: f"{d} (new)")
+    index.add('enrolment', late)
+
+    assert index._data['datasets']['biometric'] is biometric
+    index.count('biometric', 'district')
+    assert index._derived['biometric'] is spans
+    # The replaced arrays are untouched: readers of the old snapshot see no change
+    for key, value in before.items():
+        np.testing.assert_array_equal(enrolment[key], value)
+
+    rows = pd.concat([frames['enrolment'].iloc[:5000], late])
+    after = DATES[-1] + pd.Timedelta(days=1)
+    for column in ('state', 'district'):
+        assert index.count('enrolment', column) == rows[column].nunique()
+        assert index.count('enrolment', column, start_date=after) == late[column].nunique()
+        assert index.count('biometric', column) == \
+            frames['biometric'].iloc[:5000][column].nunique()
+
+
+def test_single_dataset_axes_are_sorted(frames):
+    # A first add on an empty axis must still sort it for date-range lookups
+    df = frames['enrolment']
+    index = DistinctCountIndex.build({'enrolment': df})
+    for filters in _selections(seed=3, count=20):
+        assert index.count('enrolment', 'state', **filters) == \
+            _filter(df, **filters)['state'].nunique(), filters
@@ -0,0 +1,77 @@
+"""State and district columns share one code table across the datasets."""
+
+import pandas as pd
+import pytest
+
+from data_pipeline import DATASETS, IntegratedAadharDataPipeline
+from encoding import GLOBAL_CODE_COLUMNS, share_codes
+
+
+def _assert_shared(frames):
+    """Every column of GLOBAL_CODE_COLUMNS has the same sorted categories everywhere."""
+    for col in GLOBAL_CODE_COLUMNS:
+        categories = [df[col].cat.categories for df in frames]
+        assert list(categories[0]) == sorted(categories[0])
+        for other in categories[1:]:
+            assert other.equals(categories[0]), col
+        # The table is the union of the values, nothing more
+        values = set().union(*(set(df[col].dropna().astype(str)) for df in frames))
+        assert set(categories[0]) == values
+
+
+def test_categories_shared_after_load_and_refresh(write_dataset, write_shard):
+    # A few rows per shard, so each dataset starts with a different subset of states
+    base = write_dataset('0', seed=1, rows=2)
+    pipeline = IntegratedAadharDataPipeline(base, max_workers=1, use_cache=False)
+    pipeline.load_all()
+    frames = [pipeline._frame(dataset) for dataset in DATASETS]
+    _assert_shared(frames)
+    assert len({frozenset(df['state'].dropna().astype(str)) for df in frames}) > 1
+
+    # New states and districts in one dataset only
+    write_shard('enrolment', '1', start='2025-03-11', rows=400, seed=5)
+    pipeline.refresh()
+    refreshed = [pipeline._frame(dataset) for dataset in DATASETS]
+    _assert_shared(refreshed)
+    assert len(refreshed[0]['district'].cat.categories) > \
+        len(frames[0]['district'].cat.categories)
+
+
+def test_codes_keep_their_values():
+    frames = [
+        pd.DataFrame({'state': pd.Categorical(['Punjab', 'Assam', None]),
+                      'district': ['Amritsar', 'Kamrup', 'Dhubri']}),
+        pd.DataFrame({'state': ['Gujarat', 'Assam'],
+                      'district': pd.Categorical(['Surat', None])}),
+    ]
+    shared = share_codes(frames)
+    _assert_shared(shared)
+    for before, after in zip(frames, shared):
+        for col in GLOBAL_CODE_COLUMNS:
+            pd.testing.assert_series_equal(after[col].astype(object),
+                                           before[col].astype(object).where(before[col].notna()),
+                                           check_dtype=False)
+
+
+def test_already_shared_frames_are_returned_unchanged():
+    dtype = pd.CategoricalDtype(['Assam', 'Punjab'])
+    districts = pd.CategoricalDtype(['Amritsar', 'Kamrup'])
+    frames = [
+        pd.DataFrame({'state': pd.Categorical(['Punjab'], dtype=dtype),
+                      'district': pd.Categorical(['Amritsar'], dtype=districts)}),
+        pd.DataFrame({'state': pd.Categorical(['Assam'], dtype=dtype),
+                      'district': pd.Categorical(['Kamrup'], dtype=districts)}),
+        None,
+    ]
+    shared = share_codes(frames)
+    assert shared[0] is frames[0] and shared[1] is frames[1] and shared[2] is None
+    # Sharing again is a no-op as well
+    assert all(a is b for a, b in zip(share_codes(shared), shared))
+
+
+@pytest.mark.parametrize('col', GLOBAL_CODE_COLUMNS)
+def test_missing_column_is_skipped(col):
+    frames = [pd.DataFrame({col: ['b', 'a']}), pd.DataFrame({'other': [1]})]
+    shared = share_codes(frames)
+    assert shared[1] is frames[1]
+    assert list(shared[0][col].cat.categories) == ['a', 'b']
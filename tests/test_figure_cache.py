@@ -0,0 +1,126 @@
+"""FigureCache keys, data versions, counters and backend fallback."""
+
+import socket
+
+import pytest
+
+from figure_cache import FigureCache, _MemoryBackend, _normalize
+
+
+@pytest.fixture
+def cache():
+    cache = FigureCache('memory', maxsize=16)
+    cache.set_data_version('v1')
+    return cache
+
+
+@pytest.fixture
+def chart(cache):
+    """A memoized callback recording the calls that were not served from the cache."""
+    calls = []
+
+    @cache.memoize
+    def chart(start_date, end_date, states, n_clicks=None, n_intervals=None):
+        calls.append((start_date, end_date, states))
+        return {'figure': len(calls)}
+
+    chart.calls = calls
+    return chart
+
+
+def test_normalize():
+    assert _normalize('2025-03-01') == _normalize('2025-03-01T00:00:00')
+    assert _normalize(['Goa', 'Assam']) == _normalize(('Assam', 'Goa'))
+    assert _normalize([]) is None
+    assert _normalize('Goa') == 'Goa'
+    assert _normalize(3) == 3
+
+
+def test_equivalent_inputs_share_an_entry(chart):
+    first = chart('2025-03-01', '2025-03-31', ['Goa', 'Assam'])
+    assert chart('2025-03-01T00:00:00', '2025-03-31', ['Assam', 'Goa']) == first
+    assert chart('2025-03-01', '2025-03-31', ['Goa', 'Assam'], n_clicks=4, n_intervals=9) == first
+    assert len(chart.calls) == 1
+
+    # An empty selection is the same as no selection
+    chart('2025-03-01', '2025-03-31', [])
+    chart('2025-03-01', '2025-03-31', None)
+    assert len(chart.calls) == 2
+
+    chart('2025-03-02', '2025-03-31', ['Goa', 'Assam'])
+    chart('2025-03-01', '2025-03-31', ['Goa'])
+    assert len(chart.calls) == 4
+
+
+def test_hit_and_miss_counters(cache, chart):
+    chart('2025-03-01', None, None)
+    chart('2025-03-01', None, None)
+    chart('2025-03-02', None, None)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['errors']) == (1, 2, 0)
+    assert stats['per_callback']['chart'] == {'hits': 1, 'misses': 2}
+    assert stats['data_version'] == 'v1'
+
+
+def test_new_data_version_makes_entries_unreachable(cache, chart):
+    chart('2025-03-01', None, None)
+    cache.set_data_version('v2')
+    chart('2025-03-01', None, None)
+    assert len(chart.calls) == 2
+
+    # Back on the old token, the in-process LRU no longer holds its entries
+    cache.set_data_version('v1')
+    chart('2025-03-01', None, None)
+    assert len(chart.calls) == 3
+
+
+def test_only_unshared_backends_are_cleared(tmp_path):
+    pytest.importorskip('diskcache')
+    memory = FigureCache('memory')
+    memory._backend.set('key', 'figure')
+    memory.set_data_version('v2')
+    assert memory._backend.get('key') is None
+
+    # Other workers may already have cached figures under the new token
+    disk = FigureCache('disk', directory=str(tmp_path / 'figures'))
+    disk._backend.set('key', 'figure')
+    disk.set_data_version('v2')
+    assert disk._backend.get('key') == 'figure'
+
+
+def test_disabled_cache_always_calls():
+    cache = FigureCache('none')
+
+    @cache.memoize
+    def chart(value):
+        return object()
+
+    assert chart(1) is not chart(1)
+    assert cache.stats()['misses'] == 0
+
+
+def test_backend_errors_are_counted(cache, chart, monkeypatch):
+    def fail(*args):
+        raise OSError("store down")
+    monkeypatch.setattr(cache._backend, 'get', fail)
+    monkeypatch.setattr(cache._backend, 'set', fail)
+    assert chart('2025-03-01', None, None) == {'figure': 1}
+    assert cache.stats()['errors'] == 2
+
+
+def test_unreachable_redis_falls_back_to_memory(monkeypatch):
+    pytest.importorskip('redis')
+    # A port nothing listens on
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    monkeypatch.setenv('FIGURE_CACHE_BACKEND', 'redis')
+    monkeypatch.setenv('REDIS_URL', f"redis://127.0.0.1:{port}/0")
+    cache = FigureCache.from_env()
+    assert cache.backend_name == 'memory'
+    assert isinstance(cache._backend, _MemoryBackend)
+
+
+def test_unknown_backend_falls_back_to_memory(monkeypatch):
+    monkeypatch.setenv('FIGURE_CACHE_BACKEND', 'memcached')
+    assert FigureCache.from_env().backend_name == 'memory'
@@ -0,0 +1,122 @@
+"""Incremental refresh and the pipeline cache deltas match a cold rebuild."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from data_pipeline import DATASETS, IntegratedAadharDataPipeline
+from pipeline_cache import CACHE_MAX_DELTAS
+
+
+def _pipeline(base_path, cache_dir=None):
+    return IntegratedAadharDataPipeline(base_path, max_workers=1, use_cache=cache_dir is not None,
+                                        cache_dir=cache_dir)
+
+
+@pytest.fixture
+def assert_matches_cold_build(canonical):
+    """Check a pipeline's frames and integrated view against a cold full rebuild."""
+    def check(pipeline):
+        cold = _pipeline(pipeline.base_path)
+        cold.load_all()
+        cold.create_integrated_view()
+        for name in DATASETS + ['integrated']:
+            refreshed, rebuilt = pipeline._frame(name), cold._frame(name)
+            assert list(refreshed.columns) == list(rebuilt.columns)
+            pd.testing.assert_frame_equal(canonical(refreshed), canonical(rebuilt),
+                                          check_dtype=False)
+            # Stored date-sorted, with a date index over the rows
+            assert refreshed['date'].is_monotonic_increasing
+            distinct, offsets = pipeline.date_index[name]
+            assert offsets[-1] == len(refreshed)
+            assert len(distinct) == refreshed['date'].nunique()
+
+    return check
+
+
+def test_refresh_after_adding_and_modifying_shards(tmp_path, write_dataset, write_shard,
+                                                   assert_matches_cold_build):
+    base = write_dataset('1', start='2025-03-01', days=10)
+    cache_dir = tmp_path / 'cache'
+    pipeline = _pipeline(base, cache_dir)
+    pipeline.load_all()
+    pipeline.create_integrated_view()
+
+    # New shards overlapping the loaded dates and adding later ones
+    write_shard('biometric', '2', start='2025-03-08', days=8, seed=10)
+    write_shard('demographic', '2', start='2025-03-05', days=3, seed=11)
+    dates = pipeline.refresh()
+    assert dates.min() == pd.Timestamp('2025-03-05')
+    assert dates.max() == pd.Timestamp('2025-03-15')
+    assert_matches_cold_build(pipeline)
+    assert len(pipeline.refresh()) == 0
+
+    # The refreshed entry holds hard-linked base files plus one delta per dataset
+    key = pipeline.cache_key
+    assert pipeline.cache.delta_count(key, 'biometric') == 1
+    assert pipeline.cache.delta_count(key, 'demographic') == 1
+    assert pipeline.cache.delta_count(key, 'enrolment') == 0
+
+    # Another process refreshing on the same shards finds the entry written
+    cached = _pipeline(base, cache_dir)
+    cached.load_all()
+    assert cached.cache_key == key
+    cached.create_integrated_view()
+    assert_matches_cold_build(cached)
+    write_shard('enrolment', '2', start='2025-03-12', days=6, seed=12)
+    pipeline.refresh()
+    cached.refresh()
+    assert cached.cache_key == pipeline.cache_key
+    assert pipeline.cache.delta_count(pipeline.cache_key, 'enrolment') == 1
+    assert_matches_cold_build(cached)
+
+    # A modified shard cannot be appended: refresh refuses and load_all rebuilds
+    path = write_shard('biometric', '1', start='2025-03-01', days=10, rows=500, seed=20)
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    with pytest.raises(ValueError):
+        pipeline.refresh()
+    pipeline.load_all()
+    pipeline.create_integrated_view()
+    assert pipeline.cache.delta_count(pipeline.cache_key, 'biometric') == 0
+    assert_matches_cold_build(pipeline)
+
+
+def test_refresh_without_cache(write_dataset, write_shard, assert_matches_cold_build):
+    base = write_dataset('1')
+    pipeline = _pipeline(base)
+    pipeline.load_all()
+    pipeline.create_integrated_view()
+    write_shard('demographic', '2', start='2025-03-06', days=9, seed=5)
+    pipeline.refresh()
+    assert_matches_cold_build(pipeline)
+
+
+def test_cache_compacts_after_max_deltas(tmp_path, write_dataset, write_shard,
+                                         assert_matches_cold_build):
+    base = write_dataset('00', days=5)
+    cache_dir = tmp_path / 'cache'
+    pipeline = _pipeline(base, cache_dir)
+    pipeline.load_all()
+    pipeline.create_integrated_view()
+
+    for n in range(1, CACHE_MAX_DELTAS + 2):
+        write_shard('biometric', f"{n:02d}", start=f"2025-03-{n + 3:02d}", days=4, rows=100,
+                    seed=100 + n)
+        pipeline.refresh()
+        expected = n if n <= CACHE_MAX_DELTAS else 0
+        assert pipeline.cache.delta_count(pipeline.cache_key, 'biometric') == expected
+    assert_matches_cold_build(pipeline)
+
+    # The compacted entry is read back as single base files
+    cached = _pipeline(base, cache_dir)
+    cached.load_all()
+    cached.create_integrated_view()
+    assert cached.cache_key == pipeline.cache_key
+    assert_matches_cold_build(cached)
+
+    # and takes deltas again
+    write_shard('biometric', 'zz', start='2025-03-20', days=2, rows=100, seed=999)
+    cached.refresh()
+    assert cached.cache.delta_count(cached.cache_key, 'biometric') == 1
+    assert_matches_cold_build(cached)
@@ -0,0 +1,164 @@
+"""KPIEngine answers match a brute-force pandas filter over the rows."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from distinct_index import DistinctCountIndex
+from kpi_engine import KPIEngine
+from latency_sketch import LATENCY_SKETCH_ALPHA
+
+
+STATE_TO_ZONE = {
+    'Karnataka': 'South', 'Kerala': 'South', 'Punjab': 'North', 'Haryana': 'North',
+    'Assam': 'North East', 'Odisha': 'East', 'Gujarat': 'West',
+}
+# Present in the rows but missing from the zone mapping ('Unknown' zone)
+UNMAPPED_STATE = 'Atlantis'
+DATES = pd.date_range('2025-03-01', periods=30, freq='D')
+
+
+def _rows(rng, n, counts):
+    """Synthetic cleaned rows over DATES (some days left empty) and the states."""
+    states = np.array(list(STATE_TO_ZONE) + [UNMAPPED_STATE])
+    days = DATES[rng.integers(0, len(DATES), n)]
+    # Leave 2025-03-10 without rows in every dataset
+    days = days.where(days != pd.Timestamp('2025-03-10'), pd.Timestamp('2025-03-11'))
+    state = states[rng.integers(0, len(states), n)]
+    df = pd.DataFrame({
+        'date': days,
+        'state': pd.Categorical(state),
+        'district': pd.Categorical([f"{s[:3]}-{d}" for s, d in
+                                    zip(state, rng.integers(0, 6, n))]),
+        'pincode': rng.integers(100000, 100000 + 3000, n).astype('int32'),
+    })
+    for col in counts:
+        df[col] = rng.integers(0, 50, n).astype('uint16')
+    return df.sort_values('date', kind='stable').reset_index(drop=True)
+
+
+@pytest.fixture(scope='module')
+def frames():
+    rng = np.random.default_rng(3)
+    biometric = _rows(rng, 6000, ['bio_age_5_17', 'bio_age_17_'])
+    biometric['total_transactions'] = biometric['bio_age_5_17'].astype('uint32') + \
+        biometric['bio_age_17_']
+    demographic = _rows(rng, 8000, ['demo_age_5_17', 'demo_age_17_'])
+    demographic['auth_status'] = pd.Categorical(
+        np.where(rng.random(len(demographic)) < 0.88, 'Success', 'Failure'))
+    demographic['response_time_ms'] = np.clip(
+        rng.lognormal(5.3, 0.5, len(demographic)).astype(int), 50, 5000)
+    enrolment = _rows(rng, 4000, ['age_0_5', 'age_5_17', 'age_18_greater'])
+    enrolment['total_enrolment'] = (enrolment['age_0_5'].astype('uint32') +
+                                    enrolment['age_5_17'] + enrolment['age_18_greater'])
+    return {'biometric': biometric, 'demographic': demographic, 'enrolment': enrolment}
+
+
+@pytest.fixture(scope='module')
+def engine(frames):
+    return KPIEngine.from_frames(STATE_TO_ZONE, DistinctCountIndex.build(frames),
+                                 frames['biometric'], frames['demographic'],
+                                 frames['enrolment'])
+
+
+def _selections(seed=0, count=60):
+    """Random (start, end, zones, states) filters, with edge cases first."""
+    yield {}
+    yield {'start_date': DATES[4], 'end_date': DATES[4]}
+    yield {'start_date': '2025-03-10', 'end_date': '2025-03-10'}
+    yield {'start_date': DATES[20], 'end_date': DATES[5]}
+    yield {'start_date': '2024-01-01', 'end_date': '2024-12-31'}
+    yield {'zones': ['Central']}
+    yield {'zones': ['Unknown']}
+    yield {'zones': ['South'], 'states': ['Punjab']}
+    yield {'start_date': DATES[29]}
+    yield {'end_date': DATES[0]}
+    rng = np.random.default_rng(seed)
+    zones = sorted(set(STATE_TO_ZONE.values()))
+    states = list(STATE_TO_ZONE) + [UNMAPPED_STATE]
+    for _ in range(count):
+        filters = {}
+        if rng.random() < 0.8:
+            lo = rng.integers(0, len(DATES))
+            hi = lo if rng.random() < 0.2 else rng.integers(lo, len(DATES))
+            filters['start_date'], filters['end_date'] = DATES[lo], DATES[hi]
+        if rng.random() < 0.4:
+            filters['zones'] = list(rng.choice(zones, rng.integers(1, 3), replace=False))
+        if rng.random() < 0.4:
+            filters['states'] = list(rng.choice(states, rng.integers(1, 4), replace=False))
+        yield filters
+
+
+def _filter(df, start_date=None, end_date=None, zones=None, states=None):
+    """Rows of a frame matching a filter, by brute force."""
+    mask = np.ones(len(df), dtype=bool)
+    if start_date is not None:
+        mask &= (df['date'] >= pd.Timestamp(start_date)).to_numpy()
+    if end_date is not None:
+        mask &= (df['date'] <= pd.Timestamp(end_date)).to_numpy()
+    if zones:
+        zone = df['state'].astype(str).map(lambda s: STATE_TO_ZONE.get(s, 'Unknown'))
+        mask &= zone.isin(zones).to_numpy()
+    if states:
+        mask &= df['state'].isin(states).to_numpy()
+    return df[mask]
+
+
+def _expected(frames, filters):
+    bio, demo, enrol = (_filter(frames[name], **filters)
+                        for name in ('biometric', 'demographic', 'enrolment'))
+    records = len(demo)
+    return {
+        'total_biometric_transactions': int(bio['total_transactions'].sum()),
+        'active_states_biometric': bio['state'].nunique(),
+        'active_districts_biometric': bio['district'].nunique(),
+        'total_demographic_records': records,
+        'national_auth_success_rate':
+            (demo['auth_status'] == 'Success').sum() / records * 100 if records else 0.0,
+        'total_enrolments': int(enrol['total_enrolment'].sum()),
+        'infant_enrolments': int(enrol['age_0_5'].sum()),
+        'active_states_enrolment': enrol['state'].nunique(),
+        'total_data_points': len(bio) + len(demo) + len(enrol),
+    }, demo['response_time_ms']
+
+
+def test_kpis_match_brute_force(frames, engine):
+    for filters in _selections():
+        kpis = engine.kpis(**filters)
+        expected, latencies = _expected(frames, filters)
+        for key, value in expected.items():
+            assert kpis[key] == pytest.approx(value), (filters, key)
+
+        latency = [kpis['median_latency_ms'], kpis['p95_latency_ms'], kpis['p99_latency_ms']]
+        if latencies.empty:
+            assert latency == [0.0, 0.0, 0.0]
+        else:
+            truth = latencies.quantile([0.5, 0.95, 0.99]).to_numpy()
+            error = np.abs(np.array(latency) - truth) / truth
+            assert (error <= LATENCY_SKETCH_ALPHA + 1e-9).all(), (filters, latency, truth)
+
+
+def test_empty_and_single_day_selections(frames, engine):
+    empty = engine.kpis(start_date='2025-03-10', end_date='2025-03-10')
+    assert empty['total_data_points'] == 0
+    assert empty['active_states_biometric'] == 0
+    assert empty['national_auth_success_rate'] == 0.0
+
+    day = engine.kpis(start_date=DATES[4], end_date=DATES[4])
+    assert day['total_data_points'] == sum((df['date'] == DATES[4]).sum()
+                                           for df in frames.values())
+
+
+def test_added_rows_match_one_build(frames, engine):
+    # Rows folded in batch by batch give the same KPIs as building at once
+    split = {name: (df[df['date'] < DATES[15]], df[df['date'] >= DATES[15]])
+             for name, df in frames.items()}
+    distinct = DistinctCountIndex.build({name: parts[0] for name, parts in split.items()})
+    incremental = KPIEngine.from_frames(STATE_TO_ZONE, distinct,
+                                        *(split[name][0] for name in frames))
+    for name, (_, later) in split.items():
+        distinct.add(name, later)
+        incremental.add(name, later)
+
+    for filters in _selections(seed=1, count=20):
+        assert incremental.kpis(**filters) == pytest.approx(engine.kpis(**filters)), filters
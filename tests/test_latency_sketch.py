@@ -0,0 +1,140 @@
+"""Accuracy and mergeability of the latency quantile sketches."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from latency_sketch import (LATENCY_SKETCH_ALPHA, LatencySketchIndex, bucket_value,
+                            sketch_bucket)
+
+
+QUANTILES = [0.0, 0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 0.999, 1.0]
+
+
+@pytest.fixture(scope='module')
+def latencies():
+    """Synthetic demographic rows with heavy-tailed integer latencies."""
+    rng = np.random.default_rng(11)
+    rows = 60_000
+    dates = pd.date_range('2025-03-01', '2025-04-30', freq='D')
+    states = np.array([f"State {i:02d}" for i in range(8)])
+    districts = np.array([f"District {i:02d}" for i in range(20)])
+    modalities = np.array(['Fingerprint', 'Iris', 'Face', 'OTP'])
+
+    state_codes = rng.integers(0, len(states), rows)
+    scale = rng.uniform(4.5, 6.0, len(states))[state_codes]
+    return pd.DataFrame({
+        'date': dates[rng.integers(0, len(dates), rows)],
+        'state': pd.Categorical(states[state_codes]),
+        'district': pd.Categorical(districts[rng.integers(0, len(districts), rows)]),
+        'auth_modality': modalities[rng.choice(4, rows, p=[0.6, 0.2, 0.05, 0.15])],
+        'response_time_ms': np.clip(rng.lognormal(scale, 0.9), 1, 100_000).astype(np.int64),
+    }).sort_values('date', kind='stable').reset_index(drop=True)
+
+
+@pytest.fixture(scope='module')
+def index(latencies):
+    return LatencySketchIndex.build(latencies)
+
+
+def _selections(df, count=40, seed=0):
+    """Random filter combinations in LatencySketchIndex.select's terms."""
+    rng = np.random.default_rng(seed)
+    dates = np.sort(df['date'].unique())
+    for _ in range(count):
+        filters = {}
+        if rng.random() < 0.7:
+            lo, hi = np.sort(rng.integers(0, len(dates), 2))
+            filters['start_date'], filters['end_date'] = dates[lo], dates[hi]
+        for col, name in (('state', 'states'), ('district', 'districts'),
+                          ('auth_modality', 'modalities')):
+            if rng.random() < 0.5:
+                values = np.asarray(df[col].unique())
+                filters[name] = list(rng.choice(values, rng.integers(1, 4), replace=False))
+        yield filters
+
+
+def _exact(df, filters):
+    """Latencies of the rows matching a filter combination."""
+    mask = np.ones(len(df), dtype=bool)
+    if 'start_date' in filters:
+        mask &= ((df['date'] >= filters['start_date']) &
+                 (df['date'] <= filters['end_date'])).to_numpy()
+    for col, name in (('state', 'states'), ('district', 'districts'),
+                      ('auth_modality', 'modalities')):
+        if name in filters:
+            mask &= df[col].isin(filters[name]).to_numpy()
+    return df.loc[mask, 'response_time_ms']
+
+
+def test_quantiles_within_alpha(latencies, index):
+    checked = 0
+    for filters in _selections(latencies):
+        exact = _exact(latencies, filters)
+        if exact.empty:
+            assert np.isnan(index.quantiles(QUANTILES, **filters)).all()
+            continue
+        estimate = index.quantiles(QUANTILES, **filters)
+        truth = exact.quantile(QUANTILES).to_numpy()
+        error = np.abs(estimate - truth) / truth
+        assert (error <= LATENCY_SKETCH_ALPHA + 1e-9).all(), (filters, estimate, truth)
+        checked += 1
+    assert checked >= 20
+
+
+def test_summary_counts_and_means_exact(latencies, index):
+    summary = index.summary(by='state')
+    grouped = latencies.groupby('state', observed=True)['response_time_ms']
+    np.testing.assert_array_equal(summary['Count'].to_numpy(), grouped.size().to_numpy())
+    np.testing.assert_allclose(summary['Mean'].to_numpy(), grouped.mean().to_numpy())
+
+
+def test_replace_dates_matches_full_build(latencies, index):
+    dates = np.sort(latencies['date'].unique())[::5]
+    rebuilt = LatencySketchIndex.build(latencies[latencies['date'].isin(dates)])
+    spliced = index.replace_dates(dates, rebuilt)
+
+    pd.testing.assert_frame_equal(spliced.summary(), index.summary())
+    pd.testing.assert_frame_equal(spliced.summary(by='auth_modality'),
+                                  index.summary(by='auth_modality'))
+    columns = ['date', 'state', 'district', 'auth_modality', 'bucket', 'count', 'total']
+    left = spliced.table[columns].astype({'state': str, 'district': str, 'auth_modality': str})
+    right = index.table[columns].astype({'state': str, 'district': str, 'auth_modality': str})
+    pd.testing.assert_frame_equal(left.reset_index(drop=True), right.reset_index(drop=True))
+
+
+def test_replace_dates_with_new_rows(latencies, index):
+    # Dates whose rows changed are spliced from a rebuild of their new rows
+    dates = np.sort(latencies['date'].unique())[3:6]
+    changed = latencies.copy()
+    on_dates = changed['date'].isin(dates).to_numpy()
+    changed.loc[on_dates, 'response_time_ms'] *= 3
+
+    spliced = index.replace_dates(dates, LatencySketchIndex.build(changed[on_dates]))
+    pd.testing.assert_frame_equal(spliced.summary(), LatencySketchIndex.build(changed).summary())
+
+
+def _keyed(series):
+    """A per-group series reindexed on plain (state, district, date) keys."""
+    frame = series.rename('value').reset_index()
+    frame['state'] = frame['state'].astype(str)
+    frame['district'] = frame['district'].astype(str)
+    return frame.set_index(['state', 'district', 'date'])['value'].sort_index()
+
+
+def test_medians_match_pandas_on_bucketed_values(latencies, index):
+    keys = ['state', 'district', 'date']
+    bucketed = latencies[keys].assign(
+        value=bucket_value(sketch_bucket(latencies['response_time_ms'])))
+    expected = _keyed(bucketed.groupby(keys, observed=True)['value'].median())
+
+    medians = _keyed(index.medians(keys))
+    assert medians.index.equals(expected.index)
+    np.testing.assert_allclose(medians.to_numpy(), expected.to_numpy())
+
+
+def test_medians_of_no_rows(latencies):
+    empty = LatencySketchIndex.build(latencies.iloc[:0])
+    medians = empty.medians(['state', 'district', 'date'])
+    assert medians.empty
+    assert list(medians.index.names) == ['state', 'district', 'date']
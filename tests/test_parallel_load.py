@@ -0,0 +1,42 @@
+"""load_all gives identical frames whatever the worker count or executor."""
+
+import pandas as pd
+import pytest
+
+from data_pipeline import DATASETS, IntegratedAadharDataPipeline
+
+
+@pytest.fixture
+def base_path(write_dataset):
+    # Shards with overlapping dates, so the concatenation order matters
+    for shard in range(3):
+        base = write_dataset(str(shard), seed=10 * shard, start=f'2025-03-0{1 + 2 * shard}',
+                             days=6, rows=300)
+    return base
+
+
+def _load(base_path, sample_frac, **kwargs):
+    pipeline = IntegratedAadharDataPipeline(base_path, use_cache=False, **kwargs)
+    pipeline.load_all(sample_frac=sample_frac)
+    return pipeline
+
+
+@pytest.mark.parametrize('sample_frac', [None, 0.4])
+def test_workers_and_executors_give_identical_frames(base_path, sample_frac):
+    serial = _load(base_path, sample_frac, max_workers=1)
+    for kwargs in ({'max_workers': 4}, {'max_workers': 4, 'executor': 'process'}):
+        pooled = _load(base_path, sample_frac, **kwargs)
+        for name in DATASETS:
+            expected, actual = serial._frame(name), pooled._frame(name)
+            assert list(actual.columns) == list(expected.columns)
+            pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+
+def test_sample_is_drawn_per_shard(base_path):
+    full = _load(base_path, None, max_workers=1)
+    sampled = _load(base_path, 0.4, max_workers=1)
+    for name in DATASETS:
+        rows = sampled._frame(name)
+        # 40% of each 300-row shard
+        assert len(rows) == 3 * round(0.4 * 300)
+        assert len(rows) < len(full._frame(name))
@@ -0,0 +1,70 @@
+"""Shared frame store: attach round trips, workers share entries, prune scope."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from data_pipeline import DATASETS, IntegratedAadharDataPipeline
+from shared_frames import SharedFrameStore, private_key
+
+
+def _frame(rows):
+    return pd.DataFrame({
+        'date': pd.date_range('2025-03-01', periods=rows, freq='D'),
+        'state': pd.Categorical(np.array(['Punjab', 'Assam', 'Goa'])[np.arange(rows) % 3]),
+        'count': np.arange(rows, dtype=np.uint32),
+        'rate': np.linspace(0, 1, rows),
+    })
+
+
+@pytest.mark.parametrize('rows', [0, 1, 50])
+def test_publish_and_attach_round_trip(tmp_path, rows):
+    store = SharedFrameStore('v1', tmp_path)
+    df = _frame(rows)
+    store.publish('frame', df)
+    attached = store.attach('frame')
+    pd.testing.assert_frame_equal(attached, df, check_categorical=False)
+
+
+def test_workers_without_cache_share_one_entry(tmp_path, write_dataset, canonical):
+    base = write_dataset('1')
+    root = tmp_path / 'shm'
+    workers = []
+    for _ in range(2):
+        pipeline = IntegratedAadharDataPipeline(base, max_workers=1, use_cache=False)
+        pipeline.load_all()
+        pipeline.create_integrated_view()
+        expected = {name: pipeline._frame(name) for name in DATASETS + ['integrated']}
+        pipeline.share_frames(root)
+        workers.append(pipeline)
+        for name, df in expected.items():
+            pd.testing.assert_frame_equal(canonical(pipeline._frame(name)), canonical(df),
+                                          check_dtype=False)
+
+    first, second = (worker.shared_store for worker in workers)
+    assert first.key == second.key == workers[0].data_version()
+    assert [entry.name for entry in first.root.iterdir()] == [first.key]
+
+
+def test_prune_keeps_private_entries_of_running_processes(tmp_path):
+    versioned = SharedFrameStore('v2', tmp_path)
+    for key in ['v1', 'v2', f"pid-{os.getppid()}-1", 'pid-999999999-1',
+                private_key()]:
+        SharedFrameStore(key, tmp_path).publish('frame', _frame(3))
+    versioned.prune()
+    assert sorted(entry.name for entry in versioned.root.iterdir()) == \
+        sorted(['v2', f"pid-{os.getppid()}-1"])
+
+    # A private store removes only its own earlier entries and exited ones
+    SharedFrameStore('v2', tmp_path)
+    earlier = SharedFrameStore(private_key(), tmp_path)
+    earlier.publish('frame', _frame(3))
+    current = SharedFrameStore(private_key(), tmp_path)
+    current.publish('frame', _frame(3))
+    current.prune()
+    assert sorted(entry.name for entry in current.root.iterdir()) == \
+        sorted(['v2', f"pid-{os.getppid()}-1", current.key])